@@ -1,5 +1,6 @@
 """Agent E: Caption Generator - Creates engaging Instagram captions with hashtags."""
 
+import json
 from typing import Dict, List
 from pydantic import BaseModel, Field
 
@@ -24,7 +25,8 @@ class CaptionGenerator:
         concept: Dict,
         script: Dict,
         niche: str,
-        keywords: str = ""
+        keywords: str = "",
+        bypass_cache: bool = False
     ) -> InstagramCaption:
         """
         Generate an engaging Instagram caption with hashtags.
@@ -34,6 +36,7 @@ class CaptionGenerator:
             script: The generated ReelScript (as dict)
             niche: The main niche or topic
             keywords: Additional keywords
+            bypass_cache: Skip the LLM response cache for a fresh generation
         
         Returns:
             InstagramCaption object with caption and hashtags
@@ -127,43 +130,13 @@ class CaptionGenerator:
             prompt=user_prompt,
             system_prompt=system_prompt,
             temperature=0.7,
-            max_tokens=1000
+            max_tokens=1000,
+            bypass_cache=bypass_cache,
+            validate=self._parse_caption
         )
         
-        # Parse JSON response
-        import json
         try:
-            # Extract JSON from response
-            cleaned_response = response.strip()
-            
-            if "```json" in cleaned_response:
-                cleaned_response = cleaned_response.split("```json")[1].split("```")[0].strip()
-            elif "```" in cleaned_response:
-                cleaned_response = cleaned_response.split("```")[1].split("```")[0].strip()
-            
-            caption_data = json.loads(cleaned_response)
-            
-            # Ensure hashtags are formatted correctly
-            hashtags = caption_data.get("hashtags", [])
-            # Remove # if present in hashtags list
-            hashtags = [tag.lstrip("#") for tag in hashtags]
-            
-            # Build full caption if not provided or incomplete
-            caption_text = caption_data.get("caption", "")
-            if not caption_data.get("full_caption"):
-                hashtag_str = " ".join([f"#{tag}" for tag in hashtags])
-                full_caption = f"{caption_text}\n\n{hashtag_str}"
-            else:
-                # Convert escaped newlines to actual newlines
-                full_caption = caption_data.get("full_caption", "").replace("\\n", "\n")
-            
-            caption = InstagramCaption(
-                caption=caption_text,
-                hashtags=hashtags,
-                full_caption=full_caption
-            )
-            
-            return caption
+            return self._parse_caption(response)
             
         except (json.JSONDecodeError, ValueError, KeyError) as e:
             # Fallback parsing
@@ -178,26 +151,50 @@ class CaptionGenerator:
                 prompt=fallback_prompt,
                 system_prompt=system_prompt,
                 temperature=0.3,
-                max_tokens=1000
+                max_tokens=1000,
+                bypass_cache=bypass_cache,
+                validate=self._parse_caption
             )
             
-            cleaned_response = response.strip()
-            if cleaned_response.startswith("{"):
-                caption_data = json.loads(cleaned_response)
-                hashtags = [tag.lstrip("#") for tag in caption_data.get("hashtags", [])]
-                caption_text = caption_data.get("caption", "")
-                if not caption_data.get("full_caption"):
-                    hashtag_str = " ".join([f"#{tag}" for tag in hashtags])
-                    full_caption = f"{caption_text}\n\n{hashtag_str}"
-                else:
-                    # Convert escaped newlines to actual newlines
-                    full_caption = caption_data.get("full_caption", "").replace("\\n", "\n")
-                
-                caption = InstagramCaption(
-                    caption=caption_text,
-                    hashtags=hashtags,
-                    full_caption=full_caption
-                )
-                return caption
-            
-            raise ValueError(f"Failed to parse caption from response: {e}")
+            try:
+                return self._parse_caption(response)
+            except (json.JSONDecodeError, ValueError, KeyError):
+                raise ValueError(f"Failed to parse caption from response: {e}")
+    
+    @staticmethod
+    def _parse_caption(response: str) -> InstagramCaption:
+        """
+        Parse the LLM's JSON answer (optionally in a markdown code block) into an InstagramCaption.
+        
+        Raises:
+            ValueError: If the response is not a valid caption (JSONDecodeError is a ValueError)
+        """
+        # Extract JSON from response
+        cleaned_response = response.strip()
+        
+        if "```json" in cleaned_response:
+            cleaned_response = cleaned_response.split("```json")[1].split("```")[0].strip()
+        elif "```" in cleaned_response:
+            cleaned_response = cleaned_response.split("```")[1].split("```")[0].strip()
+        
+        caption_data = json.loads(cleaned_response)
+        
+        # Ensure hashtags are formatted correctly
+        hashtags = caption_data.get("hashtags", [])
+        # Remove # if present in hashtags list
+        hashtags = [tag.lstrip("#") for tag in hashtags]
+        
+        # Build full caption if not provided or incomplete
+        caption_text = caption_data.get("caption", "")
+        if not caption_data.get("full_caption"):
+            hashtag_str = " ".join([f"#{tag}" for tag in hashtags])
+            full_caption = f"{caption_text}\n\n{hashtag_str}"
+        else:
+            # Convert escaped newlines to actual newlines
+            full_caption = caption_data.get("full_caption", "").replace("\\n", "\n")
+        
+        return InstagramCaption(
+            caption=caption_text,
+            hashtags=hashtags,
+            full_caption=full_caption
+        )
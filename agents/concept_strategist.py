@@ -1,5 +1,7 @@
 """Agent A: Trend & Concept Strategist - Generates high-engagement Reel concepts."""
 
+import json
+import re
 from typing import List, Dict, Any
 from pydantic import BaseModel, Field
 
@@ -26,7 +28,8 @@ class ConceptStrategist:
         self,
         niche: str,
         keywords: str = "",
-        additional_context: str = ""
+        additional_context: str = "",
+        bypass_cache: bool = False
     ) -> List[ReelConcept]:
         """
         Generate 3 distinct Reel concepts based on niche and keywords.
@@ -35,6 +38,7 @@ class ConceptStrategist:
             niche: The main niche or topic (e.g., "fitness", "cooking", "tech tips")
             keywords: Additional keywords to guide concept generation
             additional_context: Any additional context or requirements
+            bypass_cache: Skip the LLM response cache for a fresh generation
         
         Returns:
             List of 3 ReelConcept objects
@@ -115,13 +119,11 @@ class ConceptStrategist:
             prompt=user_prompt,
             system_prompt=system_prompt,
             temperature=0.8,
-            max_tokens=2500
+            max_tokens=2500,
+            bypass_cache=bypass_cache,
+            validate=self._parse_concepts
         )
         
-        # Debug: Save raw response for troubleshooting
-        import json
-        import re
-        
         # Log the raw response for debugging (first 500 chars)
         if len(response) > 500:
             print(f"Debug: Response preview: {response[:500]}...")
@@ -129,44 +131,7 @@ class ConceptStrategist:
             print(f"Debug: Full response: {response}")
         
         try:
-            # Extract JSON from response (handle markdown code blocks)
-            cleaned_response = response.strip()
-            
-            # Remove markdown code blocks
-            if "```json" in cleaned_response:
-                cleaned_response = cleaned_response.split("```json")[1].split("```")[0].strip()
-            elif "```" in cleaned_response:
-                cleaned_response = cleaned_response.split("```")[1].split("```")[0].strip()
-            
-            # Try to find JSON array in the response
-            # Look for array pattern
-            array_match = re.search(r'\[[\s\S]*\]', cleaned_response)
-            if array_match:
-                cleaned_response = array_match.group(0)
-            
-            # Fix escaped quotes (\" -> ")
-            cleaned_response = cleaned_response.replace('\\"', '"')
-            # Also handle other common escape sequences
-            cleaned_response = cleaned_response.replace('\\n', '\n')
-            cleaned_response = cleaned_response.replace('\\t', '\t')
-            
-            # Try to parse JSON
-            concepts_data = json.loads(cleaned_response)
-            
-            # Validate and create ReelConcept objects
-            concepts = []
-            for concept_data in concepts_data:
-                if isinstance(concept_data, dict):
-                    try:
-                        concepts.append(ReelConcept(**concept_data))
-                    except Exception as e:
-                        print(f"Warning: Skipping invalid concept: {e}")
-                        continue
-            
-            if len(concepts) != 3:
-                raise ValueError(f"Expected 3 concepts, got {len(concepts)}")
-            
-            return concepts
+            return self._parse_concepts(response)
             
         except (json.JSONDecodeError, ValueError, KeyError) as e:
             # Fallback: try to extract concepts using LLM again with stricter format
@@ -181,74 +146,14 @@ class ConceptStrategist:
                 prompt=fallback_prompt,
                 system_prompt=system_prompt,
                 temperature=0.3,
-                max_tokens=2000
+                max_tokens=2000,
+                bypass_cache=bypass_cache,
+                validate=self._parse_fallback_concepts
             )
             
-            # Clean and parse fallback response
-            cleaned_response = response.strip()
-            
-            # Remove markdown code blocks
-            if "```json" in cleaned_response:
-                cleaned_response = cleaned_response.split("```json")[1].split("```")[0].strip()
-            elif "```" in cleaned_response:
-                cleaned_response = cleaned_response.split("```")[1].split("```")[0].strip()
-            
-            # Try to find JSON array
-            array_match = re.search(r'\[[\s\S]*\]', cleaned_response)
-            if array_match:
-                cleaned_response = array_match.group(0)
-            
-            # Fix escaped quotes
-            cleaned_response = cleaned_response.replace('\\"', '"')
-            cleaned_response = cleaned_response.replace('\\n', '\n')
-            cleaned_response = cleaned_response.replace('\\t', '\t')
-            
-            if cleaned_response.startswith("["):
-                try:
-                    concepts_data = json.loads(cleaned_response)
-                    concepts = []
-                    for c in concepts_data:
-                        if isinstance(c, dict):
-                            try:
-                                concepts.append(ReelConcept(**c))
-                            except Exception:
-                                continue
-                    if len(concepts) == 3:
-                        return concepts
-                except json.JSONDecodeError:
-                    pass
-            
-            # If we still can't parse, try one more time with more aggressive cleaning
             try:
-                # Remove any text before first [
-                start_idx = cleaned_response.find('[')
-                if start_idx >= 0:
-                    cleaned_response = cleaned_response[start_idx:]
-                    # Find matching closing bracket
-                    bracket_count = 0
-                    end_idx = -1
-                    for i, char in enumerate(cleaned_response):
-                        if char == '[':
-                            bracket_count += 1
-                        elif char == ']':
-                            bracket_count -= 1
-                            if bracket_count == 0:
-                                end_idx = i + 1
-                                break
-                    if end_idx > 0:
-                        cleaned_response = cleaned_response[:end_idx]
-                        concepts_data = json.loads(cleaned_response)
-                        concepts = []
-                        for c in concepts_data:
-                            if isinstance(c, dict):
-                                try:
-                                    concepts.append(ReelConcept(**c))
-                                except Exception:
-                                    continue
-                        if len(concepts) >= 1:  # Accept at least 1 concept
-                            print(f"Warning: Generated {len(concepts)} concepts instead of 3")
-                            return concepts
-            except Exception:
+                return self._parse_fallback_concepts(response)
+            except ValueError:
                 pass
             
             # If we still can't parse, raise with more context
@@ -258,3 +163,101 @@ class ConceptStrategist:
                 f"Response length: {len(response)} chars. "
                 f"Response preview: {response[:500]}..."
             )
+    
+    @staticmethod
+    def _clean_response(response: str) -> str:
+        """Strip markdown code blocks, surrounding text and stray escapes around a JSON array."""
+        cleaned_response = response.strip()
+        
+        # Remove markdown code blocks
+        if "```json" in cleaned_response:
+            cleaned_response = cleaned_response.split("```json")[1].split("```")[0].strip()
+        elif "```" in cleaned_response:
+            cleaned_response = cleaned_response.split("```")[1].split("```")[0].strip()
+        
+        # Try to find JSON array in the response
+        # Look for array pattern
+        array_match = re.search(r'\[[\s\S]*\]', cleaned_response)
+        if array_match:
+            cleaned_response = array_match.group(0)
+        
+        # Fix escaped quotes (\" -> ")
+        cleaned_response = cleaned_response.replace('\\"', '"')
+        # Also handle other common escape sequences
+        cleaned_response = cleaned_response.replace('\\n', '\n')
+        cleaned_response = cleaned_response.replace('\\t', '\t')
+        return cleaned_response
+    
+    @staticmethod
+    def _build_concepts(concepts_data: Any) -> List[ReelConcept]:
+        """Create ReelConcept objects from parsed JSON, skipping invalid entries."""
+        concepts = []
+        for concept_data in concepts_data:
+            if isinstance(concept_data, dict):
+                try:
+                    concepts.append(ReelConcept(**concept_data))
+                except Exception as e:
+                    print(f"Warning: Skipping invalid concept: {e}")
+                    continue
+        return concepts
+    
+    @classmethod
+    def _parse_concepts(cls, response: str) -> List[ReelConcept]:
+        """
+        Parse exactly 3 concepts from the LLM's JSON answer.
+        
+        Raises:
+            ValueError: If the response doesn't hold 3 valid concepts
+        """
+        concepts = cls._build_concepts(json.loads(cls._clean_response(response)))
+        
+        if len(concepts) != 3:
+            raise ValueError(f"Expected 3 concepts, got {len(concepts)}")
+        
+        return concepts
+    
+    @classmethod
+    def _parse_fallback_concepts(cls, response: str) -> List[ReelConcept]:
+        """
+        Parse the stricter-format retry, accepting fewer than 3 concepts as a last resort.
+        
+        Raises:
+            ValueError: If no valid concept can be extracted
+        """
+        cleaned_response = cls._clean_response(response)
+        
+        if cleaned_response.startswith("["):
+            try:
+                concepts = cls._build_concepts(json.loads(cleaned_response))
+                if len(concepts) == 3:
+                    return concepts
+            except json.JSONDecodeError:
+                pass
+        
+        # If we still can't parse, try one more time with more aggressive cleaning
+        try:
+            # Remove any text before first [
+            start_idx = cleaned_response.find('[')
+            if start_idx >= 0:
+                cleaned_response = cleaned_response[start_idx:]
+                # Find matching closing bracket
+                bracket_count = 0
+                end_idx = -1
+                for i, char in enumerate(cleaned_response):
+                    if char == '[':
+                        bracket_count += 1
+                    elif char == ']':
+                        bracket_count -= 1
+                        if bracket_count == 0:
+                            end_idx = i + 1
+                            break
+                if end_idx > 0:
+                    cleaned_response = cleaned_response[:end_idx]
+                    concepts = cls._build_concepts(json.loads(cleaned_response))
+                    if len(concepts) >= 1:  # Accept at least 1 concept
+                        print(f"Warning: Generated {len(concepts)} concepts instead of 3")
+                        return concepts
+        except Exception:
+            pass
+        
+        raise ValueError("No valid concepts found in response")
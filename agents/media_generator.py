@@ -1,11 +1,15 @@
 """Agent C: Media Generator - Generates images using AI."""
 
 import asyncio
+import inspect
+import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 import os
 
 from utils.api_clients import OpenAIClient, ReplicateClient
+from utils.http_session import get_http_pool
+from utils.image_store import get_image_store
 
 
 class MediaGenerator:
@@ -22,85 +26,220 @@ class MediaGenerator:
             self.use_replicate = True
         else:
             raise ValueError(f"Unknown image generation provider: {provider}")
+        
+        # Reuse images already rendered for identical prompts
+        self.image_store = get_image_store()
+        
+        # Rounds of retries for images that still failed after the client's own retries
+        self.retry_attempts = int(os.getenv("IMAGE_RETRY_ATTEMPTS", "3"))
+        self.retry_backoff_seconds = float(os.getenv("IMAGE_RETRY_BACKOFF_SECONDS", "5"))
     
-    async def generate_images(
+    def _image_request(self) -> Tuple[str, str, str, Optional[str]]:
+        """Provider, model, size and quality that identify a generated image."""
+        if self.use_replicate:
+            return "replicate", self.client.model, "1024x1792", None
+        model = self.client.image_deployment if self.client.use_azure else "dall-e-3"
+        return "openai", model, "1024x1792", "hd"
+    
+    async def iter_images(
         self,
         image_prompts: List[str],
         output_dir: Path,
-        prefix: str = "image"
-    ) -> List[Path]:
+        prefix: str = "image",
+        max_concurrent: Optional[int] = None,
+        indices: Optional[List[int]] = None,
+        bypass_cache: bool = False,
+        errors: Optional[Dict[int, str]] = None
+    ) -> AsyncIterator[Tuple[int, Optional[Path]]]:
         """
-        Generate images from a list of prompts.
+        Generate images with bounded concurrency, yielding each one as it lands.
+        
+        Results arrive in completion order, so callers can start pre-scaling,
+        previewing or encoding the first image while the rest are still rendering.
+        Closing the iterator early cancels the images still in flight.
         
         Args:
             image_prompts: List of detailed image generation prompts
             output_dir: Directory where images will be saved
             prefix: Prefix for image filenames
+            max_concurrent: Images generated at once for this reel. Defaults to the
+                           IMAGE_CONCURRENCY_PER_REEL environment variable.
+            indices: Optional prompt indices to generate (default: all). File names
+                    always follow the prompt index, so a subset lands in its own slots.
+            bypass_cache: Generate new images even if identical prompts are cached
+            errors: Optional dict that receives the error of each failed index
+                   (and loses it again if that index later succeeds)
         
-        Returns:
-            List of paths to generated image files
+        Yields:
+            (index, path) tuples; path is None when that image failed
         """
         output_dir.mkdir(parents=True, exist_ok=True)
-        image_paths = []
+        if max_concurrent is None:
+            max_concurrent = int(os.getenv("IMAGE_CONCURRENCY_PER_REEL", "4"))
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
         
-        # Generate images concurrently (with rate limiting handled by clients)
-        tasks = []
-        for i, prompt in enumerate(image_prompts):
+        if indices is None:
+            indices = list(range(len(image_prompts)))
+        
+        async def _bounded(i: int) -> Optional[Path]:
             output_path = output_dir / f"{prefix}_{i+1:02d}.png"
-            tasks.append(self._generate_single_image(prompt, output_path, i))
-        
-        # Execute with some concurrency control
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Process results
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                # Extract the actual exception from RetryError or other wrapped exceptions
-                actual_error = result
-                try:
-                    # Handle tenacity RetryError
-                    if hasattr(result, 'last_attempt'):
-                        last_attempt = result.last_attempt
-                        if hasattr(last_attempt, 'exception') and last_attempt.exception():
-                            actual_error = last_attempt.exception()
-                        elif hasattr(last_attempt, 'result') and isinstance(last_attempt.result(), Exception):
-                            actual_error = last_attempt.result()
-                    # Handle other wrapped exceptions
-                    elif hasattr(result, 'args') and result.args:
-                        if isinstance(result.args[0], Exception):
-                            actual_error = result.args[0]
-                except Exception:
-                    pass  # Use the original error if extraction fails
-                
-                error_msg = str(actual_error)
-                error_type = type(actual_error).__name__
-                print(f"Error generating image {i+1}: {error_type}: {error_msg}")
-                # Continue with other images
-            elif result:
-                image_paths.append(result)
-        
-        if not image_paths:
-            raise RuntimeError(
-                "Failed to generate any images. Please check your API configuration and try again."
+            return await self._generate_single_image(
+                image_prompts[i], output_path, i, bypass_cache=bypass_cache, slot=semaphore
             )
         
-        return sorted(image_paths)
+        tasks = {asyncio.create_task(_bounded(i)): i for i in indices}
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=tasks.get):
+                    index = tasks[task]
+                    if task.exception() is not None:
+                        error = self._unwrap_error(task.exception())
+                        print(f"Error generating image {index+1}: {type(error).__name__}: {error}")
+                        if errors is not None:
+                            errors[index] = f"{type(error).__name__}: {error}"
+                        yield index, None
+                    else:
+                        if errors is not None:
+                            errors.pop(index, None)
+                        yield index, task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+    
+    async def generate_images(
+        self,
+        image_prompts: List[str],
+        output_dir: Path,
+        prefix: str = "image",
+        on_image: Optional[Callable[[int, Path], Any]] = None,
+        indices: Optional[List[int]] = None,
+        bypass_cache: bool = False,
+        errors: Optional[Dict[int, str]] = None
+    ) -> List[Optional[Path]]:
+        """
+        Generate images from a list of prompts.
+        
+        Images that fail are retried in further rounds (IMAGE_RETRY_ATTEMPTS rounds
+        in total, waiting IMAGE_RETRY_BACKOFF_SECONDS, doubled each round), and only
+        the failed indices are generated again.
+        
+        Args:
+            image_prompts: List of detailed image generation prompts
+            output_dir: Directory where images will be saved
+            prefix: Prefix for image filenames
+            on_image: Optional callback invoked with (index, path) as each image
+                     lands; coroutine callbacks are awaited
+            indices: Optional prompt indices to (re)generate; the others are left untouched
+            bypass_cache: Generate new images even if identical prompts are cached
+            errors: Optional dict that receives the last error of each image that
+                   still failed after every round
+        
+        Returns:
+            One entry per prompt, aligned with image_prompts: the image path, or None
+            if that image failed every attempt (or was not requested)
+        """
+        results: Dict[int, Optional[Path]] = {}
+        pending = list(range(len(image_prompts))) if indices is None else sorted(set(indices))
+        
+        for attempt in range(1, max(1, self.retry_attempts) + 1):
+            if attempt > 1:
+                delay = self.retry_backoff_seconds * 2 ** (attempt - 2)
+                print(
+                    f"Retrying {len(pending)} failed image(s) in {delay:.0f}s "
+                    f"(attempt {attempt}/{self.retry_attempts})"
+                )
+                await asyncio.sleep(delay)
+            
+            async for index, path in self.iter_images(
+                image_prompts,
+                output_dir,
+                prefix,
+                indices=pending,
+                bypass_cache=bypass_cache,
+                errors=errors
+            ):
+                results[index] = path
+                if path is not None and on_image is not None:
+                    outcome = on_image(index, path)
+                    if inspect.isawaitable(outcome):
+                        await outcome
+            
+            pending = [index for index in pending if results.get(index) is None]
+            if not pending:
+                break
+        
+        if pending:
+            print(f"Images still failing after retries: {', '.join(str(i + 1) for i in pending)}")
+        
+        if self.image_store is not None:
+            stats = self.image_store.stats()
+            if stats["hits"]:
+                print(
+                    f"Image cache: {stats['hits']} reused so far, saved ~${stats['dollars_saved']:.2f} "
+                    f"and {stats['seconds_saved']:.0f}s of generation"
+                )
+        
+        return [results.get(index) for index in range(len(image_prompts))]
+    
+    @staticmethod
+    def _unwrap_error(error: BaseException) -> BaseException:
+        """Extract the actual exception from RetryError or other wrapped exceptions."""
+        try:
+            # Handle tenacity RetryError
+            if hasattr(error, 'last_attempt'):
+                last_attempt = error.last_attempt
+                if hasattr(last_attempt, 'exception') and last_attempt.exception():
+                    return last_attempt.exception()
+                elif hasattr(last_attempt, 'result') and isinstance(last_attempt.result(), Exception):
+                    return last_attempt.result()
+            # Handle other wrapped exceptions
+            elif hasattr(error, 'args') and error.args:
+                if isinstance(error.args[0], Exception):
+                    return error.args[0]
+        except Exception:
+            pass  # Use the original error if extraction fails
+        return error
     
     async def _generate_single_image(
         self,
         prompt: str,
         output_path: Path,
-        index: int
-    ) -> Optional[Path]:
-        """Generate a single image from a prompt."""
-        try:
-            if self.use_replicate:
-                # Replicate client
-                image_url = await self.client.generate_image(
-                    prompt=prompt,
-                    output_path=output_path
-                )
-            else:
+        index: int,
+        bypass_cache: bool = False,
+        slot: Optional[asyncio.Semaphore] = None
+    ) -> Path:
+        """
+        Generate a single image from a prompt.
+        
+        slot bounds this reel's concurrency. It covers the API request and the
+        download; for Replicate it is released while the prediction renders, so
+        slow predictions don't hold back submitting the next image.
+        
+        Errors propagate to iter_images, which reports the image as failed.
+        """
+        slot = slot or asyncio.Semaphore(1)
+        provider, model, size, quality = self._image_request()
+        cache_key = None
+        if self.image_store is not None:
+            cache_key = self.image_store.make_key(provider, model, size, quality, prompt)
+            if not bypass_cache and self.image_store.fetch(cache_key, output_path):
+                print(f"Reused cached image {index+1}: {output_path.name}")
+                return output_path
+        
+        start = time.perf_counter()
+        if self.use_replicate:
+            # Replicate client
+            image_url = await self.client.generate_image(
+                prompt=prompt,
+                output_path=output_path,
+                slot=slot
+            )
+        else:
+            async with slot:
                 # OpenAI DALL-E 3
                 image_urls = await self.client.generate_image(
                     prompt=prompt,
@@ -109,24 +248,23 @@ class MediaGenerator:
                     n=1
                 )
                 
-                if image_urls:
-                    # Download the image
-                    import aiohttp
-                    async with aiohttp.ClientSession() as session:
-                        async with session.get(image_urls[0]) as response:
-                            if response.status == 200:
-                                image_data = await response.read()
-                                with open(output_path, "wb") as f:
-                                    f.write(image_data)
-                            else:
-                                raise Exception(f"Failed to download image: {response.status}")
-            
-            if output_path.exists():
-                print(f"Generated image {index+1}: {output_path.name}")
-                return output_path
-            else:
-                raise Exception(f"Image file was not created: {output_path}")
+                if not image_urls:
+                    # Don't mistake an image left over from an earlier run for this one
+                    raise RuntimeError("No image URL returned")
                 
-        except Exception as e:
-            print(f"Error generating image {index+1}: {e}")
-            return None
+                # Download the image through the shared connection pool
+                await get_http_pool().download_to_file(image_urls[0], output_path)
+        
+        if not output_path.exists():
+            raise RuntimeError(f"Image file was not created: {output_path}")
+        
+        print(f"Generated image {index+1}: {output_path.name}")
+        if cache_key is not None:
+            self.image_store.add(
+                cache_key,
+                output_path,
+                provider=provider,
+                quality=quality,
+                generation_seconds=time.perf_counter() - start
+            )
+        return output_path
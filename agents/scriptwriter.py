@@ -1,5 +1,6 @@
 """Agent B: Scriptwriter & Prompt Engineer - Creates scripts and image prompts."""
 
+import json
 from typing import List, Dict
 from pydantic import BaseModel, Field
 
@@ -34,7 +35,8 @@ class Scriptwriter:
         self,
         concept: Dict,
         target_duration: float = 30.0,
-        style_preference: str = ""
+        style_preference: str = "",
+        bypass_cache: bool = False
     ) -> ReelScript:
         """
         Generate a complete script with image prompts based on a selected concept.
@@ -43,6 +45,7 @@ class Scriptwriter:
             concept: The selected ReelConcept (as dict)
             target_duration: Target duration in seconds (default 30 for Reels)
             style_preference: Additional style preferences for visuals
+            bypass_cache: Skip the LLM response cache for a fresh generation
         
         Returns:
             ReelScript object with transcript and image prompts
@@ -138,39 +141,20 @@ class Scriptwriter:
             ]
         }}"""
         
+        def parse(text: str) -> ReelScript:
+            return self._parse_script(text, target_duration)
+        
         response = await self.openai_client.generate_text(
             prompt=user_prompt,
             system_prompt=system_prompt,
             temperature=0.7,
-            max_tokens=3000
+            max_tokens=3000,
+            bypass_cache=bypass_cache,
+            validate=parse
         )
         
-        # Parse JSON response
-        import json
         try:
-            # Extract JSON from response
-            if "```json" in response:
-                response = response.split("```json")[1].split("```")[0].strip()
-            elif "```" in response:
-                response = response.split("```")[1].split("```")[0].strip()
-            
-            script_data = json.loads(response)
-            
-            # Create segments
-            segments = [
-                ScriptSegment(**seg) for seg in script_data.get("segments", [])
-            ]
-            
-            # Create ReelScript
-            script = ReelScript(
-                full_transcript=script_data.get("full_transcript", ""),
-                segments=segments,
-                total_duration=script_data.get("total_duration", target_duration),
-                hook_enhancement=script_data.get("hook_enhancement", ""),
-                pacing_notes=script_data.get("pacing_notes", "")
-            )
-            
-            return script
+            return parse(response)
             
         except (json.JSONDecodeError, ValueError, KeyError) as e:
             # Fallback parsing
@@ -185,20 +169,43 @@ class Scriptwriter:
                 prompt=fallback_prompt,
                 system_prompt=system_prompt,
                 temperature=0.3,
-                max_tokens=3000
+                max_tokens=3000,
+                bypass_cache=bypass_cache,
+                validate=parse
             )
             
-            response = response.strip()
-            if response.startswith("{"):
-                script_data = json.loads(response)
-                segments = [ScriptSegment(**seg) for seg in script_data.get("segments", [])]
-                script = ReelScript(
-                    full_transcript=script_data.get("full_transcript", ""),
-                    segments=segments,
-                    total_duration=script_data.get("total_duration", target_duration),
-                    hook_enhancement=script_data.get("hook_enhancement", ""),
-                    pacing_notes=script_data.get("pacing_notes", "")
-                )
-                return script
-            
-            raise ValueError(f"Failed to parse script from response: {e}")
+            try:
+                return parse(response)
+            except (json.JSONDecodeError, ValueError, KeyError):
+                raise ValueError(f"Failed to parse script from response: {e}")
+    
+    @staticmethod
+    def _parse_script(response: str, target_duration: float) -> ReelScript:
+        """
+        Parse the LLM's JSON answer (optionally in a markdown code block) into a ReelScript.
+        
+        Raises:
+            ValueError: If the response is not a valid script (JSONDecodeError is a ValueError)
+        """
+        # Extract JSON from response
+        response = response.strip()
+        if "```json" in response:
+            response = response.split("```json")[1].split("```")[0].strip()
+        elif "```" in response:
+            response = response.split("```")[1].split("```")[0].strip()
+        
+        script_data = json.loads(response)
+        
+        # Create segments
+        segments = [
+            ScriptSegment(**seg) for seg in script_data.get("segments", [])
+        ]
+        
+        # Create ReelScript
+        return ReelScript(
+            full_transcript=script_data.get("full_transcript", ""),
+            segments=segments,
+            total_duration=script_data.get("total_duration", target_duration),
+            hook_enhancement=script_data.get("hook_enhancement", ""),
+            pacing_notes=script_data.get("pacing_notes", "")
+        )
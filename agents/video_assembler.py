@@ -1,25 +1,89 @@
 """Agent D: Voice & Video Assembler - Creates voiceover and assembles final video."""
 
 import asyncio
+import os
+from concurrent.futures import Future
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Callable, Any
 
 from utils.api_clients import ElevenLabsClient
-from utils.video_utils import VideoProcessor
+from utils.video_utils import VideoProcessor, concat_audio, probe_media
+from utils.voice_cache import get_voiceover_cache
+from utils.concurrency import provider_slot
+from utils.executors import get_executor
+from utils.render_pool import get_render_pool
 
 
 class VideoAssembler:
     """Agent D: Generates voiceover and assembles final video."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        render_engine: Optional[str] = None,
+        segmented_voiceover: Optional[bool] = None
+    ):
+        """
+        Args:
+            render_engine: Video render engine ("moviepy", "ffmpeg" or "segments").
+                          Defaults to the VIDEO_RENDER_ENGINE environment variable.
+            segmented_voiceover: Synthesize each script segment separately and cut
+                                images on the measured segment lengths. Defaults to
+                                the VOICEOVER_PER_SEGMENT environment variable.
+        """
         self.tts_client = ElevenLabsClient()
-        self.video_processor = VideoProcessor()
+        self.video_processor = VideoProcessor(render_engine=render_engine)
+        if segmented_voiceover is None:
+            segmented_voiceover = os.getenv("VOICEOVER_PER_SEGMENT", "false").lower() == "true"
+        self.segmented_voiceover = segmented_voiceover
+        
+        # Reuse synthesized audio across retries and re-renders
+        self.voice_cache = get_voiceover_cache()
+    
+    async def _synthesize(
+        self,
+        text: str,
+        output_path: Path,
+        voice_id: Optional[str] = None,
+        chunk_consumer: Optional[Callable[[bytes], Any]] = None
+    ) -> bool:
+        """
+        Synthesize text to output_path, reusing cached audio when possible.
+        
+        Returns:
+            True if the audio came from the cache
+        """
+        cache_key = None
+        if self.voice_cache is not None:
+            cache_key = self.voice_cache.make_key(
+                voice_id or self.tts_client.voice_id,
+                self.tts_client.model_id,
+                text
+            )
+            if self.voice_cache.fetch(cache_key, output_path):
+                return True
+        
+        # Stream speech straight to disk
+        stats = await self.tts_client.stream_speech(
+            text=text,
+            output_path=output_path,
+            voice_id=voice_id,
+            chunk_consumer=chunk_consumer
+        )
+        print(
+            f"TTS streamed {output_path.name}: {stats.total_bytes} bytes in {stats.chunks} chunks "
+            f"(first byte {stats.time_to_first_byte:.2f}s, total {stats.total_time:.2f}s)"
+        )
+        
+        if cache_key is not None and output_path.exists():
+            self.voice_cache.add(cache_key, output_path)
+        return False
     
     async def generate_voiceover(
         self,
         transcript: str,
         output_path: Path,
-        voice_id: Optional[str] = None
+        voice_id: Optional[str] = None,
+        chunk_consumer: Optional[Callable[[bytes], Any]] = None
     ) -> Path:
         """
         Generate voiceover audio from transcript.
@@ -28,31 +92,99 @@ class VideoAssembler:
             transcript: The full spoken transcript
             output_path: Path where audio file will be saved
             voice_id: Optional custom voice ID (uses default if not provided)
+            chunk_consumer: Optional callback receiving audio chunks as they stream in
         
         Returns:
             Path to the generated audio file
         """
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Generate speech
-        await self.tts_client.generate_speech(
-            text=transcript,
-            output_path=output_path,
-            voice_id=voice_id
-        )
+        cached = await self._synthesize(transcript, output_path, voice_id, chunk_consumer)
         
         if not output_path.exists():
             raise Exception(f"Voiceover file was not created: {output_path}")
         
-        print(f"Generated voiceover: {output_path.name}")
+        if cached:
+            print(f"Reused cached voiceover: {output_path.name}")
+        else:
+            print(f"Generated voiceover: {output_path.name}")
         return output_path
     
+    async def generate_segmented_voiceover(
+        self,
+        segment_texts: List[str],
+        output_path: Path,
+        voice_id: Optional[str] = None
+    ) -> List[float]:
+        """
+        Generate voiceover one script segment at a time and join the results.
+        
+        Segments are synthesized concurrently (bounded by the shared ElevenLabs
+        rate limiter and concurrency budget) and cached on their own, so editing
+        one segment only re-synthesizes that segment. The joined audio is gapless,
+        and each segment's measured length can be used directly as its image duration.
+        
+        Args:
+            segment_texts: Spoken text of each script segment, in order
+            output_path: Path where the joined audio file will be saved
+            voice_id: Optional custom voice ID (uses default if not provided)
+        
+        Returns:
+            Measured duration of each segment's audio in seconds (in order)
+        """
+        if not segment_texts:
+            raise ValueError("Cannot generate voiceover: no script segments provided")
+        
+        segment_dir = output_path.parent / f"{output_path.stem}_segments"
+        segment_dir.mkdir(parents=True, exist_ok=True)
+        segment_paths = [
+            segment_dir / f"segment_{i:02d}.mp3" for i in range(len(segment_texts))
+        ]
+        
+        cached = await asyncio.gather(*[
+            self._synthesize(text, segment_path, voice_id)
+            for text, segment_path in zip(segment_texts, segment_paths)
+        ])
+        
+        def _join() -> List[float]:
+            concat_audio(segment_paths, output_path, self.video_processor.audio_bitrate)
+            return [probe_media(path)["duration"] or 0.0 for path in segment_paths]
+        
+        # Join and measure off the event loop: ffmpeg decodes and re-encodes the segments
+        durations = await get_executor("render").run(_join)
+        
+        print(
+            f"Generated voiceover: {output_path.name} "
+            f"({len(segment_paths)} segments, {sum(cached)} reused from cache, "
+            f"{sum(durations):.2f}s)"
+        )
+        return durations
+    
+    async def prepare_image(self, index: int, image_path: Path) -> None:
+        """
+        Pre-scale a freshly generated image into the frame cache.
+        
+        Called as each image lands, so the final render finds every still
+        already resized instead of scaling them all after the last one arrives.
+        """
+        image_cache = self.video_processor.image_cache
+        if image_cache is None:
+            return
+        await get_executor("render").run(
+            image_cache.get_scaled,
+            image_path,
+            self.video_processor.width,
+            self.video_processor.height
+        )
+    
     async def assemble_video(
         self,
         image_paths: List[Path],
         audio_path: Path,
         output_path: Path,
-        image_durations: Optional[List[float]] = None
+        image_durations: Optional[List[float]] = None,
+        render_engine: Optional[str] = None,
+        render_profile: Optional[str] = None
     ) -> Path:
         """
         Assemble final video from images and audio.
@@ -63,6 +195,8 @@ class VideoAssembler:
             output_path: Path where final video will be saved
             image_durations: Optional list of durations for each image.
                            If None, images are evenly distributed across audio duration.
+            render_engine: Optional render engine override ("moviepy", "ffmpeg" or "segments")
+            render_profile: Optional speed/quality profile ("draft", "preview" or "publish")
         
         Returns:
             Path to the created video file
@@ -84,18 +218,32 @@ class VideoAssembler:
                 f"Some image files are missing: {', '.join(missing_images)}"
             )
         
-        # This is a CPU-intensive operation, run in executor
-        loop = asyncio.get_event_loop()
+        render_pool = get_render_pool()
         
-        video_path = await loop.run_in_executor(
-            None,
-            lambda: self.video_processor.create_reel(
+        if render_pool is not None:
+            # CPU-intensive: render in a worker process so reels encode in parallel
+            video_path = await render_pool.render(
                 image_paths=image_paths,
                 audio_path=audio_path,
                 output_path=output_path,
-                image_durations=image_durations
+                image_durations=image_durations,
+                render_engine=render_engine or self.video_processor.render_engine,
+                render_profile=render_profile or self.video_processor.render_profile.name
             )
-        )
+        else:
+            # Fall back to the dedicated render threads
+            # (bounded by the shared ffmpeg budget when many workflows render at once)
+            async with provider_slot("ffmpeg"):
+                video_path = await get_executor("render").run(
+                    lambda: self.video_processor.create_reel(
+                        image_paths=image_paths,
+                        audio_path=audio_path,
+                        output_path=output_path,
+                        image_durations=image_durations,
+                        render_engine=render_engine,
+                        render_profile=render_profile
+                    )
+                )
         
         if not video_path.exists():
             raise Exception(f"Video file was not created: {video_path}")
@@ -103,6 +251,98 @@ class VideoAssembler:
         print(f"Created video: {video_path.name}")
         return video_path
     
+    async def render_preview(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        image_durations: Optional[List[float]] = None
+    ) -> Path:
+        """
+        Render a quick low-resolution preview of the reel.
+        
+        Args:
+            image_paths: List of paths to image files (in order)
+            audio_path: Path to voiceover audio file
+            output_path: Path where the preview will be saved
+            image_durations: Optional list of durations for each image
+        
+        Returns:
+            Path to the preview video
+        """
+        preview_path = await get_executor("render").run(
+            lambda: self.video_processor.create_preview(
+                image_paths=image_paths,
+                audio_path=audio_path,
+                output_path=output_path,
+                image_durations=image_durations
+            )
+        )
+        print(f"Created preview: {preview_path.name}")
+        return preview_path
+    
+    def start_background_render(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        on_done: Callable[[Optional[Path], Optional[BaseException]], Any],
+        image_durations: Optional[List[float]] = None,
+        render_profile: Optional[str] = None
+    ) -> Future:
+        """
+        Start the final render without waiting for it.
+        
+        The job runs on the render process pool (or the render threads) and
+        outlives the current event loop, so callers can return as soon as it
+        has been queued.
+        
+        Args:
+            image_paths: List of paths to image files (in order)
+            audio_path: Path to voiceover audio file
+            output_path: Path where final video will be saved
+            on_done: Called from a worker thread with (video_path, None) on success
+                     or (None, error) on failure
+            image_durations: Optional list of durations for each image
+            render_profile: Optional speed/quality profile ("draft", "preview" or "publish")
+        
+        Returns:
+            Future of the render job
+        """
+        render_pool = get_render_pool()
+        if render_pool is not None:
+            future = render_pool.submit(
+                image_paths=image_paths,
+                audio_path=audio_path,
+                output_path=output_path,
+                image_durations=image_durations,
+                render_engine=self.video_processor.render_engine,
+                render_profile=render_profile or self.video_processor.render_profile.name
+            )
+        else:
+            future = get_executor("render").submit(
+                lambda: self.video_processor.create_reel(
+                    image_paths=image_paths,
+                    audio_path=audio_path,
+                    output_path=output_path,
+                    image_durations=image_durations,
+                    render_profile=render_profile
+                )
+            )
+        
+        def _finished(job: Future) -> None:
+            error = job.exception()
+            if error is not None:
+                on_done(None, error)
+                return
+            result = job.result()
+            # The process pool reports (path, started_at, encode_seconds)
+            video_path = Path(result[0] if isinstance(result, tuple) else result)
+            on_done(video_path, None)
+        
+        future.add_done_callback(_finished)
+        return future
+    
     async def create_complete_reel(
         self,
         transcript: str,
@@ -110,7 +350,10 @@ class VideoAssembler:
         output_dir: Path,
         video_filename: str = "final_reel.mp4",
         voice_id: Optional[str] = None,
-        image_durations: Optional[List[float]] = None
+        image_durations: Optional[List[float]] = None,
+        render_engine: Optional[str] = None,
+        segment_texts: Optional[List[str]] = None,
+        render_profile: Optional[str] = None
     ) -> Path:
         """
         Complete workflow: generate voiceover and assemble video.
@@ -122,6 +365,10 @@ class VideoAssembler:
             video_filename: Name for the final video file
             voice_id: Optional custom voice ID
             image_durations: Optional durations for each image
+            render_engine: Optional render engine override ("moviepy", "ffmpeg" or "segments")
+            segment_texts: Optional spoken text per segment. With segmented voiceover
+                          enabled, the measured segment lengths replace image_durations.
+            render_profile: Optional speed/quality profile ("draft", "preview" or "publish")
         
         Returns:
             Path to the final video file
@@ -130,11 +377,18 @@ class VideoAssembler:
         
         # Generate voiceover
         audio_path = output_dir / "voiceover.mp3"
-        await self.generate_voiceover(
-            transcript=transcript,
-            output_path=audio_path,
-            voice_id=voice_id
-        )
+        if self.segmented_voiceover and segment_texts:
+            image_durations = await self.generate_segmented_voiceover(
+                segment_texts=segment_texts,
+                output_path=audio_path,
+                voice_id=voice_id
+            )
+        else:
+            await self.generate_voiceover(
+                transcript=transcript,
+                output_path=audio_path,
+                voice_id=voice_id
+            )
         
         # Assemble video
         video_path = output_dir / video_filename
@@ -142,7 +396,9 @@ class VideoAssembler:
             image_paths=image_paths,
             audio_path=audio_path,
             output_path=video_path,
-            image_durations=image_durations
+            image_durations=image_durations,
+            render_engine=render_engine,
+            render_profile=render_profile
         )
         
         return video_path
@@ -11,7 +11,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from orchestrator.workflow import ReelsWorkflow
-from orchestrator.state_manager import StateManager
+from orchestrator.state_manager import create_state_manager
 
 
 # Page configuration
@@ -28,6 +28,9 @@ if "current_workflow_id" not in st.session_state:
     st.session_state.current_workflow_id = None
 if "workflow_state" not in st.session_state:
     st.session_state.workflow_state = None
+if "state_manager" not in st.session_state:
+    # Kept across reruns so the sidebar listing reuses the in-memory manifest
+    st.session_state.state_manager = create_state_manager()
 
 
 def init_workflow():
@@ -75,13 +78,21 @@ st.markdown("Create engaging Instagram Reels using AI-powered multi-agent workfl
 with st.sidebar:
     st.header("Workflow Management")
     
-    # List existing workflows
-    state_manager = StateManager()
-    workflows = state_manager.list_workflows()
+    # List existing workflows (summaries only; the full state loads when one is opened)
+    state_manager = st.session_state.state_manager
+    status_filter = st.selectbox(
+        "Status",
+        options=["all", "completed", "rendering", "in_progress", "waiting_for_selection", "failed"],
+        key="workflow_status_filter"
+    )
+    workflows = state_manager.list_workflows(
+        limit=10,  # Show last 10
+        status=None if status_filter == "all" else status_filter
+    )
     
     if workflows:
         st.subheader("Existing Workflows")
-        for wf in workflows[:10]:  # Show last 10
+        for wf in workflows:
             if st.button(
                 f"📁 {wf['workflow_id'][:8]}... - {wf.get('niche', 'N/A')}",
                 key=f"load_{wf['workflow_id']}",
@@ -123,7 +134,7 @@ if st.session_state.current_workflow_id is None:
             else:
                 with st.spinner("Generating concepts... This may take a minute."):
                     try:
-                        result = asyncio.run(
+                        result = st.session_state.workflow.run(
                             st.session_state.workflow.start_workflow(
                                 niche=niche,
                                 keywords=keywords
@@ -153,13 +164,57 @@ elif st.session_state.workflow_state:
         has_results = has_video_path or has_images or has_caption
         has_concepts = state.get("concepts") and len(state.get("concepts", [])) > 0
         
-        # Route 1: Show Results if completed or has results
-        if is_completed or has_results:
+        # Route 1: Show error state if failed (before results, so partial runs can be resumed)
+        if state.get("status") == "failed":
+            st.error("❌ Workflow Failed")
+            st.error(f"Error: {state.get('error_message', 'Unknown error')}")
+            
+            selected_concept_index = state.get("selected_concept_index")
+            can_resume = selected_concept_index is not None and selected_concept_index >= 0
+            
+            if st.button("🔄 Retry", width='stretch'):
+                if can_resume:
+                    # Resume from the failed stage; completed stages are reused
+                    with st.spinner("Resuming from the failed step..."):
+                        try:
+                            result = st.session_state.workflow.run(
+                                st.session_state.workflow.resume_workflow(
+                                    workflow_id=st.session_state.current_workflow_id,
+                                    background_render=True
+                                )
+                            )
+                            st.session_state.workflow_state = result
+                            st.rerun()
+                        except Exception as e:
+                            st.error(f"Error resuming workflow: {e}")
+                # Reset to concept selection
+                elif state.get("concepts"):
+                    st.session_state.workflow_state = {
+                        **state,
+                        "status": "waiting_for_selection",
+                        "current_step": "concept_selection"
+                    }
+                    st.rerun()
+        
+        # Route 2: Show Results if completed or has results
+        elif is_completed or has_results:
             # Determine if this is a historic run
             video_path = state.get("video_path")
             video_exists = video_path and Path(video_path).exists()
+            is_rendering = state.get("status") == "rendering"
+            if is_rendering:
+                saved_state = st.session_state.workflow.load_workflow_state(
+                    st.session_state.current_workflow_id
+                )
+                render_lost = saved_state is not None and st.session_state.workflow.is_render_stale(saved_state)
+            else:
+                render_lost = False
+            preview_path = state.get("preview_path")
+            preview_exists = preview_path and Path(preview_path).exists()
             
-            if video_exists:
+            if is_rendering:
+                st.header("👀 Preview Ready")
+            elif video_exists:
                 st.header("✅ Video Created Successfully!")
             else:
                 st.header("📁 Historic Workflow")
@@ -170,8 +225,36 @@ elif st.session_state.workflow_state:
             
             st.info(f"Workflow ID: `{st.session_state.current_workflow_id}`")
             
+            # Show the low-res preview while the publish render is still running
+            if is_rendering:
+                if preview_exists:
+                    st.subheader("Preview")
+                    st.video(preview_path)
+                if render_lost:
+                    st.warning("⚠️ The background render stopped before finishing.")
+                    
+                    if st.button("🎬 Re-render Video", key="rerender", width='stretch'):
+                        # Resume re-runs only the video stage; images and voiceover are reused
+                        with st.spinner("Rendering the video again..."):
+                            try:
+                                st.session_state.workflow_state = st.session_state.workflow.run(
+                                    st.session_state.workflow.resume_workflow(
+                                        workflow_id=st.session_state.current_workflow_id,
+                                        background_render=True
+                                    )
+                                )
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Error re-rendering video: {e}")
+                else:
+                    st.info("⏳ The full-quality video is rendering in the background. Refresh to check on it.")
+                    
+                    if st.button("🔄 Refresh Status", key="refresh_render", width='stretch'):
+                        load_workflow_state(st.session_state.current_workflow_id)
+                        st.rerun()
+            
             # Display video if it exists
-            if video_exists:
+            elif video_exists:
                 st.subheader("Final Video")
                 st.video(video_path)
                 
@@ -191,8 +274,11 @@ elif st.session_state.workflow_state:
                 st.subheader("🖼️ Generated Images")
                 st.markdown("Images used in the final video:")
                 
-                # Filter out non-existent paths
-                valid_images = [Path(img) for img in image_paths if Path(img).exists()]
+                # Filter out non-existent paths, keeping each image's segment number
+                valid_images = [
+                    (segment, Path(img)) for segment, img in enumerate(image_paths, 1)
+                    if img and Path(img).exists()
+                ]
                 
                 if valid_images:
                     # Display images in a grid
@@ -203,12 +289,41 @@ elif st.session_state.workflow_state:
                         cols = st.columns(num_cols)
                         for j, col in enumerate(cols):
                             if i + j < num_images:
-                                img_path = valid_images[i + j]
+                                segment, img_path = valid_images[i + j]
                                 with col:
                                     st.image(str(img_path))
-                                    st.caption(f"Image {i + j + 1}: {img_path.name}")
+                                    st.caption(f"Image {segment}: {img_path.name}")
                 else:
                     st.info("ℹ️ Image files not found. They may have been moved or deleted.")
+                
+                # Regenerate chosen segment images, then re-render with everything else reused
+                with st.expander("🔁 Regenerate Images"):
+                    segments_to_redo = st.multiselect(
+                        "Segments to regenerate:",
+                        options=list(range(1, len(image_paths) + 1)),
+                        key=f"regenerate_{st.session_state.current_workflow_id}"
+                    )
+                    if st.button("Regenerate and Re-render", disabled=not segments_to_redo, width='stretch'):
+                        with st.spinner("Regenerating images..."):
+                            try:
+                                workflow = st.session_state.workflow
+                                
+                                async def _regenerate():
+                                    regenerated = await workflow.regenerate_images(
+                                        workflow_id=st.session_state.current_workflow_id,
+                                        segment_indices=[n - 1 for n in segments_to_redo]
+                                    )
+                                    if regenerated.get("status") == "failed":
+                                        return regenerated
+                                    return await workflow.resume_workflow(
+                                        workflow_id=st.session_state.current_workflow_id,
+                                        background_render=True
+                                    )
+                                
+                                st.session_state.workflow_state = workflow.run(_regenerate())
+                                st.rerun()
+                            except Exception as e:
+                                st.error(f"Error regenerating images: {e}")
             
             # Display script
             if state.get("script"):
@@ -275,7 +390,7 @@ elif st.session_state.workflow_state:
                 st.session_state.workflow_state = None
                 st.rerun()
         
-        # Route 2: Show Concept Selection if has concepts but not completed and no results
+        # Route 3: Show Concept Selection if has concepts but not completed and no results
         elif has_concepts and not is_completed and not has_results:
             st.header("Step 2: Select a Concept")
             st.info(f"Workflow ID: `{st.session_state.current_workflow_id}`")
@@ -300,34 +415,20 @@ elif st.session_state.workflow_state:
             if selected_index is not None:
                 with st.spinner("Generating script, images, and video... This will take several minutes."):
                     try:
-                        result = asyncio.run(
+                        result = st.session_state.workflow.run(
                             st.session_state.workflow.continue_workflow(
                                 workflow_id=st.session_state.current_workflow_id,
-                                selected_concept_index=selected_index
+                                selected_concept_index=selected_index,
+                                background_render=True
                             )
                         )
                         
                         st.session_state.workflow_state = result
-                        st.success("Video creation complete!")
+                        st.success("Preview ready! The final video is rendering in the background.")
                         st.rerun()
                     except Exception as e:
                         st.error(f"Error creating video: {e}")
         
-        # Route 3: Show error state if failed
-        elif state.get("status") == "failed":
-            st.error("❌ Workflow Failed")
-            st.error(f"Error: {state.get('error_message', 'Unknown error')}")
-            
-            if st.button("🔄 Retry", width='stretch'):
-                # Reset to concept selection
-                if state.get("concepts"):
-                    st.session_state.workflow_state = {
-                        **state,
-                        "status": "waiting_for_selection",
-                        "current_step": "concept_selection"
-                    }
-                    st.rerun()
-        
         # Route 4: Show loading/in-progress state
         else:
             current_step = state.get("current_step", "unknown")
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""Benchmark the video render engines and profiles (wall time, peak RSS, size, output parity)."""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from utils.video_utils import (
+    RENDER_ENGINES, RENDER_PROFILES, VideoProcessor, compare_renders, _get_ffmpeg_binary
+)
+
+
+def _peak_rss_mb(usage: resource.struct_rusage) -> float:
+    """Convert ru_maxrss to megabytes (kilobytes on Linux, bytes on macOS)."""
+    if sys.platform == "darwin":
+        return usage.ru_maxrss / (1024 * 1024)
+    return usage.ru_maxrss / 1024
+
+
+def create_fixtures(work_dir: Path, image_count: int, duration: float) -> tuple:
+    """Create synthetic DALL-E sized images and a voiceover-length audio track."""
+    from PIL import Image
+    
+    image_paths = []
+    for i in range(image_count):
+        image_path = work_dir / f"bench_image_{i+1:02d}.png"
+        color = ((i * 60) % 256, (i * 110) % 256, (i * 170) % 256)
+        Image.new("RGB", (1024, 1792), color).save(image_path)
+        image_paths.append(image_path)
+    
+    audio_path = work_dir / "bench_voiceover.mp3"
+    subprocess.run(
+        [
+            _get_ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "lavfi", "-i", f"sine=frequency=440:duration={duration}",
+            "-c:a", "libmp3lame", "-b:a", "128k", str(audio_path)
+        ],
+        check=True
+    )
+    
+    return image_paths, audio_path
+
+
+def _render_worker(
+    engine: str,
+    profile: str,
+    image_paths: list,
+    audio_path: Path,
+    output_path: Path,
+    queue
+):
+    """Render in a fresh process so peak RSS is measured per engine."""
+    # Start every run with empty segment and frame caches so chunk encodes and
+    # image scaling are measured; the caches are deleted when the run ends
+    with tempfile.TemporaryDirectory(prefix="bench_cache_") as cache_dir:
+        os.environ["SEGMENT_CACHE_DIR"] = str(Path(cache_dir) / "segments")
+        os.environ["FRAME_CACHE_DIR"] = str(Path(cache_dir) / "frames")
+        processor = VideoProcessor(render_engine=engine, render_profile=profile)
+        
+        start = time.perf_counter()
+        processor.create_reel(
+            image_paths=image_paths,
+            audio_path=audio_path,
+            output_path=output_path
+        )
+        elapsed = time.perf_counter() - start
+    
+    queue.put({
+        "wall_time": elapsed,
+        "python_rss_mb": _peak_rss_mb(resource.getrusage(resource.RUSAGE_SELF)),
+        "ffmpeg_rss_mb": _peak_rss_mb(resource.getrusage(resource.RUSAGE_CHILDREN)),
+        "size_mb": output_path.stat().st_size / (1024 * 1024),
+    })
+
+
+def run_engine(
+    engine: str,
+    image_paths: list,
+    audio_path: Path,
+    output_path: Path,
+    profile: str = "publish"
+) -> dict:
+    """Run one engine render in a subprocess and collect its measurements."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    process = ctx.Process(
+        target=_render_worker,
+        args=(engine, profile, image_paths, audio_path, output_path, queue)
+    )
+    process.start()
+    process.join()
+    
+    if process.exitcode != 0:
+        raise RuntimeError(f"{engine} render failed with exit code {process.exitcode}")
+    
+    return queue.get()
+
+
+def run_pool(
+    engine: str,
+    image_paths: list,
+    audio_path: Path,
+    work_dir: Path,
+    jobs: int,
+    workers: int
+) -> dict:
+    """Render several reels at once through the render worker pool and collect its stats."""
+    from utils.render_pool import RenderWorkerPool
+    
+    saved_env = {name: os.environ.get(name) for name in ("SEGMENT_CACHE_DIR", "FRAME_CACHE_DIR")}
+    with tempfile.TemporaryDirectory(prefix="bench_cache_") as cache_dir:
+        # Spawned workers inherit these, so the pool also starts with empty caches
+        os.environ["SEGMENT_CACHE_DIR"] = str(Path(cache_dir) / "segments")
+        os.environ["FRAME_CACHE_DIR"] = str(Path(cache_dir) / "frames")
+        pool = RenderWorkerPool(max_workers=workers)
+        try:
+            start = time.perf_counter()
+            futures = [
+                pool.submit(
+                    image_paths, audio_path, work_dir / f"bench_pool_{i+1:02d}.mp4",
+                    render_engine=engine
+                )
+                for i in range(jobs)
+            ]
+            for future in futures:
+                future.result()
+            wall_time = time.perf_counter() - start
+        finally:
+            pool.shutdown()
+            for name, value in saved_env.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+    
+    return {**pool.stats(), "wall_time": wall_time}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=6, help="Number of still images")
+    parser.add_argument("--duration", type=float, default=30.0, help="Audio duration in seconds")
+    parser.add_argument("--output-dir", type=Path, default=None, help="Keep outputs in this directory")
+    parser.add_argument(
+        "--profile-engine", choices=RENDER_ENGINES, default="ffmpeg",
+        help="Engine used to compare the render profiles"
+    )
+    parser.add_argument("--pool-jobs", type=int, default=4, help="Reels rendered through the render pool (0 skips it)")
+    parser.add_argument("--pool-workers", type=int, default=2, help="Render pool worker processes")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("Render Engine Benchmark")
+    print("=" * 60)
+    print(f"\nImages: {args.images}  Duration: {args.duration:.1f}s\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = args.output_dir or Path(tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+        image_paths, audio_path = create_fixtures(work_dir, args.images, args.duration)
+        
+        print("Engines (publish profile):")
+        outputs = {}
+        for engine in RENDER_ENGINES:
+            output_path = work_dir / f"bench_{engine}.mp4"
+            stats = run_engine(engine, image_paths, audio_path, output_path)
+            outputs[engine] = output_path
+            print(f"{engine:>8}: {stats['wall_time']:7.2f}s wall | "
+                  f"python peak RSS {stats['python_rss_mb']:7.1f} MB | "
+                  f"ffmpeg peak RSS {stats['ffmpeg_rss_mb']:7.1f} MB | "
+                  f"{stats['size_mb']:.2f} MB output")
+        
+        print(f"\nProfiles ({args.profile_engine} engine):")
+        for profile in RENDER_PROFILES:
+            output_path = work_dir / f"bench_profile_{profile}.mp4"
+            stats = run_engine(args.profile_engine, image_paths, audio_path, output_path, profile)
+            print(f"{profile:>8}: {stats['wall_time']:7.2f}s wall | "
+                  f"{stats['size_mb']:.2f} MB output")
+        
+        if args.pool_jobs > 0:
+            print(f"\nRender pool ({args.pool_jobs} jobs on {args.pool_workers} workers, "
+                  f"{args.profile_engine} engine):")
+            stats = run_pool(
+                args.profile_engine, image_paths, audio_path, work_dir,
+                args.pool_jobs, args.pool_workers
+            )
+            print(f"{stats['wall_time']:7.2f}s wall | "
+                  f"avg encode {stats['avg_encode_seconds']:.2f}s | "
+                  f"avg queue wait {stats['avg_queue_wait_seconds']:.2f}s | "
+                  f"max queue depth {stats['max_queue_depth']} | "
+                  f"{stats['completed']}/{stats['submitted']} completed")
+        
+        for engine in RENDER_ENGINES:
+            if engine == "moviepy":
+                continue
+            print(f"\nParity ({engine} vs moviepy):")
+            mismatches = compare_renders(outputs["moviepy"], outputs[engine])
+            if mismatches:
+                for mismatch in mismatches:
+                    print(f"  ❌ {mismatch}")
+            else:
+                print("  ✅ Duration, resolution, fps, audio stream and sampled frames match")
+    
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
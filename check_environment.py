@@ -40,7 +40,6 @@ def main():
             print("✅ moviepy (v1.x detected)")
     
     checks = [
-        ("elevenlabs", "from elevenlabs.client import ElevenLabs"),
         ("langgraph", "from langgraph.graph import StateGraph"),
         ("streamlit", "import streamlit"),
         ("pydantic", "from pydantic import BaseModel"),
@@ -1,6 +1,7 @@
 """CLI interface for Instagram Reels creation workflow."""
 
 import asyncio
+import os
 import sys
 from pathlib import Path
 from typing import Optional
@@ -10,7 +11,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from orchestrator.workflow import ReelsWorkflow
-from orchestrator.state_manager import StateManager
+from orchestrator.state_manager import create_state_manager
+from orchestrator.batch import BatchRunner, CONCEPT_POLICIES, load_batch_file
+from utils.video_utils import RENDER_PROFILES
 
 
 class CLI:
@@ -18,7 +21,7 @@ class CLI:
     
     def __init__(self):
         self.workflow = ReelsWorkflow()
-        self.state_manager = StateManager()
+        self.state_manager = create_state_manager()
     
     def print_header(self):
         """Print CLI header."""
@@ -148,9 +151,9 @@ class CLI:
             import traceback
             traceback.print_exc()
     
-    def list_workflows(self):
-        """List all saved workflows."""
-        workflows = self.state_manager.list_workflows()
+    def list_workflows(self, limit: Optional[int] = None):
+        """List saved workflows (summaries only), most recent first."""
+        workflows = self.state_manager.list_workflows(limit=limit)
         
         if not workflows:
             print("No saved workflows found.")
@@ -167,6 +170,70 @@ class CLI:
             print(f"  Step: {wf.get('current_step', 'N/A')}")
             print(f"  Updated: {wf.get('updated_at', 'N/A')}")
             print()
+        
+        total = self.state_manager.count_workflows()
+        if total > len(workflows):
+            print(f"... and {total - len(workflows)} older workflows")
+    
+    async def run_batch(
+        self,
+        batch_file: Path,
+        concept_policy: str,
+        max_concurrent: int,
+        render_profile: Optional[str] = None
+    ):
+        """Create one reel per niche/keywords row without prompting."""
+        self.print_header()
+        
+        rows = load_batch_file(batch_file)
+        if not rows:
+            print(f"No niche rows found in {batch_file}.")
+            return
+        
+        print(f"⏳ Creating {len(rows)} reels "
+              f"(concept policy: {concept_policy}, {max_concurrent} at a time)...\n")
+        
+        runner = BatchRunner(
+            workflow=self.workflow,
+            max_concurrent_reels=max_concurrent,
+            concept_policy=concept_policy,
+            render_profile=render_profile
+        )
+        report = await runner.run(rows)
+        
+        print("\n" + "="*60)
+        print("Batch Summary")
+        print("="*60 + "\n")
+        
+        for reel in report["reels"]:
+            status_icon = "✅" if reel["status"] == "completed" else "❌"
+            total = reel["timings"].get("total_seconds", 0)
+            print(f"{status_icon} {reel['workflow_id']} - {reel['niche']} ({total:.1f}s)")
+            if reel["error_message"]:
+                print(f"    Error: {reel['error_message']}")
+        
+        print()
+        print(f"Succeeded: {report['succeeded']}/{report['total_reels']}")
+        print(f"Wall time: {report['wall_time_seconds']:.1f}s")
+        print(f"Throughput: {report['reels_per_hour']:.1f} reels/hour")
+        
+        render_pool = report["render_pool"]
+        if render_pool and render_pool["submitted"]:
+            print(f"Render pool: {render_pool['completed']}/{render_pool['submitted']} renders on "
+                  f"{render_pool['workers']} workers, avg encode {render_pool['avg_encode_seconds']:.1f}s, "
+                  f"avg queue wait {render_pool['avg_queue_wait_seconds']:.1f}s, "
+                  f"max queue depth {render_pool['max_queue_depth']}")
+        image_clients = report["image_clients"]
+        if image_clients["created"]:
+            print(f"Azure image clients: {image_clients['created']} created, "
+                  f"{image_clients['reused']} reused ({image_clients['reuse_rate']:.0%} reuse)")
+        
+        for provider, limits in report["rate_limits"].items():
+            effective = limits["effective_per_minute"]["requests"]
+            configured = limits["configured_per_minute"]["requests"]
+            print(f"Rate limit {provider}: {effective:.0f}/{configured:.0f} requests/min, "
+                  f"throttled {limits['throttled']}x")
+        print(f"Report saved at: {report['report_path']}\n")
     
     def resume_workflow(self, workflow_id: str):
         """Resume an existing workflow."""
@@ -186,17 +253,72 @@ class CLI:
             selected_index = self.select_concept(state.concepts)
             
             print(f"\n⏳ Continuing workflow...\n")
-            asyncio.run(
+            self.workflow.run(
                 self.workflow.continue_workflow(workflow_id, selected_index)
             )
         elif state.status == "completed":
             print("✅ This workflow is already completed.")
             if state.video_path:
                 print(f"Video: {state.video_path}")
+        elif state.status == "rendering" and not self.workflow.is_render_stale(state):
+            print("⏳ The final video is still rendering in the background.")
+        elif state.selected_concept_index is not None and state.selected_concept_index >= 0:
+            # Completed stages with unchanged inputs are skipped
+            if state.status == "rendering":
+                print("⚠️  The background render was interrupted; rendering the video again.\n")
+            print(f"⏳ Resuming from the last completed stage...\n")
+            result = self.workflow.run(self.workflow.resume_workflow(workflow_id))
+            
+            if result.get("status") == "completed":
+                print("✅ Workflow completed.")
+                if result.get("video_path"):
+                    print(f"Video: {result['video_path']}")
+            else:
+                print(f"❌ Workflow failed: {result.get('error_message', 'Unknown error')}")
         else:
             print(f"Current status: {state.status}")
             if state.error_message:
                 print(f"Error: {state.error_message}")
+    
+    def migrate_state(self, json_dir: Optional[str] = None):
+        """Copy JSON state files into the SQLite state database."""
+        from orchestrator.sqlite_state import SQLiteStateManager
+        
+        json_dir = Path(json_dir or os.getenv("STATE_STORAGE_PATH", "./state"))
+        store = SQLiteStateManager(os.getenv("STATE_STORAGE_PATH", "./state"))
+        imported = store.import_json_states(json_dir)
+        
+        print(f"✅ Imported {imported} workflows from {json_dir} into {store.db_path}")
+        print("Set STATE_FILE_FORMAT=sqlite to use the database.")
+    
+    def regenerate_images(self, workflow_id: str, segments: str):
+        """Regenerate chosen segment images (1-based, comma separated) and re-render."""
+        try:
+            segment_indices = [int(n) - 1 for n in segments.split(",") if n.strip()]
+        except ValueError:
+            print(f"Invalid segment list: {segments}")
+            return
+        
+        print(f"\n⏳ Regenerating images for segment(s) {segments}...\n")
+        
+        async def _regenerate():
+            result = await self.workflow.regenerate_images(workflow_id, segment_indices)
+            if result.get("status") == "failed":
+                return result
+            return await self.workflow.resume_workflow(workflow_id)
+        
+        try:
+            result = self.workflow.run(_regenerate())
+        except ValueError as e:
+            print(f"❌ {e}")
+            return
+        
+        if result.get("status") == "completed":
+            print("✅ Images regenerated and video re-rendered.")
+            if result.get("video_path"):
+                print(f"Video: {result['video_path']}")
+        else:
+            print(f"❌ Workflow failed: {result.get('error_message', 'Unknown error')}")
 
 
 def main():
@@ -207,16 +329,38 @@ def main():
         command = sys.argv[1]
         
         if command == "list":
-            cli.list_workflows()
+            cli.list_workflows(int(sys.argv[2]) if len(sys.argv) > 2 else None)
         elif command == "resume" and len(sys.argv) > 2:
             cli.resume_workflow(sys.argv[2])
+        elif command == "migrate-state":
+            cli.migrate_state(sys.argv[2] if len(sys.argv) > 2 else None)
+        elif command == "regenerate" and len(sys.argv) > 3:
+            cli.regenerate_images(sys.argv[2], sys.argv[3])
+        elif command == "batch" and len(sys.argv) > 2:
+            import argparse
+            parser = argparse.ArgumentParser(prog="python cli.py batch")
+            parser.add_argument("batch_file", type=Path)
+            parser.add_argument("--policy", choices=CONCEPT_POLICIES, default="first")
+            parser.add_argument("--concurrency", type=int, default=4)
+            parser.add_argument("--profile", choices=list(RENDER_PROFILES), default=None)
+            args = parser.parse_args(sys.argv[2:])
+            cli.workflow.run(
+                cli.run_batch(args.batch_file, args.policy, args.concurrency, args.profile)
+            )
         else:
             print("Usage:")
             print("  python cli.py              - Create new reel")
-            print("  python cli.py list         - List saved workflows")
+            print("  python cli.py list [N]     - List saved workflows (N most recent)")
             print("  python cli.py resume <id>  - Resume a workflow")
+            print("  python cli.py migrate-state [json_dir]")
+            print("                             - Import JSON workflow states into SQLite")
+            print("  python cli.py regenerate <id> <segments>")
+            print("                             - Regenerate segment images (e.g. 2,5) and re-render")
+            print("  python cli.py batch <file> [--policy first|random|round_robin] [--concurrency N]")
+            print("                             [--profile draft|preview|publish]")
+            print("                             - Create one reel per niche,keywords row")
     else:
-        asyncio.run(cli.create_reel())
+        cli.workflow.run(cli.create_reel())
 
 
 if __name__ == "__main__":
@@ -25,31 +25,102 @@ class Settings(BaseSettings):
     elevenlabs_api_key: str
     elevenlabs_voice_id: str = "21m00Tcm4TlvDq8ikWAM"
     elevenlabs_model_id: str = "eleven_turbo_v2_5"
+    elevenlabs_base_url: str = "https://api.elevenlabs.io"
+    voiceover_per_segment: bool = False  # synthesize segments in parallel, cut images on their lengths
     
     # Replicate (optional)
     replicate_api_token: Optional[str] = None
     replicate_model: str = "stability-ai/sdxl:39ed52f2a78e934b3ba6e2a89f5b1c712de7dfea535525255b1aa35c5565e08b"
+    replicate_poll_initial_seconds: float = 1.0
+    replicate_poll_backoff: float = 1.5
+    replicate_poll_max_seconds: float = 5.0
+    replicate_prediction_timeout_seconds: float = 600
+    replicate_prediction_attempts: int = 2
     
     # Image Generation
     image_generation_provider: str = "openai"  # openai or replicate
+    image_concurrency_per_reel: int = 4  # images generated at once for one reel
+    image_retry_attempts: int = 3  # rounds of generation for images that keep failing
+    image_retry_backoff_seconds: float = 5.0  # wait before the first retry round, doubled each round
     
     # State Management
     state_storage_path: Path = Path("./state")
-    state_file_format: str = "json"
+    state_file_format: str = "json"  # json (one file per workflow) or sqlite (indexed database)
+    state_serializer: str = "json"  # json (indented), compact or orjson; JSON state files only
     
     # Rate Limiting
     max_retries: int = 3
     retry_delay_seconds: float = 2.0
     rate_limit_requests_per_minute: int = 60
     
+    # Per-provider token buckets (shared by all clients in the process, 0 disables a bucket)
+    openai_requests_per_minute: Optional[int] = None  # defaults to rate_limit_requests_per_minute
+    openai_tokens_per_minute: int = 90000
+    openai_images_per_minute: int = 20
+    elevenlabs_requests_per_minute: int = 30
+    elevenlabs_characters_per_minute: int = 0
+    replicate_requests_per_minute: int = 20
+    
+    # HTTP Connection Pool (media downloads)
+    http_pool_limit: int = 32
+    http_pool_limit_per_host: int = 8
+    http_keepalive_timeout: float = 30.0
+    http_timeout_seconds: float = 120.0
+    http_connect_timeout_seconds: float = 15.0
+    
     # Video Configuration
     video_resolution: str = "1080x1920"
     video_fps: int = 30
     audio_bitrate: str = "192k"
+    video_bitrate: Optional[str] = None  # fixed video bitrate; CRF from the render profile when unset
+    video_render_profile: str = "publish"  # draft, preview or publish
+    video_render_engine: str = "moviepy"  # moviepy, ffmpeg or segments
+    preview_resolution: str = "360x640"  # low-res preview shown while the publish render runs
+    preview_fps: int = 15
+    ffmpeg_threads: int = 2  # encoder threads per render, 0 = ffmpeg default
+    render_workers: str = "auto"  # render processes; auto = CPU cores / ffmpeg_threads, 0 = thread executor
+    
+    # LLM Response Cache (opt-in)
+    llm_cache_enabled: bool = False
+    llm_cache_dir: Path = Path("./cache/llm")
+    llm_cache_ttl_hours: float = 168
+    llm_cache_max_mb: float = 50
+    
+    # Generated Image Cache
+    image_cache_enabled: bool = True
+    image_cache_dir: Path = Path("./cache/images")
+    image_cache_max_mb: float = 2048
+    image_cost_usd: Optional[float] = None  # overrides the built-in per-image price estimate
+    
+    # Voiceover Cache
+    voice_cache_enabled: bool = True
+    voice_cache_dir: Path = Path("./cache/voice")
+    voice_cache_max_mb: float = 512
+    
+    # Pre-scaled Frame Cache
+    frame_cache_enabled: bool = True
+    frame_cache_dir: Path = Path("./cache/frames")
+    frame_cache_max_mb: float = 1024
+    segment_cache_dir: Path = Path("./cache/segments")
+    segment_cache_max_mb: float = 2048
     
     # Output
     output_dir: Path = Path("./output")
     
+    # Orchestration
+    workflow_execution_mode: str = "sequential"  # sequential or pipelined
+    render_stale_seconds: float = 3600  # a background render older than this is redone on resume
+    
+    # Provider Concurrency Budgets (shared by all workflows in the process)
+    max_concurrent_openai_text: int = 8
+    max_concurrent_images: int = 8
+    max_concurrent_elevenlabs: int = 4
+    max_concurrent_ffmpeg: Optional[int] = None  # defaults to CPU count
+    
+    # Dedicated render thread pool (queue wait is reported in batch reports)
+    executor_render_workers: Optional[int] = None  # defaults to CPU count
+    executor_state_workers: int = 4  # threads writing workflow state off the event loop
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
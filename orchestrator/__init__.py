@@ -1,9 +1,14 @@
 """Orchestrator modules for workflow management."""
 
 from .workflow import ReelsWorkflow
-from .state_manager import StateManager
+from .state_manager import StateManager, create_state_manager
+from .sqlite_state import SQLiteStateManager
+from .batch import BatchRunner
 
 __all__ = [
     "ReelsWorkflow",
     "StateManager",
+    "SQLiteStateManager",
+    "create_state_manager",
+    "BatchRunner",
 ]
@@ -0,0 +1,197 @@
+"""Non-interactive batch production of many reels in one process."""
+
+import csv
+import json
+import random
+import asyncio
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from datetime import datetime
+
+from orchestrator.workflow import ReelsWorkflow
+from utils.api_clients import azure_image_clients
+from utils.executors import get_executor_metrics
+from utils.render_pool import get_render_pool_metrics
+from utils.rate_limiter import get_rate_limit_metrics
+
+
+# Policies for choosing a concept without user input
+CONCEPT_POLICIES = ("first", "random", "round_robin")
+
+
+def load_batch_file(batch_file: Path) -> List[Dict[str, str]]:
+    """
+    Load niche/keyword rows from a CSV file.
+    
+    The file may have a header row with "niche" and "keywords" columns, or plain
+    rows where the first column is the niche and the second (optional) the keywords.
+    Blank lines and lines starting with # are ignored.
+    """
+    with open(batch_file, "r", newline="") as f:
+        lines = [line for line in f if line.strip() and not line.lstrip().startswith("#")]
+    
+    if not lines:
+        return []
+    
+    rows = []
+    reader = csv.reader(lines)
+    first_row = next(reader)
+    header = [column.strip().lower() for column in first_row]
+    
+    if "niche" in header:
+        niche_index = header.index("niche")
+        keywords_index = header.index("keywords") if "keywords" in header else None
+    else:
+        niche_index, keywords_index = 0, 1
+        reader = csv.reader(lines)
+    
+    for row in reader:
+        if len(row) <= niche_index or not row[niche_index].strip():
+            continue
+        keywords = ""
+        if keywords_index is not None and len(row) > keywords_index:
+            keywords = row[keywords_index].strip()
+        rows.append({"niche": row[niche_index].strip(), "keywords": keywords})
+    
+    return rows
+
+
+def select_concept_index(concepts: list, policy: str, position: int) -> int:
+    """Pick a concept index for a reel according to the auto-select policy."""
+    if policy == "first":
+        return 0
+    if policy == "random":
+        return random.randrange(len(concepts))
+    if policy == "round_robin":
+        return position % len(concepts)
+    raise ValueError(
+        f"Unknown concept policy: {policy}. Choose one of: {', '.join(CONCEPT_POLICIES)}"
+    )
+
+
+class BatchRunner:
+    """Runs many ReelsWorkflow pipelines concurrently and reports throughput."""
+    
+    def __init__(
+        self,
+        workflow: Optional[ReelsWorkflow] = None,
+        max_concurrent_reels: int = 4,
+        concept_policy: str = "first",
+        report_dir: Path = Path("./output/batch_reports"),
+        render_profile: Optional[str] = None
+    ):
+        if concept_policy not in CONCEPT_POLICIES:
+            raise ValueError(
+                f"Unknown concept policy: {concept_policy}. "
+                f"Choose one of: {', '.join(CONCEPT_POLICIES)}"
+            )
+        
+        self.workflow = workflow or ReelsWorkflow()
+        self.max_concurrent_reels = max_concurrent_reels
+        self.concept_policy = concept_policy
+        self.report_dir = Path(report_dir)
+        self.render_profile = render_profile
+    
+    async def _run_reel(
+        self,
+        row: Dict[str, str],
+        position: int,
+        batch_id: str,
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """Run one reel end to end and record its timings."""
+        # Timestamp IDs alone would collide when reels start in the same second
+        workflow_id = f"{batch_id}-{position + 1:03d}"
+        record: Dict[str, Any] = {
+            "workflow_id": workflow_id,
+            "niche": row["niche"],
+            "keywords": row["keywords"],
+            "status": "failed",
+            "error_message": None,
+            "video_path": None,
+            "timings": {},
+        }
+        
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await self.workflow.start_workflow(
+                    niche=row["niche"],
+                    keywords=row["keywords"],
+                    workflow_id=workflow_id
+                )
+                record["timings"]["concepts_seconds"] = time.perf_counter() - start
+                
+                concepts = result.get("concepts", [])
+                if result.get("status") == "failed" or not concepts:
+                    record["error_message"] = result.get("error_message") or "No concepts were generated"
+                    return record
+                
+                selected_index = select_concept_index(concepts, self.concept_policy, position)
+                record["selected_concept_index"] = selected_index
+                
+                production_start = time.perf_counter()
+                result = await self.workflow.continue_workflow(
+                    workflow_id=workflow_id,
+                    selected_concept_index=selected_index,
+                    render_profile=self.render_profile
+                )
+                record["timings"]["production_seconds"] = time.perf_counter() - production_start
+                
+                record["status"] = result.get("status", "failed")
+                record["error_message"] = result.get("error_message") or None
+                record["video_path"] = result.get("video_path") or None
+            
+            except Exception as e:
+                record["error_message"] = str(e)
+            
+            finally:
+                record["timings"]["total_seconds"] = time.perf_counter() - start
+                print(f"[{workflow_id}] {row['niche']}: {record['status']}")
+        
+        return record
+    
+    async def run(self, rows: List[Dict[str, str]]) -> Dict[str, Any]:
+        """
+        Produce one reel per row and write a summary report.
+        
+        Returns:
+            Summary report with per-reel records and overall throughput
+        """
+        batch_id = datetime.now().strftime("%Y-%m-%d-%H%M%S")
+        semaphore = asyncio.Semaphore(self.max_concurrent_reels)
+        
+        start = time.perf_counter()
+        records = await asyncio.gather(*[
+            self._run_reel(row, position, batch_id, semaphore)
+            for position, row in enumerate(rows)
+        ])
+        wall_time = time.perf_counter() - start
+        
+        succeeded = [r for r in records if r["status"] == "completed"]
+        report = {
+            "batch_id": batch_id,
+            "concept_policy": self.concept_policy,
+            "render_profile": self.render_profile,
+            "max_concurrent_reels": self.max_concurrent_reels,
+            "total_reels": len(records),
+            "succeeded": len(succeeded),
+            "failed": len(records) - len(succeeded),
+            "wall_time_seconds": wall_time,
+            "reels_per_hour": len(succeeded) / wall_time * 3600 if wall_time > 0 else 0.0,
+            "executors": get_executor_metrics(),
+            "state_saves": self.workflow.state_saver.stats(),
+            "image_clients": azure_image_clients.stats(),
+            "render_pool": get_render_pool_metrics(),
+            "rate_limits": get_rate_limit_metrics(),
+            "reels": records,
+        }
+        
+        self.report_dir.mkdir(parents=True, exist_ok=True)
+        report_path = self.report_dir / f"batch-{batch_id}.json"
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        report["report_path"] = str(report_path)
+        
+        return report
@@ -0,0 +1,184 @@
+"""SQLite-backed workflow state store with indexed listing."""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from orchestrator.state_manager import SUMMARY_FIELDS, WorkflowState
+
+
+# Columns copied out of the state blob so listing and filtering never parse it
+INDEXED_COLUMNS = SUMMARY_FIELDS
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS workflows (
+    workflow_id TEXT PRIMARY KEY,
+    created_at TEXT,
+    updated_at TEXT NOT NULL,
+    current_step TEXT,
+    status TEXT,
+    niche TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_workflows_updated_at ON workflows (updated_at);
+CREATE INDEX IF NOT EXISTS idx_workflows_status ON workflows (status, updated_at);
+CREATE INDEX IF NOT EXISTS idx_workflows_current_step ON workflows (current_step, updated_at);
+CREATE INDEX IF NOT EXISTS idx_workflows_niche ON workflows (niche, updated_at);
+"""
+
+
+class SQLiteStateManager:
+    """
+    Stores workflow state in one SQLite database (WAL mode) instead of one JSON file per workflow.
+    
+    workflow_id, status, current_step, niche and the timestamps are indexed columns,
+    so the sidebar listing is a small indexed query no matter how many workflows
+    have accumulated. Same interface as StateManager.
+    """
+    
+    def __init__(self, storage_path: Path = Path("./state"), db_name: str = "workflows.sqlite3"):
+        self.storage_path = Path(storage_path)
+        self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.db_path = self.storage_path / db_name
+        
+        # sqlite3 connections can't be shared across threads (background renders save state)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+    
+    def save_state(self, state: WorkflowState) -> Path:
+        """Insert or update a workflow state in one transaction."""
+        state.updated_at = datetime.now().isoformat()
+        with self._connect() as conn:
+            self._upsert(conn, state.model_dump())
+        return self.db_path
+    
+    @staticmethod
+    def _upsert(conn: sqlite3.Connection, data: Dict[str, Any]) -> None:
+        conn.execute(
+            """
+            INSERT INTO workflows
+                (workflow_id, created_at, updated_at, current_step, status, niche, data)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (workflow_id) DO UPDATE SET
+                updated_at = excluded.updated_at,
+                current_step = excluded.current_step,
+                status = excluded.status,
+                niche = excluded.niche,
+                data = excluded.data
+            """,
+            (*(data.get(column) for column in INDEXED_COLUMNS), json.dumps(data))
+        )
+    
+    def load_state(self, workflow_id: str) -> Optional[WorkflowState]:
+        """Load workflow state from the database."""
+        row = self._connect().execute(
+            "SELECT data FROM workflows WHERE workflow_id = ?", (workflow_id,)
+        ).fetchone()
+        
+        if row is None:
+            return None
+        
+        try:
+            return WorkflowState(**json.loads(row["data"]))
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Error loading state: {e}")
+            return None
+    
+    @staticmethod
+    def _filters(
+        status: Optional[str],
+        current_step: Optional[str],
+        niche: Optional[str]
+    ) -> tuple:
+        clauses, params = [], []
+        for column, value in (("status", status), ("current_step", current_step), ("niche", niche)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+    
+    def list_workflows(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        status: Optional[str] = None,
+        current_step: Optional[str] = None,
+        niche: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        List saved workflows, most recently updated first.
+        
+        Args:
+            limit: Maximum number of workflows to return (all if None)
+            offset: Number of workflows to skip (for pagination)
+            status: Only workflows with this status
+            current_step: Only workflows at this step
+            niche: Only workflows for this niche
+        """
+        where, params = self._filters(status, current_step, niche)
+        rows = self._connect().execute(
+            f"SELECT {', '.join(INDEXED_COLUMNS)} FROM workflows {where} "
+            "ORDER BY updated_at DESC LIMIT ? OFFSET ?",
+            (*params, -1 if limit is None else limit, offset)
+        ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def count_workflows(
+        self,
+        status: Optional[str] = None,
+        current_step: Optional[str] = None,
+        niche: Optional[str] = None
+    ) -> int:
+        """Count saved workflows matching the filters."""
+        where, params = self._filters(status, current_step, niche)
+        return self._connect().execute(
+            f"SELECT COUNT(*) FROM workflows {where}", params
+        ).fetchone()[0]
+    
+    def delete_state(self, workflow_id: str) -> bool:
+        """Delete a workflow state."""
+        with self._connect() as conn:
+            cursor = conn.execute("DELETE FROM workflows WHERE workflow_id = ?", (workflow_id,))
+        return cursor.rowcount > 0
+    
+    def import_json_states(self, json_dir: Path) -> int:
+        """
+        Copy every <workflow_id>.json state file from a directory into the database.
+        
+        Runs as a single transaction, so an interrupted migration imports nothing.
+        Existing rows with the same workflow_id are overwritten; updated_at is kept
+        as it was in the file. The JSON files are left in place.
+        
+        Returns:
+            Number of workflows imported
+        """
+        imported = 0
+        with self._connect() as conn:
+            for state_file in sorted(Path(json_dir).glob("*.json")):
+                try:
+                    with open(state_file, "r") as f:
+                        data = WorkflowState(**json.load(f)).model_dump()
+                except (OSError, ValueError) as e:
+                    print(f"Skipping {state_file}: {e}")
+                    continue
+                
+                self._upsert(conn, data)
+                imported += 1
+        
+        return imported
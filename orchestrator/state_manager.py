@@ -1,11 +1,26 @@
 """State management for workflow persistence."""
 
+import asyncio
 import json
+import os
+import tempfile
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from utils.executors import get_executor
+
+
+# STATE_SERIALIZER options: pretty-printed JSON, single-line JSON, or orjson (optional dependency)
+STATE_SERIALIZERS = ("json", "compact", "orjson")
+
+# Fields shown when listing workflows; the manifest keeps only these per workflow
+SUMMARY_FIELDS = ("workflow_id", "created_at", "updated_at", "current_step", "status", "niche")
+
+MANIFEST_NAME = "workflows.manifest"
+
 
 class WorkflowState(BaseModel):
     """Complete workflow state that can be saved and restored."""
@@ -23,39 +38,127 @@ class WorkflowState(BaseModel):
     script: Optional[Dict[str, Any]] = None
     
     # Step 3: Media Generation
-    image_paths: Optional[list] = None
+    image_paths: Optional[list] = None  # one entry per script segment, "" where generation failed
+    image_status: Optional[list] = None  # per segment: pending, completed or failed
     
     # Step 4: Video Assembly
     audio_path: Optional[str] = None
+    audio_durations: Optional[list] = None  # measured per-segment voiceover lengths
     video_path: Optional[str] = None
+    preview_path: Optional[str] = None  # low-resolution preview shown while the publish render runs
     
     # Step 5: Caption Generation
     caption: Optional[Dict[str, Any]] = None
     
     # Metadata
     current_step: str = "concept_generation"
-    status: str = "in_progress"  # in_progress, completed, failed
+    status: str = "in_progress"  # in_progress, rendering, completed, failed
+    render_started_at: Optional[str] = None  # when the background publish render was queued
+    render_pid: Optional[int] = None  # process that owns the background publish render
     error_message: Optional[str] = None
+    render_profile: Optional[str] = None  # draft, preview or publish
+    stage_fingerprints: Optional[Dict[str, str]] = None  # input hash per completed stage, for resume
 
 
 class StateManager:
-    """Manages workflow state persistence."""
+    """
+    Manages workflow state persistence.
+    
+    Besides one JSON file per workflow, keeps a compact manifest with only the
+    listing fields of each workflow, updated on every save. Listing reads the
+    manifest and stats the state files (to pick up files written by other
+    processes) instead of parsing every full state.
+    """
     
-    def __init__(self, storage_path: Path = Path("./state")):
+    def __init__(self, storage_path: Path = Path("./state"), serializer: Optional[str] = None):
+        """
+        Args:
+            storage_path: Directory holding one <workflow_id>.json file per workflow
+            serializer: "json" (indented), "compact" (single line) or "orjson" (fastest,
+                       needs the orjson package). Defaults to the STATE_SERIALIZER
+                       environment variable.
+        """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        
+        self.serializer = (serializer or os.getenv("STATE_SERIALIZER", "json")).lower()
+        if self.serializer not in STATE_SERIALIZERS:
+            raise ValueError(
+                f"Unknown state serializer: {self.serializer}. "
+                f"Choose one of: {', '.join(STATE_SERIALIZERS)}"
+            )
+        if self.serializer == "orjson":
+            try:
+                import orjson  # noqa: F401
+            except ImportError as e:
+                raise ImportError(
+                    "STATE_SERIALIZER=orjson needs orjson. Install it with: pip install orjson"
+                ) from e
+        
+        self.manifest_path = self.storage_path / MANIFEST_NAME
+        self._manifest: Dict[str, Dict[str, Any]] = {}
+        self._manifest_mtime_ns: Optional[int] = None
+        self._manifest_lock = threading.Lock()
+    
+    def _serialize(self, data: Dict[str, Any]) -> bytes:
+        """Encode state as JSON bytes in the configured style."""
+        if self.serializer == "orjson":
+            import orjson
+            return orjson.dumps(data)
+        if self.serializer == "compact":
+            return json.dumps(data, separators=(",", ":")).encode("utf-8")
+        return json.dumps(data, indent=2).encode("utf-8")
     
     def save_state(self, state: WorkflowState) -> Path:
-        """Save workflow state to disk."""
+        """
+        Save workflow state to disk atomically.
+        
+        The state is written to a temporary file in the same directory, fsynced and
+        renamed over the old file, so a crash mid-save leaves the previous state
+        intact instead of a truncated file.
+        """
         state.updated_at = datetime.now().isoformat()
         
         state_file = self.storage_path / f"{state.workflow_id}.json"
+        data = self._serialize(state.model_dump())
+        
+        fd, temp_name = tempfile.mkstemp(
+            dir=self.storage_path, prefix=f".{state.workflow_id}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_name, state_file)
+        except BaseException:
+            Path(temp_name).unlink(missing_ok=True)
+            raise
         
-        with open(state_file, "w") as f:
-            json.dump(state.model_dump(), f, indent=2)
+        self._fsync_directory()
+        
+        with self._manifest_lock:
+            self._load_manifest()
+            self._manifest[state.workflow_id] = self._summary(
+                state.model_dump(), state_file.stat().st_mtime_ns
+            )
+            self._write_manifest()
         
         return state_file
     
+    def _fsync_directory(self) -> None:
+        """Persist the rename itself (POSIX; a no-op where directories can't be opened)."""
+        try:
+            dir_fd = os.open(self.storage_path, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+    
     def load_state(self, workflow_id: str) -> Optional[WorkflowState]:
         """Load workflow state from disk."""
         state_file = self.storage_path / f"{workflow_id}.json"
@@ -72,27 +175,127 @@ class StateManager:
             print(f"Error loading state: {e}")
             return None
     
-    def list_workflows(self) -> list[Dict[str, Any]]:
-        """List all saved workflows."""
-        workflows = []
+    def list_workflows(
+        self,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        status: Optional[str] = None,
+        current_step: Optional[str] = None,
+        niche: Optional[str] = None
+    ) -> list[Dict[str, Any]]:
+        """
+        List saved workflows, most recently updated first.
         
-        for state_file in self.storage_path.glob("*.json"):
-            try:
-                with open(state_file, "r") as f:
-                    data = json.load(f)
-                
-                workflows.append({
-                    "workflow_id": data.get("workflow_id"),
-                    "created_at": data.get("created_at"),
-                    "updated_at": data.get("updated_at"),
-                    "current_step": data.get("current_step"),
-                    "status": data.get("status"),
-                    "niche": data.get("niche")
-                })
-            except Exception as e:
-                print(f"Error reading {state_file}: {e}")
-        
-        return sorted(workflows, key=lambda x: x.get("updated_at", ""), reverse=True)
+        Args:
+            limit: Maximum number of workflows to return (all if None)
+            offset: Number of workflows to skip (for pagination)
+            status: Only workflows with this status
+            current_step: Only workflows at this step
+            niche: Only workflows for this niche
+        """
+        workflows = self._read_summaries()
+        filters = {"status": status, "current_step": current_step, "niche": niche}
+        workflows = [
+            wf for wf in workflows
+            if all(value is None or wf.get(key) == value for key, value in filters.items())
+        ]
+        
+        workflows = sorted(workflows, key=lambda x: x.get("updated_at") or "", reverse=True)
+        end = None if limit is None else offset + limit
+        return workflows[offset:end]
+    
+    def count_workflows(
+        self,
+        status: Optional[str] = None,
+        current_step: Optional[str] = None,
+        niche: Optional[str] = None
+    ) -> int:
+        """Count saved workflows matching the filters."""
+        return len(self.list_workflows(status=status, current_step=current_step, niche=niche))
+    
+    @staticmethod
+    def _summary(data: Dict[str, Any], mtime_ns: int) -> Dict[str, Any]:
+        """Manifest record: the listing fields plus the state file's mtime."""
+        summary = {field: data.get(field) for field in SUMMARY_FIELDS}
+        summary["mtime_ns"] = mtime_ns
+        return summary
+    
+    def _load_manifest(self) -> None:
+        """Reload the manifest from disk if another instance or process rewrote it."""
+        try:
+            mtime_ns = self.manifest_path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime_ns == self._manifest_mtime_ns:
+            return
+        
+        try:
+            with open(self.manifest_path, "r") as f:
+                self._manifest = json.load(f)
+            self._manifest_mtime_ns = mtime_ns
+        except (OSError, ValueError) as e:
+            # Rebuilt from the state files on the next listing
+            print(f"Error reading state manifest: {e}")
+            self._manifest = {}
+    
+    def _write_manifest(self) -> None:
+        """Replace the manifest file atomically (it can always be rebuilt, so no fsync)."""
+        fd, temp_name = tempfile.mkstemp(
+            dir=self.storage_path, prefix=f".{MANIFEST_NAME}.", suffix=".tmp"
+        )
+        with os.fdopen(fd, "w") as f:
+            json.dump(self._manifest, f, separators=(",", ":"))
+        os.replace(temp_name, self.manifest_path)
+        self._manifest_mtime_ns = self.manifest_path.stat().st_mtime_ns
+    
+    def _read_summaries(self) -> list[Dict[str, Any]]:
+        """
+        Read the listing fields of every saved workflow from the manifest.
+        
+        Only state files missing from the manifest or modified since their record
+        was written (e.g. saved by an older version) are parsed; records of deleted
+        files are dropped.
+        """
+        with self._manifest_lock:
+            self._load_manifest()
+            changed = False
+            seen = set()
+            
+            with os.scandir(self.storage_path) as entries:
+                for entry in entries:
+                    if not entry.name.endswith(".json") or entry.name.startswith("."):
+                        continue
+                    workflow_id = entry.name[:-len(".json")]
+                    seen.add(workflow_id)
+                    
+                    try:
+                        mtime_ns = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    record = self._manifest.get(workflow_id)
+                    if record is not None and record.get("mtime_ns") == mtime_ns:
+                        continue
+                    
+                    try:
+                        with open(entry.path, "r") as f:
+                            data = json.load(f)
+                    except Exception as e:
+                        print(f"Error reading {entry.path}: {e}")
+                        continue
+                    self._manifest[workflow_id] = self._summary(data, mtime_ns)
+                    changed = True
+            
+            for workflow_id in set(self._manifest) - seen:
+                del self._manifest[workflow_id]
+                changed = True
+            
+            if changed:
+                self._write_manifest()
+            
+            return [
+                {field: record.get(field) for field in SUMMARY_FIELDS}
+                for record in self._manifest.values()
+            ]
     
     def delete_state(self, workflow_id: str) -> bool:
         """Delete a workflow state."""
@@ -100,6 +303,98 @@ class StateManager:
         
         if state_file.exists():
             state_file.unlink()
+            with self._manifest_lock:
+                self._load_manifest()
+                if self._manifest.pop(workflow_id, None) is not None:
+                    self._write_manifest()
             return True
         
         return False
+
+
+# Supported STATE_FILE_FORMAT values
+STATE_FILE_FORMATS = ("json", "sqlite")
+
+
+def create_state_manager(
+    storage_path: Optional[Path] = None,
+    file_format: Optional[str] = None
+):
+    """
+    Create the state store selected by STATE_FILE_FORMAT.
+    
+    Args:
+        storage_path: Directory for state files. Defaults to STATE_STORAGE_PATH.
+        file_format: "json" (one file per workflow) or "sqlite" (one indexed database).
+                     Defaults to the STATE_FILE_FORMAT environment variable.
+    
+    Returns:
+        StateManager or SQLiteStateManager
+    """
+    storage_path = Path(storage_path or os.getenv("STATE_STORAGE_PATH", "./state"))
+    file_format = (file_format or os.getenv("STATE_FILE_FORMAT", "json")).lower()
+    
+    if file_format == "json":
+        return StateManager(storage_path)
+    if file_format == "sqlite":
+        from orchestrator.sqlite_state import SQLiteStateManager
+        return SQLiteStateManager(storage_path)
+    raise ValueError(
+        f"Unknown state file format: {file_format}. "
+        f"Choose one of: {', '.join(STATE_FILE_FORMATS)}"
+    )
+
+
+class StateSaver:
+    """
+    Saves workflow state from async code without blocking the event loop.
+    
+    Writes run on the "state" executor. Saves of the same workflow are coalesced:
+    while one write is in flight, further saves only replace the pending state, and
+    the newest pending state is written once the current write finishes. Every
+    caller still returns only after a state at least as new as its own is on disk.
+    """
+    
+    def __init__(self, state_manager):
+        self.state_manager = state_manager
+        self._pending: Dict[str, WorkflowState] = {}
+        self._writers: Dict[str, asyncio.Future] = {}
+        
+        self.saves_requested = 0
+        self.saves_written = 0
+    
+    async def save(self, state: WorkflowState) -> None:
+        """Persist a workflow state, merging it with saves already queued for the workflow."""
+        self.saves_requested += 1
+        workflow_id = state.workflow_id
+        self._pending[workflow_id] = state
+        
+        writer = self._writers.get(workflow_id)
+        if writer is None:
+            writer = asyncio.ensure_future(self._drain(workflow_id))
+            self._writers[workflow_id] = writer
+        
+        # A cancelled caller must not abort the write other callers are waiting on
+        await asyncio.shield(writer)
+    
+    async def _drain(self, workflow_id: str) -> None:
+        try:
+            while workflow_id in self._pending:
+                state = self._pending.pop(workflow_id)
+                await get_executor("state").run(self.state_manager.save_state, state)
+                self.saves_written += 1
+        finally:
+            self._writers.pop(workflow_id, None)
+    
+    async def flush(self) -> None:
+        """Wait for every queued save to reach disk."""
+        while self._writers:
+            await asyncio.gather(*self._writers.values(), return_exceptions=True)
+    
+    def stats(self) -> Dict[str, int]:
+        """Get how many saves were requested and how many writes they needed."""
+        return {
+            "saves_requested": self.saves_requested,
+            "saves_written": self.saves_written,
+            "saves_coalesced": self.saves_requested - self.saves_written,
+        }
@@ -1,8 +1,11 @@
 """LangGraph workflow orchestrator for Instagram Reels creation."""
 
 import asyncio
+import hashlib
+import json
+import os
 from pathlib import Path
-from typing import Dict, Any, TypedDict, Annotated, Optional
+from typing import Dict, Any, TypedDict, Annotated, Optional, Callable, Awaitable
 from datetime import datetime
 
 from langgraph.graph import StateGraph, END
@@ -13,7 +16,9 @@ from agents.scriptwriter import Scriptwriter, ReelScript
 from agents.media_generator import MediaGenerator
 from agents.video_assembler import VideoAssembler
 from agents.caption_generator import CaptionGenerator
-from orchestrator.state_manager import StateManager, WorkflowState
+from orchestrator.state_manager import StateSaver, WorkflowState, create_state_manager
+from utils.http_session import close_http_pool
+from utils.api_clients import azure_image_clients
 
 
 class WorkflowStateDict(TypedDict):
@@ -25,20 +30,77 @@ class WorkflowStateDict(TypedDict):
     selected_concept_index: int
     script: dict
     image_paths: list
+    image_status: list
     audio_path: str
+    audio_durations: list
     video_path: str
+    preview_path: str
     caption: dict
     current_step: str
     status: str
+    render_started_at: str
+    render_pid: int
     error_message: str
     output_dir: str
+    bypass_cache: bool
+    render_profile: str
+    stage_fingerprints: dict
+
+
+# Execution modes for the post-selection stages
+EXECUTION_MODES = ("sequential", "pipelined")
+
+# Workflow IDs whose background publish render is running in this process
+_active_renders: set = set()
+
+
+def _process_alive(pid: int) -> bool:
+    """Check whether a process is still running (assumed alive where it can't be probed)."""
+    if os.name == "nt":
+        # os.kill would terminate the process on Windows; rely on the age check instead
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+# Post-selection stages that are checkpointed, in dependency order
+CHECKPOINT_STAGES = ("script", "images", "voiceover", "video", "caption")
 
 
 class ReelsWorkflow:
     """Master orchestrator for Instagram Reels creation workflow."""
     
-    def __init__(self, state_storage_path: Path = Path("./state")):
-        self.state_manager = StateManager(state_storage_path)
+    def __init__(
+        self,
+        state_storage_path: Optional[Path] = None,
+        execution_mode: Optional[str] = None
+    ):
+        """
+        Args:
+            state_storage_path: Directory where workflow state is persisted. Defaults to
+                               STATE_STORAGE_PATH; STATE_FILE_FORMAT picks JSON files or SQLite.
+            execution_mode: "sequential" runs script → images → voiceover/video → caption
+                           one after another; "pipelined" starts images, voiceover and
+                           caption together once the script exists. Defaults to the
+                           WORKFLOW_EXECUTION_MODE environment variable.
+        """
+        execution_mode = (execution_mode or os.getenv("WORKFLOW_EXECUTION_MODE", "sequential")).lower()
+        if execution_mode not in EXECUTION_MODES:
+            raise ValueError(
+                f"Unknown execution mode: {execution_mode}. "
+                f"Choose one of: {', '.join(EXECUTION_MODES)}"
+            )
+        self.execution_mode = execution_mode
+        # A "rendering" status older than this is treated as an interrupted render
+        self.render_stale_seconds = float(os.getenv("RENDER_STALE_SECONDS", "3600"))
+        
+        self.state_manager = create_state_manager(state_storage_path)
+        # Saves from async nodes go through the saver so disk writes never block the loop
+        self.state_saver = StateSaver(self.state_manager)
         self.concept_strategist = ConceptStrategist()
         self.scriptwriter = Scriptwriter()
         self.media_generator = MediaGenerator()
@@ -82,7 +144,8 @@ class ReelsWorkflow:
             concepts = await self.concept_strategist.generate_concepts(
                 niche=state["niche"],
                 keywords=state.get("keywords", ""),
-                additional_context=""
+                additional_context="",
+                bypass_cache=state.get("bypass_cache", False)
             )
             
             # Convert Pydantic models to dicts
@@ -105,10 +168,13 @@ class ReelsWorkflow:
             
             script = await self.scriptwriter.generate_script(
                 concept=selected_concept,
-                target_duration=30.0
+                target_duration=30.0,
+                bypass_cache=state.get("bypass_cache", False)
             )
             
             state["script"] = script.model_dump()
+            # New prompts: every segment image has to be produced again
+            state["image_status"] = []
             state["current_step"] = "script_generation"
             state["status"] = "in_progress"
             
@@ -119,30 +185,127 @@ class ReelsWorkflow:
         return state
     
     async def _generate_images_node(self, state: WorkflowStateDict) -> WorkflowStateDict:
-        """Node: Generate images."""
+        """Node: Generate images (only the segments that don't have one yet)."""
         try:
-            script_data = state["script"]
-            segments = script_data.get("segments", [])
+            segment_count = len(state["script"].get("segments", []))
+            image_status = state.get("image_status") or []
+            image_paths = state.get("image_paths") or []
             
-            image_prompts = [seg["image_prompt"] for seg in segments]
+            if len(image_status) != segment_count or len(image_paths) != segment_count:
+                indices = list(range(segment_count))
+            else:
+                indices = [
+                    i for i in range(segment_count)
+                    if image_status[i] != "completed" or not Path(image_paths[i]).exists()
+                ]
             
-            output_dir = Path(state.get("output_dir", "./output")) / state["workflow_id"]
-            output_dir.mkdir(parents=True, exist_ok=True)
+            state = await self._generate_segment_images(state, indices)
             
-            image_paths = await self.media_generator.generate_images(
+        except Exception as e:
+            state["status"] = "failed"
+            state["error_message"] = f"Image generation failed: {str(e)}"
+        
+        return state
+    
+    async def _generate_segment_images(
+        self,
+        state: WorkflowStateDict,
+        indices: list,
+        bypass_cache: bool = False
+    ) -> WorkflowStateDict:
+        """
+        Generate the images for the given segment indices, leaving the others untouched.
+        
+        image_paths and image_status stay aligned one-to-one with script segments;
+        failed segments keep an empty path and status "failed".
+        
+        Raises:
+            RuntimeError: If any segment is still without an image (with each
+                         segment's last error in the message)
+        """
+        segments = state["script"].get("segments", [])
+        image_prompts = [seg["image_prompt"] for seg in segments]
+        
+        image_status = list(state.get("image_status") or [])
+        image_paths = list(state.get("image_paths") or [])
+        if len(image_status) != len(segments) or len(image_paths) != len(segments):
+            image_status = ["pending"] * len(segments)
+            image_paths = [""] * len(segments)
+        
+        errors: Dict[int, str] = {}
+        if indices:
+            output_dir = Path(state.get("output_dir", "./output")) / state["workflow_id"]
+            results = await self.media_generator.generate_images(
                 image_prompts=image_prompts,
                 output_dir=output_dir / "images",
-                prefix="reel_image"
+                prefix="reel_image",
+                # Start pre-scaling each image for the render as soon as it lands
+                on_image=self.video_assembler.prepare_image,
+                indices=indices,
+                bypass_cache=bypass_cache,
+                errors=errors
             )
-            
-            state["image_paths"] = [str(p) for p in image_paths]
-            state["current_step"] = "image_generation"
-            state["status"] = "in_progress"
-            
+            for i in indices:
+                image_paths[i] = str(results[i]) if results[i] is not None else ""
+                image_status[i] = "completed" if results[i] is not None else "failed"
+        
+        state["image_paths"] = image_paths
+        state["image_status"] = image_status
+        state["current_step"] = "image_generation"
+        state["status"] = "in_progress"
+        
+        failed = [i for i, status in enumerate(image_status) if status != "completed"]
+        if failed:
+            details = "; ".join(f"segment {i + 1}: {errors[i]}" for i in failed if i in errors)
+            raise RuntimeError(
+                f"No image for segment(s) {', '.join(str(i + 1) for i in failed)} after retries"
+                + (f" ({details})" if details else "")
+                + ". Retry the workflow to regenerate only those segments."
+            )
+        return state
+    
+    async def regenerate_images(
+        self,
+        workflow_id: str,
+        segment_indices: list
+    ) -> Dict[str, Any]:
+        """
+        Regenerate the images of chosen segments without touching the others.
+        
+        New images are generated even if the prompt is cached. The video
+        checkpoint is invalidated by the changed files, so resuming the workflow
+        afterwards re-renders the video and skips everything else.
+        
+        Args:
+            workflow_id: The workflow ID
+            segment_indices: Zero-based indices of the segments to regenerate
+        
+        Returns:
+            Updated state
+        """
+        saved_state = self.state_manager.load_state(workflow_id)
+        if not saved_state:
+            raise ValueError(f"Workflow {workflow_id} not found")
+        
+        segment_count = len((saved_state.script or {}).get("segments", []))
+        invalid = [i for i in segment_indices if not 0 <= i < segment_count]
+        if invalid:
+            raise ValueError(
+                f"Invalid segment indices {invalid}: workflow {workflow_id} has {segment_count} segments"
+            )
+        
+        state = self._state_from_saved(saved_state, saved_state.selected_concept_index)
+        
+        try:
+            state = await self._generate_segment_images(state, segment_indices, bypass_cache=True)
+            # The old video no longer matches the images until the workflow is resumed
+            state["video_path"] = ""
+            state["preview_path"] = ""
         except Exception as e:
             state["status"] = "failed"
             state["error_message"] = f"Image generation failed: {str(e)}"
         
+        state = await self._save_state_node(state)
         return state
     
     async def _assemble_video_node(self, state: WorkflowStateDict) -> WorkflowStateDict:
@@ -162,7 +325,9 @@ class ReelsWorkflow:
                 image_paths=image_paths,
                 output_dir=output_dir,
                 video_filename="final_reel.mp4",
-                image_durations=image_durations
+                image_durations=image_durations,
+                segment_texts=[seg.get("spoken_text", "") for seg in segments],
+                render_profile=state.get("render_profile") or None
             )
             
             state["video_path"] = str(video_path)
@@ -176,6 +341,135 @@ class ReelsWorkflow:
         
         return state
     
+    async def _generate_voiceover_node(self, state: WorkflowStateDict) -> WorkflowStateDict:
+        """Node: Generate voiceover audio (only needs the script transcript)."""
+        try:
+            transcript = state["script"].get("full_transcript", "")
+            segments = state["script"].get("segments", [])
+            output_dir = Path(state.get("output_dir", "./output")) / state["workflow_id"]
+            audio_path = output_dir / "voiceover.mp3"
+            
+            if self.video_assembler.segmented_voiceover and segments:
+                # Measured per-segment lengths become the image cut points
+                state["audio_durations"] = await self.video_assembler.generate_segmented_voiceover(
+                    segment_texts=[seg.get("spoken_text", "") for seg in segments],
+                    output_path=audio_path
+                )
+            else:
+                await self.video_assembler.generate_voiceover(
+                    transcript=transcript,
+                    output_path=audio_path
+                )
+                state["audio_durations"] = []
+            
+            state["audio_path"] = str(audio_path)
+            state["current_step"] = "voiceover_generation"
+            state["status"] = "in_progress"
+            
+        except Exception as e:
+            state["status"] = "failed"
+            state["error_message"] = f"Voiceover generation failed: {str(e)}"
+        
+        return state
+    
+    @staticmethod
+    def _image_durations(state: WorkflowStateDict) -> list:
+        """Measured voiceover segment lengths if available, else the script's estimates."""
+        segments = state["script"].get("segments", [])
+        return state.get("audio_durations") or [
+            seg.get("duration_estimate", 0) for seg in segments
+        ]
+    
+    async def _render_video_node(self, state: WorkflowStateDict) -> WorkflowStateDict:
+        """Node: Render final video from already generated images and voiceover."""
+        try:
+            image_paths = [Path(p) for p in state["image_paths"]]
+            image_durations = self._image_durations(state)
+            
+            output_dir = Path(state.get("output_dir", "./output")) / state["workflow_id"]
+            
+            video_path = await self.video_assembler.assemble_video(
+                image_paths=image_paths,
+                audio_path=Path(state["audio_path"]),
+                output_path=output_dir / "final_reel.mp4",
+                image_durations=image_durations,
+                render_profile=state.get("render_profile") or None
+            )
+            
+            state["video_path"] = str(video_path)
+            state["current_step"] = "video_assembly"
+            state["status"] = "in_progress"
+            
+        except Exception as e:
+            state["status"] = "failed"
+            state["error_message"] = f"Video assembly failed: {str(e)}"
+        
+        return state
+    
+    async def _render_preview_node(self, state: WorkflowStateDict) -> WorkflowStateDict:
+        """Node: Render a quick low-resolution preview ahead of the publish render."""
+        try:
+            output_dir = Path(state.get("output_dir", "./output")) / state["workflow_id"]
+            
+            preview_path = await self.video_assembler.render_preview(
+                image_paths=[Path(p) for p in state["image_paths"]],
+                audio_path=Path(state["audio_path"]),
+                output_path=output_dir / "preview_reel.mp4",
+                image_durations=self._image_durations(state)
+            )
+            
+            state["preview_path"] = str(preview_path)
+            state["current_step"] = "preview_render"
+            
+        except Exception as e:
+            # The publish render still runs; only the early look is lost
+            print(f"Warning: Preview render failed: {e}")
+        
+        return state
+    
+    def _start_publish_render(self, state: WorkflowStateDict) -> None:
+        """
+        Queue the full-quality render and record its outcome in the saved state.
+        
+        The workflow returns immediately with status "rendering"; the state file is
+        updated to "completed" (or "failed") once the render job finishes. If the
+        process exits first, is_render_stale reports the workflow for a re-render.
+        """
+        workflow_id = state["workflow_id"]
+        output_dir = Path(state.get("output_dir", "./output")) / workflow_id
+        fingerprint = self._stage_fingerprint(state, "video")
+        _active_renders.add(workflow_id)
+        
+        def _on_done(video_path: Optional[Path], error: Optional[BaseException]) -> None:
+            _active_renders.discard(workflow_id)
+            saved_state = self.state_manager.load_state(workflow_id)
+            if saved_state is None:
+                return
+            
+            if error is None:
+                saved_state.video_path = str(video_path)
+                saved_state.current_step = "video_assembly"
+                saved_state.status = "completed"
+                saved_state.stage_fingerprints = {
+                    **(saved_state.stage_fingerprints or {}),
+                    "video": fingerprint
+                }
+                print(f"Publish render finished: {video_path}")
+            else:
+                saved_state.status = "failed"
+                saved_state.error_message = f"Video assembly failed: {str(error)}"
+            
+            self.state_manager.save_state(saved_state)
+        
+        self.video_assembler.start_background_render(
+            image_paths=[Path(p) for p in state["image_paths"]],
+            audio_path=Path(state["audio_path"]),
+            output_path=output_dir / "final_reel.mp4",
+            on_done=_on_done,
+            image_durations=self._image_durations(state),
+            render_profile=state.get("render_profile") or None
+        )
+    
     async def _generate_caption_node(self, state: WorkflowStateDict) -> WorkflowStateDict:
         """Node: Generate Instagram caption with hashtags."""
         try:
@@ -186,7 +480,8 @@ class ReelsWorkflow:
                 concept=selected_concept,
                 script=script_data,
                 niche=state.get("niche", ""),
-                keywords=state.get("keywords", "")
+                keywords=state.get("keywords", ""),
+                bypass_cache=state.get("bypass_cache", False)
             )
             
             state["caption"] = caption.model_dump()
@@ -210,15 +505,22 @@ class ReelsWorkflow:
                 selected_concept_index=state.get("selected_concept_index"),
                 script=state.get("script"),
                 image_paths=state.get("image_paths"),
+                image_status=state.get("image_status") or None,
                 audio_path=state.get("audio_path"),
+                audio_durations=state.get("audio_durations"),
                 video_path=state.get("video_path"),
+                preview_path=state.get("preview_path") or None,
                 caption=state.get("caption"),
                 current_step=state.get("current_step", "concept_generation"),
                 status=state.get("status", "in_progress"),
-                error_message=state.get("error_message")
+                render_started_at=state.get("render_started_at") or None,
+                render_pid=state.get("render_pid") or None,
+                error_message=state.get("error_message"),
+                render_profile=state.get("render_profile") or None,
+                stage_fingerprints=state.get("stage_fingerprints") or None
             )
             
-            self.state_manager.save_state(workflow_state)
+            await self.state_saver.save(workflow_state)
             
         except Exception as e:
             print(f"Error saving state: {e}")
@@ -230,11 +532,15 @@ class ReelsWorkflow:
         niche: str,
         keywords: str = "",
         workflow_id: Optional[str] = None,
-        output_dir: str = "./output"
+        output_dir: str = "./output",
+        fresh: bool = False
     ) -> Dict[str, Any]:
         """
         Start a new workflow.
         
+        Args:
+            fresh: Bypass the LLM response cache for a fresh creative run
+        
         Returns:
             Initial state with generated concepts
         """
@@ -249,13 +555,21 @@ class ReelsWorkflow:
             "selected_concept_index": -1,
             "script": {},
             "image_paths": [],
+            "image_status": [],
             "audio_path": "",
+            "audio_durations": [],
             "video_path": "",
+            "preview_path": "",
             "caption": {},
             "current_step": "concept_generation",
             "status": "in_progress",
+            "render_started_at": "",
+            "render_pid": 0,
             "error_message": "",
-            "output_dir": output_dir
+            "output_dir": output_dir,
+            "bypass_cache": fresh,
+            "render_profile": "",
+            "stage_fingerprints": {}
         }
         
         # Run workflow up to concept generation
@@ -266,7 +580,10 @@ class ReelsWorkflow:
     async def continue_workflow(
         self,
         workflow_id: str,
-        selected_concept_index: int
+        selected_concept_index: int,
+        fresh: bool = False,
+        render_profile: Optional[str] = None,
+        background_render: bool = False
     ) -> Dict[str, Any]:
         """
         Continue workflow after concept selection.
@@ -274,6 +591,11 @@ class ReelsWorkflow:
         Args:
             workflow_id: The workflow ID
             selected_concept_index: Index of selected concept (0-2)
+            fresh: Bypass the LLM response cache for a fresh creative run
+            render_profile: Video speed/quality profile ("draft", "preview" or "publish").
+                           Defaults to the saved profile, then VIDEO_RENDER_PROFILE.
+            background_render: Render a low-resolution preview, then return with status
+                              "rendering" while the publish render runs in the background.
         
         Returns:
             Updated state
@@ -283,8 +605,60 @@ class ReelsWorkflow:
         if not saved_state:
             raise ValueError(f"Workflow {workflow_id} not found")
         
-        # Convert to workflow state dict
-        state: WorkflowStateDict = {
+        state = self._state_from_saved(saved_state, selected_concept_index, fresh, render_profile)
+        
+        # Continue workflow: generate script, images, video, and caption.
+        # Stages whose checkpoint is still valid are skipped, so a retry
+        # only re-runs the failed stage and whatever depends on it.
+        state = await self._run_stage(state, "script", self._generate_script_node)
+        state = await self._save_state_node(state)
+        
+        if self.execution_mode == "pipelined":
+            if state["status"] != "failed":
+                state = await self._run_pipelined_stages(state, background_render)
+        else:
+            if state["status"] != "failed":
+                state = await self._run_stage(state, "images", self._generate_images_node)
+                state = await self._save_state_node(state)
+            
+            if state["status"] != "failed":
+                state = await self._run_stage(state, "voiceover", self._generate_voiceover_node)
+                state = await self._save_state_node(state)
+            
+            if state["status"] != "failed":
+                state = await self._video_stage(state, background_render)
+                state = await self._save_state_node(state)
+            
+            if state["status"] != "failed":
+                state = await self._run_stage(state, "caption", self._generate_caption_node)
+                if state["status"] != "failed":
+                    state["current_step"] = "caption_generation"
+                    state["status"] = "completed"
+                state = await self._save_state_node(state)
+        
+        if (
+            background_render
+            and state["status"] != "failed"
+            and not self._stage_is_current(state, "video")
+        ):
+            state["status"] = "rendering"
+            # Recorded so a render lost to a crash or restart can be detected and redone
+            state["render_started_at"] = datetime.now().isoformat()
+            state["render_pid"] = os.getpid()
+            state = await self._save_state_node(state)
+            self._start_publish_render(state)
+        
+        return state
+    
+    @staticmethod
+    def _state_from_saved(
+        saved_state: WorkflowState,
+        selected_concept_index: int,
+        fresh: bool = False,
+        render_profile: Optional[str] = None
+    ) -> WorkflowStateDict:
+        """Convert a persisted state into a workflow state dict ready to run again."""
+        return {
             "workflow_id": saved_state.workflow_id,
             "niche": saved_state.niche or "",
             "keywords": saved_state.keywords or "",
@@ -292,34 +666,319 @@ class ReelsWorkflow:
             "selected_concept_index": selected_concept_index,
             "script": saved_state.script or {},
             "image_paths": saved_state.image_paths or [],
+            "image_status": saved_state.image_status or [],
             "audio_path": saved_state.audio_path or "",
+            "audio_durations": saved_state.audio_durations or [],
             "video_path": saved_state.video_path or "",
+            "preview_path": saved_state.preview_path or "",
             "caption": saved_state.caption or {},
             "current_step": saved_state.current_step,
-            "status": saved_state.status,
-            "error_message": saved_state.error_message or "",
-            "output_dir": "./output"
+            "status": "in_progress",
+            "render_started_at": "",
+            "render_pid": 0,
+            "error_message": "",
+            "output_dir": "./output",
+            "bypass_cache": fresh,
+            "render_profile": render_profile or saved_state.render_profile or "",
+            "stage_fingerprints": saved_state.stage_fingerprints or {}
         }
+    
+    async def resume_workflow(
+        self,
+        workflow_id: str,
+        background_render: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Resume a failed or interrupted workflow from its last valid checkpoint.
         
-        # Continue workflow: generate script, images, video, and caption
-        # We'll manually execute the remaining nodes
-        state = await self._generate_script_node(state)
-        state = await self._save_state_node(state)
+        Args:
+            workflow_id: The workflow ID
+            background_render: See continue_workflow
+        
+        Returns:
+            Updated state
+        """
+        saved_state = self.state_manager.load_state(workflow_id)
+        if not saved_state:
+            raise ValueError(f"Workflow {workflow_id} not found")
+        if saved_state.selected_concept_index is None or saved_state.selected_concept_index < 0:
+            raise ValueError(f"Workflow {workflow_id} has no selected concept to resume from")
+        # A stale render has no video checkpoint, so the video stage runs again
+        if saved_state.status == "rendering" and not self.is_render_stale(saved_state):
+            raise ValueError(f"Workflow {workflow_id} is still rendering")
+        
+        return await self.continue_workflow(
+            workflow_id=workflow_id,
+            selected_concept_index=saved_state.selected_concept_index,
+            background_render=background_render
+        )
+    
+    def is_render_stale(self, saved_state: WorkflowState) -> bool:
+        """
+        Check whether a workflow's background publish render was lost.
+        
+        The render is stale when the process that queued it has exited (or is this
+        process but no longer runs it), when no owner was recorded, or when it has
+        been rendering for longer than RENDER_STALE_SECONDS.
+        
+        Args:
+            saved_state: The persisted workflow state
+        
+        Returns:
+            True if the status is "rendering" but no render will finish it
+        """
+        if saved_state.status != "rendering":
+            return False
+        if saved_state.workflow_id in _active_renders:
+            return False
+        if not saved_state.render_pid or not saved_state.render_started_at:
+            return True
+        if saved_state.render_pid == os.getpid() or not _process_alive(saved_state.render_pid):
+            return True
         
+        try:
+            started_at = datetime.fromisoformat(saved_state.render_started_at)
+        except ValueError:
+            return True
+        return (datetime.now() - started_at).total_seconds() > self.render_stale_seconds
+    
+    @staticmethod
+    def _artifact_signature(paths: list) -> list:
+        """Identify artifact files by path, size and modification time (None if missing)."""
+        signature = []
+        for path in paths:
+            try:
+                stat = Path(path).stat()
+                signature.append([str(path), stat.st_size, stat.st_mtime_ns])
+            except OSError:
+                signature.append([str(path), None, None])
+        return signature
+    
+    def _stage_fingerprint(self, state: WorkflowStateDict, stage: str) -> str:
+        """
+        Hash everything a stage's output depends on.
+        
+        Downstream stages hash their upstream artifacts (script content, image and
+        audio files), so re-running a stage invalidates everything after it.
+        """
+        script = state.get("script") or {}
+        segments = script.get("segments", [])
+        concepts = state.get("concepts") or []
+        index = state.get("selected_concept_index", -1)
+        concept = concepts[index] if 0 <= index < len(concepts) else None
+        
+        if stage == "script":
+            inputs = [concept, 30.0]
+        elif stage == "images":
+            inputs = [
+                [seg.get("image_prompt", "") for seg in segments],
+                self.media_generator.use_replicate
+            ]
+        elif stage == "voiceover":
+            tts_client = self.video_assembler.tts_client
+            inputs = [
+                script.get("full_transcript", ""),
+                [seg.get("spoken_text", "") for seg in segments],
+                self.video_assembler.segmented_voiceover,
+                tts_client.voice_id,
+                tts_client.model_id
+            ]
+        elif stage == "video":
+            video_processor = self.video_assembler.video_processor
+            inputs = [
+                self._artifact_signature(state.get("image_paths") or []),
+                self._artifact_signature([state["audio_path"]] if state.get("audio_path") else []),
+                self._image_durations(state),
+                state.get("render_profile") or video_processor.render_profile.name,
+                video_processor.render_engine
+            ]
+        elif stage == "caption":
+            inputs = [concept, script, state.get("niche", ""), state.get("keywords", "")]
+        else:
+            raise ValueError(f"Unknown checkpoint stage: {stage}")
+        
+        payload = json.dumps([stage, inputs], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _stage_outputs_exist(state: WorkflowStateDict, stage: str) -> bool:
+        """Check that a stage's recorded outputs are present (files still on disk)."""
+        if stage == "script":
+            return bool(state.get("script"))
+        if stage == "images":
+            image_paths = state.get("image_paths") or []
+            segments = (state.get("script") or {}).get("segments", [])
+            return (
+                bool(image_paths)
+                and len(image_paths) == len(segments)
+                and all(p and Path(p).exists() for p in image_paths)
+            )
+        if stage == "voiceover":
+            return bool(state.get("audio_path")) and Path(state["audio_path"]).exists()
+        if stage == "video":
+            return bool(state.get("video_path")) and Path(state["video_path"]).exists()
+        if stage == "caption":
+            return bool(state.get("caption"))
+        return False
+    
+    def _stage_is_current(self, state: WorkflowStateDict, stage: str) -> bool:
+        """Whether a stage's checkpoint can be reused instead of running it again."""
+        if state.get("bypass_cache"):
+            return False
+        fingerprints = state.get("stage_fingerprints") or {}
+        return (
+            fingerprints.get(stage) == self._stage_fingerprint(state, stage)
+            and self._stage_outputs_exist(state, stage)
+        )
+    
+    async def _run_stage(
+        self,
+        state: WorkflowStateDict,
+        stage: str,
+        node: Callable[[WorkflowStateDict], Awaitable[WorkflowStateDict]]
+    ) -> WorkflowStateDict:
+        """Run a node unless its checkpoint is current, then record its input fingerprint."""
+        if self._stage_is_current(state, stage):
+            print(f"Skipping {stage}: checkpoint is up to date")
+            if stage == "images":
+                # A new script with the same prompts keeps its images, but the script
+                # node cleared their status
+                state["image_status"] = ["completed"] * len(state["image_paths"])
+            return state
+        
+        fingerprint = self._stage_fingerprint(state, stage)
+        state = await node(state)
+        fingerprints = dict(state.get("stage_fingerprints") or {})
         if state["status"] != "failed":
-            state = await self._generate_images_node(state)
-            state = await self._save_state_node(state)
+            fingerprints[stage] = fingerprint
+        else:
+            # Outputs left over from an earlier run no longer count as a checkpoint
+            fingerprints.pop(stage, None)
+        state["stage_fingerprints"] = fingerprints
+        return state
+    
+    async def _video_stage(
+        self,
+        state: WorkflowStateDict,
+        background_render: bool
+    ) -> WorkflowStateDict:
+        """Render the video, or only its preview when the publish render goes to the background."""
+        if background_render and not self._stage_is_current(state, "video"):
+            return await self._render_preview_node(state)
+        return await self._run_stage(state, "video", self._render_video_node)
+    
+    @staticmethod
+    def _merge_branch(
+        state: WorkflowStateDict,
+        branch: WorkflowStateDict,
+        stage: str,
+        keys: tuple
+    ) -> WorkflowStateDict:
+        """
+        Copy a concurrent branch's outputs (and its first failure) into the main state.
+        
+        Only the fingerprint of the stage the branch ran is taken over; the branch's
+        copies of other stages' fingerprints predate the other branches' work.
+        """
+        for key in keys:
+            state[key] = branch[key]
+        fingerprints = dict(state.get("stage_fingerprints") or {})
+        branch_fingerprint = (branch.get("stage_fingerprints") or {}).get(stage)
+        if branch_fingerprint is not None:
+            fingerprints[stage] = branch_fingerprint
+        else:
+            # The branch re-ran the stage and failed
+            fingerprints.pop(stage, None)
+        state["stage_fingerprints"] = fingerprints
+        if branch["status"] == "failed" and state["status"] != "failed":
+            state["status"] = "failed"
+            state["error_message"] = branch["error_message"]
+        return state
+    
+    @staticmethod
+    async def _await_branches(*tasks: asyncio.Task) -> list:
+        """
+        Wait for concurrent branches, cancelling the others as soon as one fails.
+        
+        The video can't be rendered once either input has failed, so outstanding
+        paid work (e.g. running Replicate predictions) is stopped right away.
+        Cancelled branches are returned as None.
+        """
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(task.result()["status"] == "failed" for task in done):
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+                break
+        
+        return [None if task.cancelled() else task.result() for task in tasks]
+    
+    async def _run_pipelined_stages(
+        self,
+        state: WorkflowStateDict,
+        background_render: bool = False
+    ) -> WorkflowStateDict:
+        """
+        Run the post-script stages as a dependency graph instead of a chain.
+        
+        Images, voiceover and caption only depend on the script, so they start
+        together. Video rendering starts as soon as images and audio are ready,
+        while caption generation may still be running. With background_render,
+        only the preview is rendered here and the caller queues the publish render.
+        """
+        # Each branch works on its own copy so status/current_step updates don't race
+        images_task = asyncio.create_task(
+            self._run_stage(dict(state), "images", self._generate_images_node)
+        )
+        voiceover_task = asyncio.create_task(
+            self._run_stage(dict(state), "voiceover", self._generate_voiceover_node)
+        )
+        caption_task = asyncio.create_task(
+            self._run_stage(dict(state), "caption", self._generate_caption_node)
+        )
+        
+        images_state, voiceover_state = await self._await_branches(images_task, voiceover_task)
+        if images_state is not None:
+            state = self._merge_branch(state, images_state, "images", ("image_paths", "image_status"))
+        if voiceover_state is not None:
+            state = self._merge_branch(
+                state, voiceover_state, "voiceover", ("audio_path", "audio_durations")
+            )
+        state["current_step"] = "image_generation"
+        state = await self._save_state_node(state)
         
         if state["status"] != "failed":
-            state = await self._assemble_video_node(state)
+            state = await self._video_stage(state, background_render)
             state = await self._save_state_node(state)
         
+        caption_state = await caption_task
+        state = self._merge_branch(state, caption_state, "caption", ("caption",))
+        
         if state["status"] != "failed":
-            state = await self._generate_caption_node(state)
-            state = await self._save_state_node(state)
+            state["current_step"] = "caption_generation"
+            state["status"] = "completed"
         
+        state = await self._save_state_node(state)
         return state
     
+    async def aclose(self) -> None:
+        """Flush pending state saves and release network resources opened on the current event loop."""
+        await self.state_saver.flush()
+        await close_http_pool()
+        await azure_image_clients.close()
+    
+    def run(self, coro):
+        """Run a coroutine on a fresh event loop and release pooled connections afterwards."""
+        async def _run():
+            try:
+                return await coro
+            finally:
+                await self.aclose()
+        
+        return asyncio.run(_run())
+    
     def load_workflow_state(self, workflow_id: str) -> Optional[WorkflowState]:
         """Load workflow state."""
         return self.state_manager.load_state(workflow_id)
@@ -0,0 +1,16 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+
+@pytest.fixture
+def workflow_env(tmp_path, monkeypatch):
+    """Fake API credentials and an isolated working directory for ReelsWorkflow."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("USE_AZURE_OPENAI", "false")
+    monkeypatch.setenv("ELEVENLABS_API_KEY", "test-key")
+    monkeypatch.setenv("IMAGE_GENERATION_PROVIDER", "openai")
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+    # Outputs and caches use relative paths
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
@@ -0,0 +1,103 @@
+"""Tests for the API client retry policy."""
+
+import asyncio
+
+import pytest
+
+from utils.api_clients import is_retryable_error
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+@pytest.mark.parametrize("status,retryable", [
+    (400, False),
+    (401, False),
+    (404, False),
+    (408, True),
+    (409, False),
+    (422, False),
+    (429, True),
+    (500, True),
+    (503, True),
+])
+def test_only_transient_statuses_are_retried(status, retryable):
+    assert is_retryable_error(StatusError(status)) is retryable
+
+
+def test_transport_errors_are_retried():
+    assert is_retryable_error(ConnectionResetError("reset by peer"))
+
+
+def test_cancellation_is_never_retried():
+    assert not is_retryable_error(asyncio.CancelledError())
+
+
+class FakeReplicate:
+    """Scripted prediction lifecycle for ReplicateClient.generate_image."""
+    
+    def __init__(self, client, final_statuses, download_error=None):
+        self.final_statuses = list(final_statuses)
+        self.download_error = download_error
+        self.created = []
+        self.cancelled = []
+        client.poll_initial = 0.0
+        client.create_prediction = self.create_prediction
+        client.get_prediction = self.get_prediction
+        client.cancel_prediction = self.cancel_prediction
+        client.download_output = self.download_output
+    
+    async def create_prediction(self, prompt, width, height):
+        prediction_id = f"p{len(self.created) + 1}"
+        self.created.append(prediction_id)
+        return {"id": prediction_id, "status": "starting"}
+    
+    async def get_prediction(self, prediction_id):
+        status = self.final_statuses.pop(0)
+        return {"id": prediction_id, "status": status, "output": [f"https://img/{prediction_id}.png"]}
+    
+    async def cancel_prediction(self, prediction_id):
+        self.cancelled.append(prediction_id)
+    
+    async def download_output(self, url, output_path):
+        if self.download_error is not None:
+            raise self.download_error
+        return output_path
+
+
+@pytest.fixture
+def replicate_client(monkeypatch):
+    monkeypatch.setenv("REPLICATE_API_TOKEN", "test-token")
+    monkeypatch.setenv("REPLICATE_PREDICTION_ATTEMPTS", "2")
+    from utils.api_clients import ReplicateClient
+    return ReplicateClient()
+
+
+def test_failed_prediction_is_resubmitted(replicate_client):
+    fake = FakeReplicate(replicate_client, ["failed", "succeeded"])
+    
+    url = asyncio.run(replicate_client.generate_image("a cat"))
+    
+    assert url == "https://img/p2.png"
+    assert fake.created == ["p1", "p2"]
+
+
+def test_canceled_prediction_is_not_resubmitted(replicate_client):
+    from utils.api_clients import PredictionFailedError
+    fake = FakeReplicate(replicate_client, ["canceled"])
+    
+    with pytest.raises(PredictionFailedError):
+        asyncio.run(replicate_client.generate_image("a cat"))
+    assert fake.created == ["p1"]
+
+
+def test_download_failure_does_not_pay_for_a_new_prediction(replicate_client, tmp_path):
+    fake = FakeReplicate(replicate_client, ["succeeded"], download_error=ConnectionResetError("reset"))
+    
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(replicate_client.generate_image("a cat", output_path=tmp_path / "cat.png"))
+    assert fake.created == ["p1"]
+    assert fake.cancelled == []
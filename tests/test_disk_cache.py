@@ -0,0 +1,121 @@
+"""Tests for the on-disk LRU cache and the LLM response cache built on it."""
+
+import asyncio
+import json
+
+import pytest
+
+from utils import disk_cache
+from utils.disk_cache import DiskCache
+from utils.llm_cache import LLMResponseCache
+
+
+class FakeTime:
+    """Stands in for the time module so TTL checks don't need real waiting."""
+    
+    def __init__(self):
+        self.now = 1_000_000.0
+    
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(disk_cache, "time", fake)
+    return fake
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=30)
+    cache.put_bytes("a", b"x" * 10)
+    cache.put_bytes("b", b"x" * 10)
+    cache.put_bytes("c", b"x" * 10)
+    
+    # Reading "a" makes "b" the least recently used entry
+    assert cache.get("a") is not None
+    cache.put_bytes("d", b"x" * 10)
+    
+    assert cache.contains("a")
+    assert not cache.contains("b")
+    assert not cache.path_for("b").exists()
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["total_bytes"] == 30
+
+
+def test_oversized_entry_is_kept_alone(tmp_path):
+    cache = DiskCache(tmp_path, max_bytes=10)
+    cache.put_bytes("small", b"x" * 5)
+    cache.put_bytes("big", b"x" * 50)
+    
+    assert cache.contains("big")
+    assert not cache.contains("small")
+
+
+def test_expired_entries_are_removed_on_lookup(tmp_path, clock):
+    cache = DiskCache(tmp_path, max_bytes=1000, ttl_seconds=60)
+    cache.put_bytes("key", b"value")
+    # The TTL counts from the file's write time
+    written_at = cache.path_for("key").stat().st_mtime
+    
+    clock.now = written_at + 59
+    assert cache.get("key") is not None
+    
+    clock.now = written_at + 61
+    assert cache.get("key") is None
+    assert not cache.path_for("key").exists()
+    assert cache.stats()["expirations"] == 1
+
+
+def test_entries_survive_a_restart(tmp_path):
+    DiskCache(tmp_path, max_bytes=1000, suffix=".json").put_bytes("key", b"{}")
+    
+    reopened = DiskCache(tmp_path, max_bytes=1000, suffix=".json")
+    
+    assert reopened.get("key") == tmp_path / "key.json"
+    assert reopened.stats()["total_bytes"] == 2
+
+
+@pytest.fixture
+def openai_client(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("USE_AZURE_OPENAI", "false")
+    from utils import api_clients
+    
+    cache = LLMResponseCache(cache_dir=tmp_path / "llm", max_bytes=1024 * 1024, ttl_seconds=3600)
+    monkeypatch.setattr(api_clients, "get_llm_cache", lambda: cache)
+    
+    client = api_clients.OpenAIClient()
+    client.responses = []
+    client.calls = 0
+    
+    async def fake_generate(prompt, system_prompt, temperature, max_tokens):
+        client.calls += 1
+        return client.responses.pop(0)
+    
+    client._generate_text = fake_generate
+    return client
+
+
+def test_identical_requests_are_served_from_the_cache(openai_client):
+    openai_client.responses = ['{"title": "Cat naps"}']
+    
+    first = asyncio.run(openai_client.generate_text("Pitch a reel", system_prompt="You are helpful"))
+    second = asyncio.run(openai_client.generate_text("Pitch a reel", system_prompt="You are helpful"))
+    
+    assert first == second == '{"title": "Cat naps"}'
+    assert openai_client.calls == 1
+
+
+def test_responses_the_caller_rejects_are_not_cached(openai_client):
+    openai_client.responses = ["Sorry, I can't help with that.", '{"title": "Cat naps"}']
+    
+    first = asyncio.run(openai_client.generate_text("Pitch a reel", validate=json.loads))
+    second = asyncio.run(openai_client.generate_text("Pitch a reel", validate=json.loads))
+    third = asyncio.run(openai_client.generate_text("Pitch a reel", validate=json.loads))
+    
+    # The rejected reply is still returned so the caller can raise its own error
+    assert first == "Sorry, I can't help with that."
+    assert second == third == '{"title": "Cat naps"}'
+    assert openai_client.calls == 2
@@ -0,0 +1,66 @@
+"""Tests for the generated image store."""
+
+import os
+
+import pytest
+
+from utils.image_store import GeneratedImageStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.delenv("IMAGE_COST_USD", raising=False)
+    return GeneratedImageStore(cache_dir=tmp_path / "store", max_bytes=1024 * 1024)
+
+
+def _generated_image(tmp_path, name="generated.png", data=b"png-bytes"):
+    path = tmp_path / "provider" / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_cached_image_is_hard_linked_into_the_workflow(store, tmp_path):
+    key = store.make_key("openai", "dall-e-3", "1024x1792", "hd", "A napping cat")
+    store.add(key, _generated_image(tmp_path), "openai", "hd", generation_seconds=12.5)
+    
+    output_path = tmp_path / "workflow" / "images" / "reel_image_01.png"
+    assert store.fetch(key, output_path)
+    
+    assert output_path.read_bytes() == b"png-bytes"
+    assert os.path.samefile(output_path, store.store.path_for(key))
+    assert not output_path.with_name(output_path.name + ".part").exists()
+    
+    stats = store.stats()
+    assert stats["hits"] == 1
+    assert stats["dollars_saved"] == 0.12
+    assert stats["seconds_saved"] == 12.5
+
+
+def test_every_request_parameter_is_part_of_the_key(store):
+    key = store.make_key("openai", "dall-e-3", "1024x1792", "hd", "A napping cat")
+    
+    assert store.make_key("openai", "dall-e-3", "1024x1792", "standard", "A napping cat") != key
+    assert store.make_key("openai", "dall-e-3", "1024x1024", "hd", "A napping cat") != key
+    assert store.make_key("replicate", "dall-e-3", "1024x1792", "hd", "A napping cat") != key
+    assert store.make_key("openai", "dall-e-3", "1024x1792", "hd", "A sleeping cat") != key
+
+
+def test_miss_leaves_the_output_untouched(store, tmp_path):
+    output_path = tmp_path / "workflow" / "reel_image_01.png"
+    
+    assert not store.fetch("unknown", output_path)
+    assert not output_path.exists()
+    assert store.stats()["misses"] == 1
+
+
+def test_evicted_images_lose_their_metadata(tmp_path):
+    store = GeneratedImageStore(cache_dir=tmp_path / "store", max_bytes=15)
+    store.add("first", _generated_image(tmp_path, "a.png", b"x" * 10), "replicate", None, 3.0)
+    store.add("second", _generated_image(tmp_path, "b.png", b"y" * 10), "replicate", None, 3.0)
+    
+    assert not store.store.contains("first")
+    
+    reopened = GeneratedImageStore(cache_dir=tmp_path / "store", max_bytes=15)
+    assert not reopened._metadata_path("first").exists()
+    assert reopened._metadata_path("second").exists()
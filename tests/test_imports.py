@@ -0,0 +1,16 @@
+"""Smoke tests that the application modules import cleanly."""
+
+import importlib
+
+import pytest
+
+
+@pytest.mark.parametrize("module", [
+    "utils.api_clients",
+    "utils.video_utils",
+    "utils.render_pool",
+    "orchestrator.workflow",
+    "orchestrator.batch",
+])
+def test_module_imports(module):
+    importlib.import_module(module)
@@ -0,0 +1,71 @@
+"""Tests for per-segment image generation."""
+
+import asyncio
+
+import pytest
+
+
+@pytest.fixture
+def media_generator(workflow_env, monkeypatch):
+    monkeypatch.setenv("IMAGE_RETRY_ATTEMPTS", "2")
+    monkeypatch.setenv("IMAGE_RETRY_BACKOFF_SECONDS", "0")
+    from agents.media_generator import MediaGenerator
+    
+    generator = MediaGenerator()
+    generator.image_store = None
+    return generator
+
+
+def test_failures_are_reported_per_index(media_generator, tmp_path):
+    attempts = []
+    
+    async def fake_generate(prompt, output_path, index, bypass_cache=False, slot=None):
+        attempts.append(index)
+        if prompt == "bad":
+            raise RuntimeError("content policy violation")
+        output_path.write_bytes(b"png")
+        return output_path
+    
+    media_generator._generate_single_image = fake_generate
+    errors = {}
+    
+    results = asyncio.run(media_generator.generate_images(
+        ["good", "bad", "good"], tmp_path, errors=errors
+    ))
+    
+    assert [path is not None for path in results] == [True, False, True]
+    assert errors == {1: "RuntimeError: content policy violation"}
+    # Only the failed index is retried
+    assert sorted(attempts) == [0, 1, 1, 2]
+
+
+def test_client_errors_reach_the_caller(media_generator, tmp_path):
+    async def failing_client(**kwargs):
+        raise ConnectionResetError("connection reset by peer")
+    
+    media_generator.client.generate_image = failing_client
+    errors = {}
+    
+    results = asyncio.run(media_generator.generate_images(["a cat"], tmp_path, errors=errors))
+    
+    assert results == [None]
+    assert errors == {0: "ConnectionResetError: connection reset by peer"}
+
+
+def test_later_success_clears_the_error(media_generator, tmp_path):
+    calls = []
+    
+    async def flaky(prompt, output_path, index, bypass_cache=False, slot=None):
+        calls.append(index)
+        if len(calls) == 1:
+            raise TimeoutError("slow provider")
+        output_path.write_bytes(b"png")
+        return output_path
+    
+    media_generator._generate_single_image = flaky
+    errors = {}
+    
+    results = asyncio.run(media_generator.generate_images(["a cat"], tmp_path, errors=errors))
+    
+    assert results[0] is not None
+    assert errors == {}
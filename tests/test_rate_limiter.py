@@ -0,0 +1,155 @@
+"""Tests for the token-bucket rate limiter."""
+
+import asyncio
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import RateLimitConfig, RateLimiter, TokenBucket, get_rate_limiter
+
+
+class FakeClock:
+    """Stands in for the time module so bucket refills are deterministic."""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter, "time", fake)
+    return fake
+
+
+def test_reservations_are_spaced_in_fifo_order(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    
+    waits = [bucket.reserve() for _ in range(5)]
+    
+    assert waits == [0.0, 0.0, 0.5, 1.0, 1.5]
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = TokenBucket(rate=2.0, capacity=3)
+    bucket.reserve(3)
+    
+    clock.advance(100)
+    
+    assert bucket.available == 3
+
+
+def test_debt_is_repaid_over_time(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    bucket.reserve()
+    assert bucket.reserve() == pytest.approx(1.0)
+    
+    clock.advance(1.0)
+    
+    # The second reservation has been paid off; a third waits one more interval
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_acquire_sleeps_for_the_longest_bucket(clock, monkeypatch):
+    sleeps = []
+    
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+    
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+    limiter = RateLimiter(
+        RateLimitConfig(max_requests=60, time_window=60.0, burst=10),
+        {"tokens": TokenBucket(rate=100.0, capacity=100)}
+    )
+    
+    asyncio.run(limiter.acquire(tokens=300))
+    
+    assert sleeps == [pytest.approx(2.0)]
+
+
+def test_limiters_are_shared_per_provider():
+    assert get_rate_limiter("replicate") is get_rate_limiter("replicate")
+    assert get_rate_limiter("replicate") is not get_rate_limiter("elevenlabs")
+    with pytest.raises(ValueError):
+        get_rate_limiter("unknown")
+
+
+def test_aimd_halves_on_throttle_and_recovers_additively(clock):
+    limiter = RateLimiter(RateLimitConfig(max_requests=60, time_window=60.0))
+    bucket = limiter.buckets["requests"]
+    
+    limiter.record_throttle()
+    assert bucket.rate == pytest.approx(0.5)
+    assert limiter.throttled == 1
+    
+    limiter.record_success()
+    assert bucket.rate == pytest.approx(0.55)
+    
+    for _ in range(100):
+        limiter.record_success()
+    assert bucket.rate == pytest.approx(1.0)
+
+
+def test_rate_never_drops_below_the_floor(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    
+    for _ in range(20):
+        bucket.decrease()
+    
+    assert bucket.rate == pytest.approx(TokenBucket.MIN_RATE_FRACTION)
+
+
+def test_low_remaining_header_backs_off_only_that_bucket(clock):
+    limiter = RateLimiter(
+        RateLimitConfig(max_requests=60, time_window=60.0),
+        {"tokens": TokenBucket(rate=100.0, capacity=1000)}
+    )
+    
+    limiter.record_success({"x-ratelimit-remaining-tokens": "50"})
+    
+    assert limiter.buckets["tokens"].rate == pytest.approx(50.0)
+    assert limiter.buckets["requests"].rate == pytest.approx(1.0)
+
+
+def test_retry_after_pause_waits_exactly_that_long(clock):
+    limiter = RateLimiter(RateLimitConfig(max_requests=60, time_window=60.0))
+    
+    limiter.record_throttle(retry_after=2.0)
+    
+    assert limiter.buckets["requests"].reserve() == pytest.approx(2.0)
+    clock.advance(2.0)
+    assert limiter.buckets["requests"].reserve() == 0.0
+
+
+def test_pause_does_not_shorten_an_existing_debt(clock):
+    bucket = TokenBucket(rate=1.0, capacity=1)
+    bucket.reserve()
+    bucket.reserve()
+    bucket.reserve()
+    
+    bucket.pause(0.5)
+    
+    assert bucket.reserve() == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("value,seconds", [
+    ("20ms", 0.02),
+    ("1.5s", 1.5),
+    ("6m0s", 360.0),
+    ("7", 7.0),
+    ("soon", None),
+])
+def test_parse_duration(value, seconds):
+    assert rate_limiter.parse_duration(value) == (pytest.approx(seconds) if seconds else None)
+
+
+def test_retry_after_ms_takes_precedence():
+    headers = {"retry-after-ms": "1500", "retry-after": "30"}
+    
+    assert rate_limiter.parse_retry_after(headers) == pytest.approx(1.5)
@@ -0,0 +1,83 @@
+"""Tests for the SQLite state store."""
+
+import json
+
+import pytest
+
+from orchestrator.sqlite_state import SQLiteStateManager
+from orchestrator.state_manager import WorkflowState
+
+
+def _write_json_state(directory, **fields):
+    state = WorkflowState(**fields)
+    with open(directory / f"{state.workflow_id}.json", "w") as f:
+        json.dump(state.model_dump(), f)
+    return state
+
+
+@pytest.fixture
+def json_dir(tmp_path):
+    directory = tmp_path / "json_state"
+    directory.mkdir()
+    _write_json_state(directory, workflow_id="wf-old", niche="cats", status="completed",
+                      current_step="caption_generation", updated_at="2026-01-01T10:00:00")
+    _write_json_state(directory, workflow_id="wf-mid", niche="dogs", status="failed",
+                      current_step="image_generation", updated_at="2026-02-01T10:00:00")
+    _write_json_state(directory, workflow_id="wf-new", niche="cats", status="completed",
+                      current_step="caption_generation", updated_at="2026-03-01T10:00:00")
+    (directory / "broken.json").write_text("{not json")
+    return directory
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return SQLiteStateManager(tmp_path / "db")
+
+
+def test_import_copies_valid_states_and_skips_broken_files(manager, json_dir):
+    assert manager.import_json_states(json_dir) == 3
+    
+    state = manager.load_state("wf-mid")
+    assert state.niche == "dogs"
+    assert state.status == "failed"
+    # Imported rows keep the file's timestamps
+    assert state.updated_at == "2026-02-01T10:00:00"
+    assert manager.load_state("broken") is None
+    # The JSON files stay where they were
+    assert (json_dir / "wf-mid.json").exists()
+
+
+def test_reimport_overwrites_existing_rows(manager, json_dir):
+    manager.import_json_states(json_dir)
+    _write_json_state(json_dir, workflow_id="wf-mid", niche="dogs", status="completed",
+                      current_step="caption_generation", updated_at="2026-04-01T10:00:00")
+    
+    assert manager.import_json_states(json_dir) == 3
+    assert manager.count_workflows() == 3
+    assert manager.load_state("wf-mid").status == "completed"
+
+
+def test_listing_filters_sorts_and_pages(manager, json_dir):
+    manager.import_json_states(json_dir)
+    
+    assert [wf["workflow_id"] for wf in manager.list_workflows()] == ["wf-new", "wf-mid", "wf-old"]
+    assert [wf["workflow_id"] for wf in manager.list_workflows(limit=1, offset=1)] == ["wf-mid"]
+    assert [wf["workflow_id"] for wf in manager.list_workflows(niche="cats")] == ["wf-new", "wf-old"]
+    assert manager.count_workflows(status="completed") == 2
+    assert manager.count_workflows(status="failed", niche="cats") == 0
+    
+    listed = manager.list_workflows(status="failed")[0]
+    assert listed["current_step"] == "image_generation"
+    assert "script" not in listed
+
+
+def test_saved_state_becomes_most_recent(manager, json_dir):
+    manager.import_json_states(json_dir)
+    state = manager.load_state("wf-old")
+    state.status = "failed"
+    manager.save_state(state)
+    
+    assert manager.list_workflows(limit=1)[0]["workflow_id"] == "wf-old"
+    assert manager.delete_state("wf-old")
+    assert not manager.delete_state("wf-old")
+    assert manager.count_workflows() == 2
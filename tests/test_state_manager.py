@@ -0,0 +1,132 @@
+"""Tests for workflow state persistence."""
+
+import asyncio
+import os
+import threading
+
+import pytest
+
+from orchestrator.state_manager import StateManager, StateSaver, WorkflowState
+
+
+class SlowStateManager:
+    """Records every write and holds the first one until released."""
+    
+    def __init__(self):
+        self.written = []
+        self.release = threading.Event()
+    
+    def save_state(self, state):
+        if not self.written:
+            self.release.wait(timeout=5)
+        self.written.append((state.workflow_id, state.current_step))
+
+
+def test_saves_during_a_write_are_coalesced_into_the_newest():
+    manager = SlowStateManager()
+    saver = StateSaver(manager)
+    
+    async def scenario():
+        first = asyncio.ensure_future(saver.save(WorkflowState(workflow_id="wf-1", current_step="script")))
+        await asyncio.sleep(0.05)
+        # These arrive while the first write is still in flight
+        later = [
+            asyncio.ensure_future(saver.save(WorkflowState(workflow_id="wf-1", current_step=step)))
+            for step in ("images", "voiceover", "video")
+        ]
+        other = asyncio.ensure_future(saver.save(WorkflowState(workflow_id="wf-2", current_step="script")))
+        await asyncio.sleep(0.05)
+        assert not any(task.done() for task in [first, *later])
+        
+        manager.release.set()
+        await asyncio.gather(first, *later, other)
+    
+    asyncio.run(scenario())
+    
+    assert [entry for entry in manager.written if entry[0] == "wf-1"] == [
+        ("wf-1", "script"), ("wf-1", "video")
+    ]
+    assert ("wf-2", "script") in manager.written
+    assert saver.stats() == {"saves_requested": 5, "saves_written": 3, "saves_coalesced": 2}
+
+
+def test_flush_waits_for_queued_saves():
+    manager = SlowStateManager()
+    manager.release.set()
+    saver = StateSaver(manager)
+    
+    async def scenario():
+        asyncio.ensure_future(saver.save(WorkflowState(workflow_id="wf-1", current_step="script")))
+        await asyncio.sleep(0)
+        await saver.flush()
+    
+    asyncio.run(scenario())
+    
+    assert manager.written == [("wf-1", "script")]
+
+
+def test_failed_write_keeps_the_previous_state(tmp_path, monkeypatch):
+    manager = StateManager(tmp_path)
+    manager.save_state(WorkflowState(workflow_id="wf-1", current_step="script"))
+    
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+    
+    monkeypatch.setattr("orchestrator.state_manager.os.replace", failing_replace)
+    with pytest.raises(OSError):
+        manager.save_state(WorkflowState(workflow_id="wf-1", current_step="images"))
+    monkeypatch.undo()
+    
+    assert manager.load_state("wf-1").current_step == "script"
+    assert [p.name for p in tmp_path.iterdir() if p.name.endswith(".tmp")] == []
+
+
+def _save(manager, workflow_id, **fields):
+    manager.save_state(WorkflowState(workflow_id=workflow_id, **fields))
+
+
+def test_listing_filters_sorts_and_counts(tmp_path):
+    manager = StateManager(tmp_path)
+    _save(manager, "wf-1", niche="cats", status="completed")
+    _save(manager, "wf-2", niche="dogs", status="failed", current_step="image_generation")
+    _save(manager, "wf-3", niche="cats", status="in_progress")
+    
+    assert [wf["workflow_id"] for wf in manager.list_workflows()] == ["wf-3", "wf-2", "wf-1"]
+    assert [wf["workflow_id"] for wf in manager.list_workflows(limit=1, offset=1)] == ["wf-2"]
+    assert [wf["workflow_id"] for wf in manager.list_workflows(niche="cats")] == ["wf-3", "wf-1"]
+    assert manager.list_workflows(status="failed")[0]["current_step"] == "image_generation"
+    assert manager.count_workflows() == 3
+    assert manager.count_workflows(niche="cats", status="completed") == 1
+
+
+def test_listing_reads_the_manifest_instead_of_unchanged_states(tmp_path):
+    manager = StateManager(tmp_path)
+    _save(manager, "wf-1", niche="cats", status="completed")
+    state_file = tmp_path / "wf-1.json"
+    stat = state_file.stat()
+    
+    # Garble the file but keep its mtime, so only the manifest can answer
+    state_file.write_text("{" + " " * (stat.st_size - 1))
+    os.utime(state_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    
+    listed = StateManager(tmp_path).list_workflows()
+    assert [(wf["workflow_id"], wf["status"]) for wf in listed] == [("wf-1", "completed")]
+
+
+def test_listing_picks_up_states_changed_by_other_writers(tmp_path):
+    manager = StateManager(tmp_path)
+    _save(manager, "wf-1", niche="cats", status="in_progress")
+    _save(manager, "wf-2", niche="dogs", status="in_progress")
+    assert manager.count_workflows() == 2
+    
+    # Another process saves one workflow and deletes the other's file
+    other = StateManager(tmp_path)
+    _save(other, "wf-1", niche="cats", status="completed")
+    (tmp_path / "wf-2.json").unlink()
+    _save(other, "wf-3", niche="birds", status="in_progress")
+    
+    listed = {wf["workflow_id"]: wf["status"] for wf in manager.list_workflows()}
+    assert listed == {"wf-1": "completed", "wf-3": "in_progress"}
+    
+    assert manager.delete_state("wf-3")
+    assert [wf["workflow_id"] for wf in other.list_workflows()] == ["wf-1"]
@@ -0,0 +1,91 @@
+"""Tests for the reel render engines and their parity check."""
+
+import subprocess
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from utils.video_utils import VideoProcessor, compare_renders, _get_ffmpeg_binary
+
+
+@pytest.fixture
+def processor(tmp_path, monkeypatch):
+    monkeypatch.setenv("VIDEO_RESOLUTION", "180x320")
+    monkeypatch.setenv("VIDEO_FPS", "10")
+    monkeypatch.chdir(tmp_path)
+    return VideoProcessor()
+
+
+@pytest.fixture
+def media(tmp_path):
+    """Two landscape stills (so scaling matters) and a 3 second voiceover."""
+    images = []
+    for name, color in (("red.png", (220, 30, 30)), ("blue.png", (30, 30, 220))):
+        path = tmp_path / name
+        Image.new("RGB", (320, 180), color).save(path)
+        images.append(path)
+    
+    audio_path = tmp_path / "voiceover.mp3"
+    subprocess.run(
+        [_get_ffmpeg_binary(), "-y", "-loglevel", "error",
+         "-f", "lavfi", "-i", "sine=frequency=440:duration=3", str(audio_path)],
+        check=True
+    )
+    return images, audio_path
+
+
+def test_ffmpeg_engine_matches_moviepy(processor, media, tmp_path):
+    images, audio_path = media
+    
+    reference = processor.create_reel(
+        images, audio_path, tmp_path / "moviepy.mp4", [1.0, 2.0], render_engine="moviepy"
+    )
+    candidate = processor.create_reel(
+        images, audio_path, tmp_path / "ffmpeg.mp4", [1.0, 2.0], render_engine="ffmpeg"
+    )
+    
+    assert compare_renders(reference, candidate) == []
+
+
+def test_parity_check_reports_different_pictures(processor, media, tmp_path):
+    images, audio_path = media
+    
+    reference = processor.create_reel(
+        images, audio_path, tmp_path / "in_order.mp4", [1.5, 1.5], render_engine="ffmpeg"
+    )
+    swapped = processor.create_reel(
+        images[::-1], audio_path, tmp_path / "swapped.mp4", [1.5, 1.5], render_engine="ffmpeg"
+    )
+    
+    mismatches = compare_renders(reference, swapped)
+    assert mismatches
+    assert all(m.startswith("frame at") for m in mismatches)
+
+
+def test_unknown_engine_is_rejected(processor, media, tmp_path):
+    images, audio_path = media
+    
+    with pytest.raises(ValueError, match="Unknown render engine"):
+        processor.create_reel(images, audio_path, tmp_path / "out.mp4", render_engine="gstreamer")
+
+
+def test_frame_counts_round_cut_points_on_the_timeline(processor):
+    # Rounding each 2.5-frame segment on its own would lose two frames
+    assert processor._frame_counts([0.25, 0.25, 0.25, 0.25]) == [2, 3, 3, 2]
+    # Very short segments still get a frame and the total stays on the voiceover
+    counts = processor._frame_counts([0.01, 0.01, 1.0])
+    assert counts == [1, 1, 8]
+    assert sum(counts) == round(1.02 * processor.fps)
+
+
+def test_segment_chunks_are_cached_by_image_length_and_settings(processor, media):
+    images, _ = media
+    
+    chunk = processor.encode_segment(images[0], 10)
+    assert processor.encode_segment(images[0], 10) == chunk
+    assert processor.encode_segment(images[0], 12) != chunk
+    assert processor.encode_segment(images[1], 10) != chunk
+    
+    processor.fps = 15
+    assert processor.encode_segment(images[0], 10) != chunk
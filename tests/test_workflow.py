@@ -0,0 +1,227 @@
+"""Tests for workflow stage checkpoints and resuming."""
+
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from orchestrator.state_manager import WorkflowState
+
+
+SCRIPT = {
+    "full_transcript": "Cats nap a lot.",
+    "segments": [
+        {"segment_number": 1, "spoken_text": "Cats nap a lot.", "image_prompt": "A napping cat",
+         "duration_estimate": 2.0, "visual_description": "A cat asleep"},
+    ],
+}
+
+
+class StubNodes:
+    """Replaces the workflow's stage nodes with fakes that record which stages ran."""
+    
+    def __init__(self, workflow, output_dir: Path):
+        self.calls = []
+        self.failing = set()
+        self.output_dir = output_dir
+        workflow._generate_script_node = self._node("script", self._script)
+        workflow._generate_images_node = self._node("images", self._images)
+        workflow._generate_voiceover_node = self._node("voiceover", self._voiceover)
+        workflow._render_video_node = self._node("video", self._video)
+        workflow._generate_caption_node = self._node("caption", self._caption)
+    
+    def _node(self, stage, produce):
+        async def node(state):
+            self.calls.append(stage)
+            if stage in self.failing:
+                state["status"] = "failed"
+                state["error_message"] = f"{stage} failed"
+            else:
+                produce(state)
+                state["status"] = "in_progress"
+            return state
+        return node
+    
+    def _write(self, name: str) -> str:
+        path = self.output_dir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(name.encode())
+        return str(path)
+    
+    def _script(self, state):
+        state["script"] = SCRIPT
+        state["image_status"] = []
+    
+    def _images(self, state):
+        state["image_paths"] = [self._write("image_01.png")]
+        state["image_status"] = ["completed"]
+    
+    def _voiceover(self, state):
+        state["audio_path"] = self._write("voiceover.mp3")
+    
+    def _video(self, state):
+        state["video_path"] = self._write("final_reel.mp4")
+    
+    def _caption(self, state):
+        state["caption"] = {"caption": "Nap time", "hashtags": ["cats"], "full_caption": "Nap time #cats"}
+
+
+@pytest.fixture
+def workflow(workflow_env):
+    from orchestrator.workflow import ReelsWorkflow
+    
+    workflow = ReelsWorkflow(state_storage_path=workflow_env / "state", execution_mode="sequential")
+    workflow.state_manager.save_state(WorkflowState(
+        workflow_id="wf-1",
+        niche="cats",
+        concepts=[{"title": "Cat naps", "hook": "Ever seen a cat nap?"}],
+        selected_concept_index=0,
+        current_step="concept_selection",
+        status="waiting_for_selection"
+    ))
+    return workflow
+
+
+@pytest.fixture
+def nodes(workflow, workflow_env):
+    return StubNodes(workflow, workflow_env / "output" / "wf-1")
+
+
+def test_resume_reruns_only_the_failed_stage(workflow, nodes):
+    nodes.failing.add("caption")
+    result = workflow.run(workflow.continue_workflow("wf-1", 0))
+    assert result["status"] == "failed"
+    assert nodes.calls == ["script", "images", "voiceover", "video", "caption"]
+    
+    nodes.calls.clear()
+    nodes.failing.clear()
+    result = workflow.run(workflow.resume_workflow("wf-1"))
+    assert result["status"] == "completed"
+    assert nodes.calls == ["caption"]
+    
+    nodes.calls.clear()
+    result = workflow.run(workflow.resume_workflow("wf-1"))
+    assert result["status"] == "completed"
+    assert nodes.calls == []
+
+
+def test_missing_output_reruns_the_stage_and_everything_after_it(workflow, nodes):
+    workflow.run(workflow.continue_workflow("wf-1", 0))
+    
+    Path(workflow.load_workflow_state("wf-1").audio_path).unlink()
+    nodes.calls.clear()
+    workflow.run(workflow.resume_workflow("wf-1"))
+    
+    # The new audio file changes the video's inputs; script, images and caption are reused
+    assert nodes.calls == ["voiceover", "video"]
+
+
+def test_failed_stage_drops_its_checkpoint(workflow, nodes):
+    workflow.run(workflow.continue_workflow("wf-1", 0))
+    assert "caption" in workflow.load_workflow_state("wf-1").stage_fingerprints
+    
+    nodes.failing.add("caption")
+    result = workflow.run(workflow.continue_workflow("wf-1", 0, fresh=True))
+    
+    assert result["status"] == "failed"
+    assert "caption" not in workflow.load_workflow_state("wf-1").stage_fingerprints
+
+
+def test_new_script_with_same_prompts_keeps_image_status(workflow, nodes):
+    workflow.run(workflow.continue_workflow("wf-1", 0))
+    
+    # A changed concept regenerates the script, which comes back with the same prompts
+    saved = workflow.load_workflow_state("wf-1")
+    saved.concepts = [{"title": "Cat naps", "hook": "Cats sleep 16 hours a day"}]
+    workflow.state_manager.save_state(saved)
+    nodes.calls.clear()
+    result = workflow.run(workflow.resume_workflow("wf-1"))
+    
+    assert "script" in nodes.calls
+    assert "images" not in nodes.calls
+    assert result["image_status"] == ["completed"]
+    assert workflow.load_workflow_state("wf-1").image_status == ["completed"]
+
+
+def test_fingerprints_follow_each_stage_inputs(workflow):
+    state = {
+        "workflow_id": "wf-1",
+        "concepts": [{"title": "Cat naps"}],
+        "selected_concept_index": 0,
+        "script": SCRIPT,
+        "image_paths": [],
+        "audio_path": "",
+        "audio_durations": [],
+        "niche": "cats",
+        "keywords": "",
+    }
+    before = {stage: workflow._stage_fingerprint(state, stage) for stage in ("images", "voiceover")}
+    
+    changed_prompt = {**SCRIPT, "segments": [{**SCRIPT["segments"][0], "image_prompt": "A cat in a box"}]}
+    after = {
+        stage: workflow._stage_fingerprint({**state, "script": changed_prompt}, stage)
+        for stage in ("images", "voiceover")
+    }
+    
+    assert after["images"] != before["images"]
+    assert after["voiceover"] == before["voiceover"]
+
+
+@pytest.fixture
+def lost_render(workflow, nodes, monkeypatch):
+    """Queue a background render that never reports back, as if the process had exited."""
+    import orchestrator.workflow as workflow_module
+    
+    async def preview(state):
+        return state
+    
+    workflow._render_preview_node = preview
+    workflow.video_assembler.start_background_render = lambda **kwargs: None
+    monkeypatch.setattr(workflow_module, "_active_renders", set())
+    
+    result = workflow.run(workflow.continue_workflow("wf-1", 0, background_render=True))
+    assert result["status"] == "rendering"
+    nodes.calls.clear()
+    return workflow_module
+
+
+def test_running_render_is_not_resumed(workflow, lost_render):
+    saved = workflow.load_workflow_state("wf-1")
+    assert saved.render_pid == os.getpid()
+    assert saved.render_started_at
+    assert not workflow.is_render_stale(saved)
+    
+    with pytest.raises(ValueError, match="still rendering"):
+        workflow.run(workflow.resume_workflow("wf-1"))
+
+
+def test_lost_render_is_redone_on_resume(workflow, nodes, lost_render):
+    lost_render._active_renders.clear()
+    assert workflow.is_render_stale(workflow.load_workflow_state("wf-1"))
+    
+    result = workflow.run(workflow.resume_workflow("wf-1"))
+    
+    assert result["status"] == "completed"
+    assert nodes.calls == ["video"]
+    assert Path(result["video_path"]).exists()
+
+
+def test_render_staleness_follows_owner_process_and_age(workflow):
+    exited = subprocess.Popen([sys.executable, "-c", "pass"])
+    exited.wait()
+    now = datetime.now()
+    
+    def rendering(pid, started_at):
+        return WorkflowState(
+            workflow_id="wf-2", status="rendering", render_pid=pid,
+            render_started_at=started_at.isoformat() if started_at else None
+        )
+    
+    assert not workflow.is_render_stale(rendering(os.getppid(), now))
+    assert workflow.is_render_stale(rendering(os.getppid(), now - timedelta(hours=2)))
+    assert workflow.is_render_stale(rendering(exited.pid, now))
+    assert workflow.is_render_stale(rendering(None, None))
+    assert not workflow.is_render_stale(WorkflowState(workflow_id="wf-3", status="completed"))
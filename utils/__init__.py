@@ -1,13 +1,45 @@
 """Utility modules for the Instagram Reels workflow."""
 
-from .rate_limiter import RateLimiter
+from .rate_limiter import RateLimiter, TokenBucket, get_rate_limiter, get_rate_limit_metrics
 from .api_clients import OpenAIClient, ElevenLabsClient, ReplicateClient
+from .disk_cache import DiskCache
+from .image_cache import ScaledImageCache
+from .llm_cache import LLMResponseCache, get_llm_cache
+from .image_store import GeneratedImageStore, get_image_store
+from .voice_cache import VoiceoverCache, get_voiceover_cache
+from .http_session import HTTPSessionPool, get_http_pool, close_http_pool
+from .concurrency import ProviderBudget, get_provider_budget, provider_slot
+from .executors import InstrumentedExecutor, get_executor, get_executor_metrics
 from .video_utils import VideoProcessor
+from .render_pool import RenderWorkerPool, get_render_pool, get_render_pool_metrics
 
 __all__ = [
     "RateLimiter",
+    "TokenBucket",
+    "get_rate_limiter",
+    "get_rate_limit_metrics",
     "OpenAIClient",
     "ElevenLabsClient",
     "ReplicateClient",
+    "DiskCache",
+    "ScaledImageCache",
+    "LLMResponseCache",
+    "get_llm_cache",
+    "GeneratedImageStore",
+    "get_image_store",
+    "VoiceoverCache",
+    "get_voiceover_cache",
+    "HTTPSessionPool",
+    "get_http_pool",
+    "close_http_pool",
+    "ProviderBudget",
+    "get_provider_budget",
+    "provider_slot",
+    "InstrumentedExecutor",
+    "get_executor",
+    "get_executor_metrics",
     "VideoProcessor",
+    "RenderWorkerPool",
+    "get_render_pool",
+    "get_render_pool_metrics",
 ]
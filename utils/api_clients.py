@@ -1,16 +1,133 @@
 """API client wrappers with rate limiting and error handling."""
 
 import os
+import time
 import asyncio
-from typing import Optional, List, Dict, Any
+import contextlib
+import tempfile
+from dataclasses import dataclass
+from typing import Optional, List, Dict, Any, Callable
 from pathlib import Path
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception
 
 from openai import AsyncOpenAI
-from elevenlabs.client import ElevenLabs
-import replicate
 
-from .rate_limiter import RateLimiter, RateLimitConfig
+from .rate_limiter import RateLimiter, get_rate_limiter, parse_retry_after
+from .http_session import get_http_pool
+from .concurrency import provider_slot
+from .llm_cache import get_llm_cache
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """Best-effort HTTP status of an SDK exception (OpenAI, ElevenLabs, Replicate, aiohttp)."""
+    for attr in ("status_code", "status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    for attr in ("status_code", "status"):
+        value = getattr(response, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def get_error_headers(error: BaseException) -> Optional[Dict[str, Any]]:
+    """Response headers attached to an SDK exception, if any."""
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    return headers
+
+
+def is_retryable_error(error: BaseException) -> bool:
+    """
+    Retry throttling, server errors and transport failures; fail fast on other 4xx.
+    
+    Errors without an HTTP status (timeouts, dropped connections) are retried.
+    """
+    if not isinstance(error, Exception):
+        # Never retry task cancellation (e.g. a workflow shutting down)
+        return False
+    status = get_status_code(error)
+    if status is None:
+        return True
+    return status in (408, 429) or status >= 500
+
+
+def observe_rate_limit_error(limiter: RateLimiter, error: BaseException) -> None:
+    """Tell the limiter about a 429 so it backs off (AIMD decrease + Retry-After)."""
+    if get_status_code(error) == 429:
+        limiter.record_throttle(parse_retry_after(get_error_headers(error)))
+
+
+class AzureImageClientPool:
+    """
+    Cache of AsyncOpenAI clients for Azure image deployments.
+    
+    One client (and therefore one httpx connection pool) is kept per
+    (endpoint, deployment, api_version, base_url) instead of building a new
+    client for every image request. Clients are bound to the event loop they
+    were first used on and are recreated when the loop changes.
+    """
+    
+    def __init__(self):
+        self._clients: Dict[tuple, AsyncOpenAI] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.created = 0
+        self.reused = 0
+    
+    def get_client(
+        self,
+        endpoint: str,
+        deployment: str,
+        api_version: str,
+        base_url: str,
+        api_key: Optional[str]
+    ) -> AsyncOpenAI:
+        """Get the cached client for a deployment, creating it on first use."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Connections from a previous event loop can't be reused
+            self._clients = {}
+            self._loop = loop
+        
+        key = (endpoint, deployment, api_version, base_url)
+        client = self._clients.get(key)
+        if client is None:
+            client = AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                default_query={"api-version": api_version}
+            )
+            self._clients[key] = client
+            self.created += 1
+        else:
+            self.reused += 1
+        
+        return client
+    
+    async def close(self) -> None:
+        """Close all cached clients and their connection pools."""
+        clients = list(self._clients.values())
+        self._clients = {}
+        self._loop = None
+        for client in clients:
+            await client.close()
+    
+    def stats(self) -> Dict[str, float]:
+        """Get client creation/reuse counters."""
+        requests = self.created + self.reused
+        return {
+            "clients_open": len(self._clients),
+            "created": self.created,
+            "reused": self.reused,
+            "reuse_rate": self.reused / requests if requests else 0.0,
+        }
+
+
+# Shared by every OpenAIClient instance in the process
+azure_image_clients = AzureImageClientPool()
 
 
 class OpenAIClient:
@@ -68,43 +185,126 @@ class OpenAIClient:
             self.model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
             self.use_azure = False
         
-        # Rate limiter: 60 requests per minute
-        self.rate_limiter = RateLimiter(
-            RateLimitConfig(max_requests=60, time_window=60.0)
-        )
+        # Process-wide limiters shared by every agent's client
+        # (requests + tokens per minute for chat, requests per minute for images)
+        self.rate_limiter = get_rate_limiter("openai")
+        self.image_rate_limiter = get_rate_limiter("openai_images")
+    
+    @staticmethod
+    def _estimate_tokens(prompt: str, system_prompt: Optional[str], max_tokens: int) -> int:
+        """Rough token cost of a chat request (~4 characters per token plus the completion budget)."""
+        return (len(prompt) + len(system_prompt or "")) // 4 + max_tokens
+    
+    async def generate_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        temperature: float = 0.7,
+        max_tokens: int = 2000,
+        bypass_cache: bool = False,
+        validate: Optional[Callable[[str], Any]] = None
+    ) -> str:
+        """
+        Generate text using OpenAI GPT models.
+        
+        When LLM_CACHE_ENABLED=true, identical requests are answered from the
+        on-disk response cache. Set bypass_cache for a fresh generation; the
+        new response still replaces the cached one.
+        
+        Args:
+            prompt: User prompt
+            system_prompt: Optional system prompt
+            temperature: Sampling temperature
+            max_tokens: Completion token budget
+            bypass_cache: Skip the cache lookup (the response is still cached)
+            validate: Optional parser the caller applies to the response. Only
+                     responses it accepts (doesn't raise on) are cached, and cached
+                     responses it rejects are treated as misses, so a malformed
+                     answer is never replayed on later runs.
+        
+        Returns:
+            The generated text (returned even if validate rejects it)
+        """
+        cache = get_llm_cache()
+        if cache is None:
+            return await self._generate_text(prompt, system_prompt, temperature, max_tokens)
+        
+        key = cache.make_key(self.model, system_prompt, prompt, temperature, max_tokens)
+        if not bypass_cache:
+            cached = cache.get(key)
+            if cached is not None and self._is_valid(cached, validate):
+                return cached
+        
+        response = await self._generate_text(prompt, system_prompt, temperature, max_tokens)
+        if response and self._is_valid(response, validate):
+            cache.put(key, self.model, response)
+        return response
+    
+    @staticmethod
+    def _is_valid(response: str, validate: Optional[Callable[[str], Any]]) -> bool:
+        """Whether a response passes the caller's validator (always True without one)."""
+        if validate is None:
+            return True
+        try:
+            validate(response)
+        except Exception:
+            return False
+        return True
     
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
+        retry=retry_if_exception(is_retryable_error)
     )
-    async def generate_text(
+    async def _generate_text(
         self,
         prompt: str,
-        system_prompt: Optional[str] = None,
-        temperature: float = 0.7,
-        max_tokens: int = 2000
+        system_prompt: Optional[str],
+        temperature: float,
+        max_tokens: int
     ) -> str:
-        """Generate text using OpenAI GPT models."""
-        async with self.rate_limiter:
+        """Call the chat completions API (rate limited and retried)."""
+        async with provider_slot("openai_text"):
+            await self.rate_limiter.acquire(
+                tokens=self._estimate_tokens(prompt, system_prompt, max_tokens)
+            )
             messages = []
             if system_prompt:
                 messages.append({"role": "system", "content": system_prompt})
             messages.append({"role": "user", "content": prompt})
             
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens
-            )
+            try:
+                # Raw response gives access to the x-ratelimit-* headers
+                raw_response = await self.client.chat.completions.with_raw_response.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens
+                )
+            except Exception as e:
+                observe_rate_limit_error(self.rate_limiter, e)
+                raise
+            
+            self.rate_limiter.record_success(raw_response.headers)
+            response = raw_response.parse()
             
             return response.choices[0].message.content
     
+    async def _create_image(self, client: AsyncOpenAI, model: str, **params) -> Any:
+        """Call the images endpoint and feed its rate limit headers to the limiter."""
+        try:
+            raw_response = await client.images.with_raw_response.generate(model=model, **params)
+        except Exception as e:
+            observe_rate_limit_error(self.image_rate_limiter, e)
+            raise
+        
+        self.image_rate_limiter.record_success(raw_response.headers)
+        return raw_response.parse()
+    
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
+        retry=retry_if_exception(is_retryable_error)
     )
     async def generate_image(
         self,
@@ -114,38 +314,48 @@ class OpenAIClient:
         n: int = 1
     ) -> List[str]:
         """Generate images using DALL-E 3."""
-        async with self.rate_limiter:
+        async with provider_slot("images"), self.image_rate_limiter:
             if self.use_azure:
                 # For Azure OpenAI, image generation uses a different endpoint structure
                 # Base URL should be: https://{endpoint}/openai/deployments/{deployment}
                 image_base_url = f"{self.azure_endpoint}/openai/deployments/{self.image_deployment}"
                 
-                image_client = AsyncOpenAI(
-                    api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+                image_client = azure_image_clients.get_client(
+                    endpoint=self.azure_endpoint,
+                    deployment=self.image_deployment,
+                    api_version=self.api_version,
                     base_url=image_base_url,
-                    default_query={"api-version": self.api_version}
+                    api_key=os.getenv("AZURE_OPENAI_API_KEY")
                 )
                 
                 # Azure OpenAI: deployment name is used as model parameter
                 # The SDK will append /images/generations to the base_url
                 try:
-                    response = await image_client.images.generate(
-                        model=self.image_deployment,
+                    response = await self._create_image(
+                        image_client,
+                        self.image_deployment,
                         prompt=prompt,
                         size=size,
                         quality=quality,
                         n=n
                     )
                 except Exception as e:
+                    # Throttling is not a URL problem - let the retry policy handle it
+                    if get_status_code(e) == 429:
+                        raise
+                    
                     # If the above fails, try with the full endpoint path
                     image_base_url_full = f"{self.azure_endpoint}/openai/deployments/{self.image_deployment}/images/generations"
-                    image_client = AsyncOpenAI(
-                        api_key=os.getenv("AZURE_OPENAI_API_KEY"),
+                    image_client = azure_image_clients.get_client(
+                        endpoint=self.azure_endpoint,
+                        deployment=self.image_deployment,
+                        api_version=self.api_version,
                         base_url=image_base_url_full,
-                        default_query={"api-version": self.api_version}
+                        api_key=os.getenv("AZURE_OPENAI_API_KEY")
                     )
-                    response = await image_client.images.generate(
-                        model=self.image_deployment,
+                    response = await self._create_image(
+                        image_client,
+                        self.image_deployment,
                         prompt=prompt,
                         size=size,
                         quality=quality,
@@ -153,8 +363,9 @@ class OpenAIClient:
                     )
             else:
                 # Standard OpenAI
-                response = await self.client.images.generate(
-                    model="dall-e-3",
+                response = await self._create_image(
+                    self.client,
+                    "dall-e-3",
                     prompt=prompt,
                     size=size,
                     quality=quality,
@@ -164,121 +375,343 @@ class OpenAIClient:
             return [image.url for image in response.data]
 
 
+@dataclass
+class SpeechStreamStats:
+    """Latency and size measurements for a streamed TTS request."""
+    output_path: Path
+    time_to_first_byte: float  # in seconds, from request start to first audio chunk
+    total_time: float  # in seconds
+    total_bytes: int
+    chunks: int
+
+
 class ElevenLabsClient:
-    """ElevenLabs API client for text-to-speech."""
+    """
+    ElevenLabs API client for text-to-speech.
+    
+    Talks to the REST API through the shared aiohttp session pool, so speech
+    requests are native coroutines and never occupy an executor thread.
+    """
     
     def __init__(self):
         api_key = os.getenv("ELEVENLABS_API_KEY")
         if not api_key:
             raise ValueError("ELEVENLABS_API_KEY not found in environment variables")
         
-        self.client = ElevenLabs(api_key=api_key)
+        self.api_key = api_key
+        self.base_url = os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io").rstrip("/")
         self.voice_id = os.getenv("ELEVENLABS_VOICE_ID", "21m00Tcm4TlvDq8ikWAM")
         self.model_id = os.getenv("ELEVENLABS_MODEL_ID", "eleven_turbo_v2_5")
+        self.chunk_size = 16 * 1024
         
-        # Rate limiter: 30 requests per minute
-        self.rate_limiter = RateLimiter(
-            RateLimitConfig(max_requests=30, time_window=60.0)
+        # Process-wide limiter: requests per minute (+ characters per minute if configured)
+        self.rate_limiter = get_rate_limiter("elevenlabs")
+    
+    def _speech_request(self, text: str, voice: str):
+        """Open a streaming text-to-speech request (use as an async context manager)."""
+        session = get_http_pool().get_session()
+        return session.post(
+            f"{self.base_url}/v1/text-to-speech/{voice}/stream",
+            headers={"xi-api-key": self.api_key, "accept": "audio/mpeg"},
+            json={"text": text, "model_id": self.model_id}
         )
     
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
-    )
     async def generate_speech(
         self,
         text: str,
         output_path: Optional[Path] = None,
         voice_id: Optional[str] = None
     ) -> bytes:
-        """Generate speech audio from text."""
-        async with self.rate_limiter:
+        """
+        Generate speech audio from text and return it as bytes.
+        
+        Thin wrapper around stream_speech (which handles rate limiting and retries);
+        without an output_path the audio is streamed to a temporary file.
+        """
+        if output_path is not None:
+            await self.stream_speech(text, output_path, voice_id)
+            return output_path.read_bytes()
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            temp_path = Path(tmp) / "speech.mp3"
+            await self.stream_speech(text, temp_path, voice_id)
+            return temp_path.read_bytes()
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception(is_retryable_error)
+    )
+    async def stream_speech(
+        self,
+        text: str,
+        output_path: Path,
+        voice_id: Optional[str] = None,
+        chunk_consumer: Optional[Callable[[bytes], Any]] = None
+    ) -> SpeechStreamStats:
+        """
+        Generate speech and write audio chunks to disk as they arrive.
+        
+        Args:
+            text: Text to synthesize
+            output_path: Path where the audio file will be written
+            voice_id: Optional custom voice ID (uses default if not provided)
+            chunk_consumer: Optional callback invoked on the event loop with each
+                           audio chunk as soon as it has been written
+        
+        Returns:
+            Output path with time-to-first-byte, total time and size of the stream
+        """
+        async with provider_slot("elevenlabs"):
+            await self.rate_limiter.acquire(characters=len(text))
             voice = voice_id or self.voice_id
+            output_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Run synchronous ElevenLabs API in executor
-            loop = asyncio.get_event_loop()
-            
-            def _generate():
-                audio_generator = self.client.text_to_speech.convert(
-                    voice_id=voice,
-                    text=text,
-                    model_id=self.model_id
-                )
-                
-                audio_bytes = b""
-                for chunk in audio_generator:
-                    audio_bytes += chunk
-                return audio_bytes
+            # Write to a side file and rename it into place, so a failed attempt never
+            # truncates an existing file (which may be hard-linked into a cache)
+            temp_path = output_path.with_name(output_path.name + ".part")
             
-            audio_bytes = await loop.run_in_executor(None, _generate)
+            start = time.perf_counter()
+            first_byte = None
+            total_bytes = 0
+            chunks = 0
             
-            if output_path:
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                with open(output_path, "wb") as f:
-                    f.write(audio_bytes)
+            try:
+                async with self._speech_request(text, voice) as response:
+                    response.raise_for_status()
+                    with open(temp_path, "wb") as f:
+                        async for chunk in response.content.iter_chunked(self.chunk_size):
+                            if not chunk:
+                                continue
+                            if first_byte is None:
+                                first_byte = time.perf_counter() - start
+                            f.write(chunk)
+                            total_bytes += len(chunk)
+                            chunks += 1
+                            if chunk_consumer:
+                                chunk_consumer(chunk)
+                    headers = response.headers
+                os.replace(temp_path, output_path)
+            except Exception as e:
+                observe_rate_limit_error(self.rate_limiter, e)
+                raise
+            finally:
+                # Don't leave a truncated audio file behind, also when the task is cancelled
+                temp_path.unlink(missing_ok=True)
+            self.rate_limiter.record_success(headers)
             
-            return audio_bytes
+            return SpeechStreamStats(
+                output_path=output_path,
+                time_to_first_byte=first_byte if first_byte is not None else 0.0,
+                total_time=time.perf_counter() - start,
+                total_bytes=total_bytes,
+                chunks=chunks
+            )
+
+
+class PredictionFailedError(RuntimeError):
+    """A Replicate prediction finished without output ("failed" or "canceled")."""
+    
+    def __init__(self, prediction: Dict[str, Any]):
+        self.prediction_id = prediction.get("id")
+        self.status = prediction.get("status")
+        super().__init__(
+            f"Replicate prediction {self.prediction_id} {self.status}: "
+            f"{prediction.get('error') or 'no error message'}"
+        )
 
 
 class ReplicateClient:
-    """Replicate API client for image generation (alternative to DALL-E)."""
+    """
+    Replicate API client for image generation (alternative to DALL-E).
+    
+    Predictions are created and polled over the REST API with the shared aiohttp
+    session, so a running SDXL prediction costs no thread and no concurrency slot;
+    the "images" slot and the rate limiter only gate prediction submission.
+    """
+    
+    # Prediction states after which polling stops
+    TERMINAL_STATES = ("succeeded", "failed", "canceled")
     
     def __init__(self):
         api_token = os.getenv("REPLICATE_API_TOKEN")
         if not api_token:
             raise ValueError("REPLICATE_API_TOKEN not found in environment variables")
         
-        self.client = replicate.Client(api_token=api_token)
+        self.api_token = api_token
+        self.base_url = os.getenv("REPLICATE_BASE_URL", "https://api.replicate.com").rstrip("/")
         self.model = os.getenv(
             "REPLICATE_MODEL",
             "stability-ai/sdxl:39ed52f2a78e934b3ba6e2a89f5b1c712de7dfea535525255b1aa35c5565e08b"
         )
         
-        # Rate limiter: 20 requests per minute
-        self.rate_limiter = RateLimiter(
-            RateLimitConfig(max_requests=20, time_window=60.0)
-        )
+        # Status polling backoff: start fast, then back off to the max interval
+        self.poll_initial = float(os.getenv("REPLICATE_POLL_INITIAL_SECONDS", "1.0"))
+        self.poll_max = float(os.getenv("REPLICATE_POLL_MAX_SECONDS", "5.0"))
+        self.poll_multiplier = float(os.getenv("REPLICATE_POLL_BACKOFF", "1.5"))
+        self.prediction_timeout = float(os.getenv("REPLICATE_PREDICTION_TIMEOUT_SECONDS", "600"))
+        # Predictions submitted per image; a new one is only submitted after one fails
+        self.prediction_attempts = max(1, int(os.getenv("REPLICATE_PREDICTION_ATTEMPTS", "2")))
+        
+        # Process-wide limiter: 20 requests per minute by default
+        self.rate_limiter = get_rate_limiter("replicate")
+    
+    @property
+    def _headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.api_token}"}
     
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type(Exception)
+        retry=retry_if_exception(is_retryable_error)
     )
+    async def create_prediction(self, prompt: str, width: int = 1024, height: int = 1792) -> Dict[str, Any]:
+        """
+        Submit a prediction and return immediately with its id and status.
+        
+        Accepts REPLICATE_MODEL as "owner/name:version" or as "owner/name" for
+        the model's latest version.
+        """
+        payload: Dict[str, Any] = {
+            "input": {
+                "prompt": prompt,
+                "width": width,
+                "height": height
+            }
+        }
+        if ":" in self.model:
+            payload["version"] = self.model.split(":", 1)[1]
+            url = f"{self.base_url}/v1/predictions"
+        else:
+            url = f"{self.base_url}/v1/models/{self.model}/predictions"
+        
+        async with provider_slot("images"), self.rate_limiter:
+            session = get_http_pool().get_session()
+            try:
+                async with session.post(url, headers=self._headers, json=payload) as response:
+                    response.raise_for_status()
+                    prediction = await response.json()
+                    headers = response.headers
+            except Exception as e:
+                observe_rate_limit_error(self.rate_limiter, e)
+                raise
+            self.rate_limiter.record_success(headers)
+            return prediction
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception(is_retryable_error)
+    )
+    async def get_prediction(self, prediction_id: str) -> Dict[str, Any]:
+        """Fetch the current state of a prediction."""
+        session = get_http_pool().get_session()
+        async with session.get(
+            f"{self.base_url}/v1/predictions/{prediction_id}",
+            headers=self._headers
+        ) as response:
+            response.raise_for_status()
+            return await response.json()
+    
+    async def cancel_prediction(self, prediction_id: str) -> None:
+        """Cancel a running prediction so it stops consuming GPU time (best effort)."""
+        session = get_http_pool().get_session()
+        try:
+            async with session.post(
+                f"{self.base_url}/v1/predictions/{prediction_id}/cancel",
+                headers=self._headers
+            ) as response:
+                if response.status >= 400:
+                    print(f"Failed to cancel Replicate prediction {prediction_id}: HTTP {response.status}")
+        except Exception as e:
+            print(f"Failed to cancel Replicate prediction {prediction_id}: {e}")
+    
+    async def wait_for_prediction(self, prediction: Dict[str, Any]) -> Any:
+        """
+        Poll a prediction with exponential backoff until it finishes.
+        
+        The prediction is cancelled on Replicate's side if it times out or if the
+        waiting task is cancelled (e.g. because the workflow failed elsewhere).
+        
+        Returns:
+            The prediction output (a URL or list of URLs for image models)
+        """
+        prediction_id = prediction["id"]
+        deadline = time.monotonic() + self.prediction_timeout
+        interval = self.poll_initial
+        
+        try:
+            while prediction.get("status") not in self.TERMINAL_STATES:
+                if time.monotonic() > deadline:
+                    raise TimeoutError(
+                        f"Replicate prediction {prediction_id} did not finish "
+                        f"within {self.prediction_timeout:.0f}s"
+                    )
+                await asyncio.sleep(interval)
+                interval = min(self.poll_max, interval * self.poll_multiplier)
+                prediction = await self.get_prediction(prediction_id)
+        except BaseException:
+            await asyncio.shield(self.cancel_prediction(prediction_id))
+            raise
+        
+        if prediction["status"] != "succeeded":
+            raise PredictionFailedError(prediction)
+        return prediction.get("output")
+    
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=10),
+        retry=retry_if_exception(is_retryable_error)
+    )
+    async def download_output(self, url: str, output_path: Path) -> Path:
+        """Download a prediction output through the shared connection pool."""
+        return await get_http_pool().download_to_file(url, output_path)
+    
     async def generate_image(
         self,
         prompt: str,
         output_path: Optional[Path] = None,
         width: int = 1024,
-        height: int = 1792
+        height: int = 1792,
+        slot: Optional[asyncio.Semaphore] = None
     ) -> str:
-        """Generate image using Replicate."""
-        async with self.rate_limiter:
-            # Replicate runs synchronously, so we run it in executor
-            loop = asyncio.get_event_loop()
-            output = await loop.run_in_executor(
-                None,
-                lambda: self.client.run(
-                    self.model,
-                    input={
-                        "prompt": prompt,
-                        "width": width,
-                        "height": height
-                    }
-                )
-            )
-            
-            # Replicate returns a URL or list of URLs
-            image_url = output[0] if isinstance(output, list) else output
-            
-            if output_path:
-                # Download the image
-                import aiohttp
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(image_url) as response:
-                        image_data = await response.read()
-                        output_path.parent.mkdir(parents=True, exist_ok=True)
-                        with open(output_path, "wb") as f:
-                            f.write(image_data)
-            
-            return image_url
+        """
+        Generate image using Replicate.
+        
+        Creating, polling and downloading are each retried on their own against
+        the same prediction, so a dropped poll or download never pays for a second
+        generation. A new prediction is only submitted after one ends in "failed",
+        up to REPLICATE_PREDICTION_ATTEMPTS predictions.
+        
+        Args:
+            prompt: Image generation prompt
+            output_path: Where to download the image (not downloaded if None)
+            width: Image width
+            height: Image height
+            slot: Optional caller semaphore, held only while submitting the prediction
+                  and downloading the result, not while Replicate renders it
+        
+        Returns:
+            URL of the generated image
+        """
+        for attempt in range(1, self.prediction_attempts + 1):
+            async with slot or contextlib.nullcontext():
+                prediction = await self.create_prediction(prompt, width, height)
+            try:
+                output = await self.wait_for_prediction(prediction)
+                break
+            except PredictionFailedError as e:
+                if e.status != "failed" or attempt == self.prediction_attempts:
+                    raise
+                print(f"{e}; submitting a new prediction (attempt {attempt + 1}/{self.prediction_attempts})")
+        
+        # Replicate returns a URL or list of URLs
+        image_url = output[0] if isinstance(output, list) else output
+        if not image_url:
+            raise RuntimeError(f"Replicate prediction {prediction['id']} returned no output")
+        
+        if output_path:
+            async with slot or contextlib.nullcontext():
+                await self.download_output(str(image_url), output_path)
+        
+        return image_url
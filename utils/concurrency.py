@@ -0,0 +1,76 @@
+"""Process-wide concurrency budgets per provider / workload class."""
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+
+
+# Default number of in-flight operations allowed per provider across all workflows
+DEFAULT_PROVIDER_LIMITS = {
+    "openai_text": 8,
+    "images": 8,
+    "elevenlabs": 4,
+    "ffmpeg": os.cpu_count() or 2,
+}
+
+
+class ProviderBudget:
+    """
+    Semaphores that cap concurrent calls per provider across every running workflow.
+    
+    Limits are read from MAX_CONCURRENT_<PROVIDER> environment variables
+    (e.g. MAX_CONCURRENT_IMAGES=4). Semaphores are recreated when the event
+    loop changes, since asyncio primitives are bound to a single loop.
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, int]] = None):
+        self.limits = dict(DEFAULT_PROVIDER_LIMITS)
+        for provider in self.limits:
+            env_value = os.getenv(f"MAX_CONCURRENT_{provider.upper()}")
+            if env_value:
+                self.limits[provider] = int(env_value)
+        if limits:
+            self.limits.update(limits)
+        
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.in_flight: Dict[str, int] = {provider: 0 for provider in self.limits}
+    
+    def _get_semaphore(self, provider: str) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._semaphores = {}
+            self._loop = loop
+        
+        if provider not in self._semaphores:
+            if provider not in self.limits:
+                raise ValueError(f"Unknown provider budget: {provider}")
+            self._semaphores[provider] = asyncio.Semaphore(self.limits[provider])
+        return self._semaphores[provider]
+    
+    @asynccontextmanager
+    async def slot(self, provider: str):
+        """Hold one concurrency slot for the given provider."""
+        async with self._get_semaphore(provider):
+            self.in_flight[provider] = self.in_flight.get(provider, 0) + 1
+            try:
+                yield
+            finally:
+                self.in_flight[provider] -= 1
+
+
+_budget: Optional[ProviderBudget] = None
+
+
+def get_provider_budget() -> ProviderBudget:
+    """Get the process-wide provider concurrency budget."""
+    global _budget
+    if _budget is None:
+        _budget = ProviderBudget()
+    return _budget
+
+
+def provider_slot(provider: str):
+    """Shortcut for get_provider_budget().slot(provider)."""
+    return get_provider_budget().slot(provider)
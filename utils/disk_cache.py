@@ -0,0 +1,184 @@
+"""Size-bounded, content-addressed LRU cache on disk."""
+
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+class DiskCache:
+    """
+    Directory of cache entries keyed by a content hash, one file per entry.
+    
+    Entries are evicted least recently used first once the directory exceeds
+    max_bytes, and expire after ttl_seconds when a TTL is set. Each file's
+    mtime records when it was written (for the TTL) and its atime when it was
+    last used (for LRU ordering across restarts).
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_bytes: int,
+        suffix: str = "",
+        ttl_seconds: Optional[float] = None
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.ttl_seconds = ttl_seconds
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.Lock()
+        
+        # key -> (size, written_at), least recently used first
+        self._entries: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        existing = []
+        for entry in self.cache_dir.glob(f"*{suffix}"):
+            if entry.name.endswith(".tmp"):
+                continue
+            stat = entry.stat()
+            existing.append((stat.st_atime, entry, stat))
+        for _, entry, stat in sorted(existing, key=lambda item: item[0]):
+            key = entry.name[:len(entry.name) - len(suffix)] if suffix else entry.name
+            self._entries[key] = (stat.st_size, stat.st_mtime)
+        self._total_bytes = sum(size for size, _ in self._entries.values())
+    
+    def path_for(self, key: str) -> Path:
+        """Path where the entry for a key lives (whether or not it exists yet)."""
+        return self.cache_dir / f"{key}{self.suffix}"
+    
+    def temp_path_for(self, key: str) -> Path:
+        """Unique scratch path inside the cache directory for writing a new entry."""
+        return self.cache_dir / f"{key}.{os.getpid()}.{threading.get_ident()}.tmp"
+    
+    def get(self, key: str) -> Optional[Path]:
+        """Look up an entry, counting a hit or miss. Returns its path on a hit."""
+        path = self.path_for(key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not path.exists():
+                self._forget(key)
+                entry = None
+            elif entry is None and path.exists():
+                # Written by another process sharing this directory (e.g. a render worker)
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    pass
+                else:
+                    entry = (stat.st_size, stat.st_mtime)
+                    self._entries[key] = entry
+                    self._total_bytes += stat.st_size
+            
+            if entry is not None and self.ttl_seconds is not None:
+                if time.time() - entry[1] > self.ttl_seconds:
+                    self._remove(key)
+                    self.expirations += 1
+                    entry = None
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            self.hits += 1
+            self._entries.move_to_end(key)
+            try:
+                # Record the access time but keep mtime as the write time
+                os.utime(path, (time.time(), entry[1]))
+            except OSError:
+                pass
+            return path
+    
+    def contains(self, key: str) -> bool:
+        """Check for an entry without touching the hit/miss counters."""
+        with self._lock:
+            return key in self._entries and self.path_for(key).exists()
+    
+    def put_file(self, key: str, source_path: Path, move: bool = False, link: bool = False) -> Path:
+        """
+        Store a file under a key.
+        
+        Args:
+            key: Cache key
+            source_path: File to store
+            move: Move the file into the cache (e.g. a temp file written for this entry)
+            link: Hard-link instead of copying when possible
+        """
+        path = self.path_for(key)
+        if move:
+            os.replace(source_path, path)
+        else:
+            temp_path = self.temp_path_for(key)
+            try:
+                if link:
+                    try:
+                        os.link(source_path, temp_path)
+                    except OSError:
+                        shutil.copyfile(source_path, temp_path)
+                else:
+                    shutil.copyfile(source_path, temp_path)
+                os.replace(temp_path, path)
+            except BaseException:
+                temp_path.unlink(missing_ok=True)
+                raise
+        return self._record(key, path)
+    
+    def put_bytes(self, key: str, data: bytes) -> Path:
+        """Store raw bytes under a key (written atomically)."""
+        temp_path = self.temp_path_for(key)
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        return self.put_file(key, temp_path, move=True)
+    
+    def _record(self, key: str, path: Path) -> Path:
+        with self._lock:
+            stat = path.stat()
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous[0]
+            self._entries[key] = (stat.st_size, stat.st_mtime)
+            self._total_bytes += stat.st_size
+            self._evict()
+        return path
+    
+    def _forget(self, key: str) -> None:
+        size, _ = self._entries.pop(key)
+        self._total_bytes -= size
+    
+    def _remove(self, key: str) -> None:
+        self._forget(key)
+        try:
+            self.path_for(key).unlink()
+        except FileNotFoundError:
+            pass
+    
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits its byte budget."""
+        # Always keep the most recent entry, even if it alone exceeds the budget
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+    
+    def stats(self) -> Dict[str, float]:
+        """Get cache hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "total_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
@@ -0,0 +1,118 @@
+"""Dedicated, instrumented thread pools per blocking workload class."""
+
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+# Default thread count per workload class. Provider calls are native coroutines,
+# so only CPU-bound render jobs (ffmpeg/MoviePy, audio joins) and disk writes
+# of workflow state (fsync) need threads.
+DEFAULT_EXECUTOR_WORKERS = {
+    "render": os.cpu_count() or 2,
+    "state": 4,
+}
+
+
+class InstrumentedExecutor:
+    """
+    Thread pool for one workload class that records how long jobs queue for a thread.
+    
+    Giving each workload its own pool keeps a burst of renders from starving
+    unrelated blocking calls (and vice versa), which happens when everything
+    shares asyncio's small default executor.
+    """
+    
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=f"{name}-worker"
+        )
+        self._lock = threading.Lock()
+        
+        self.submitted = 0
+        self.started = 0
+        self.completed = 0
+        self.queue_wait_total = 0.0
+        self.queue_wait_max = 0.0
+        self.run_time_total = 0.0
+    
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking callable on this pool and await its result."""
+        return await asyncio.wrap_future(self.submit(fn, *args))
+    
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Queue a blocking callable without waiting for it (e.g. a background render)."""
+        submitted_at = time.monotonic()
+        with self._lock:
+            self.submitted += 1
+        
+        def _job():
+            started_at = time.monotonic()
+            queue_wait = started_at - submitted_at
+            with self._lock:
+                self.started += 1
+                self.queue_wait_total += queue_wait
+                self.queue_wait_max = max(self.queue_wait_max, queue_wait)
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.completed += 1
+                    self.run_time_total += time.monotonic() - started_at
+        
+        return self._executor.submit(_job)
+    
+    def stats(self) -> Dict[str, float]:
+        """Get queue depth, queue wait and run time counters."""
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "submitted": self.submitted,
+                "queued": self.submitted - self.started,
+                "running": self.started - self.completed,
+                "completed": self.completed,
+                "queue_wait_avg_seconds": (
+                    self.queue_wait_total / self.started if self.started else 0.0
+                ),
+                "queue_wait_max_seconds": self.queue_wait_max,
+                "run_time_total_seconds": self.run_time_total,
+            }
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool's threads."""
+        self._executor.shutdown(wait=wait)
+
+
+_executors: Dict[str, InstrumentedExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(workload: str) -> InstrumentedExecutor:
+    """
+    Get the process-wide executor for a workload class ("render" or "state").
+    
+    Sizes come from EXECUTOR_<WORKLOAD>_WORKERS environment variables
+    (e.g. EXECUTOR_RENDER_WORKERS=4).
+    """
+    with _executors_lock:
+        if workload not in _executors:
+            if workload not in DEFAULT_EXECUTOR_WORKERS:
+                raise ValueError(f"Unknown executor workload: {workload}")
+            max_workers = int(os.getenv(
+                f"EXECUTOR_{workload.upper()}_WORKERS",
+                str(DEFAULT_EXECUTOR_WORKERS[workload])
+            ))
+            _executors[workload] = InstrumentedExecutor(workload, max_workers)
+        return _executors[workload]
+
+
+def get_executor_metrics() -> Dict[str, Dict[str, float]]:
+    """Get queue wait statistics for every executor in use."""
+    with _executors_lock:
+        return {workload: executor.stats() for workload, executor in _executors.items()}
@@ -0,0 +1,105 @@
+"""Shared, pooled HTTP session for downloading generated media."""
+
+import os
+import asyncio
+from pathlib import Path
+from typing import Optional
+
+import aiohttp
+
+
+class HTTPSessionPool:
+    """
+    Process-wide aiohttp session with a bounded, keep-alive connection pool.
+    
+    aiohttp sessions are bound to the event loop they were created on, so a new
+    session is opened transparently when called from a different loop (e.g. each
+    asyncio.run() in the Streamlit app). Call close() when the loop is done.
+    """
+    
+    def __init__(self):
+        self.limit = int(os.getenv("HTTP_POOL_LIMIT", "32"))
+        self.limit_per_host = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "8"))
+        self.keepalive_timeout = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+        self.total_timeout = float(os.getenv("HTTP_TIMEOUT_SECONDS", "120"))
+        self.connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "15"))
+        
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    def get_session(self) -> aiohttp.ClientSession:
+        """Get the shared session for the running event loop, creating it if needed."""
+        loop = asyncio.get_running_loop()
+        
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.total_timeout,
+                    sock_connect=self.connect_timeout
+                )
+            )
+            self._loop = loop
+        
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the shared session and its connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+    
+    async def download_to_file(
+        self,
+        url: str,
+        output_path: Path,
+        chunk_size: int = 64 * 1024
+    ) -> Path:
+        """
+        Stream a URL to disk in chunks instead of reading the whole body into memory.
+        
+        The body is written to a temporary file and renamed into place once complete,
+        so a failed download never leaves a truncated file at output_path.
+        """
+        session = self.get_session()
+        
+        async with session.get(url) as response:
+            if response.status != 200:
+                raise Exception(f"Failed to download {url}: HTTP {response.status}")
+            
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = output_path.with_name(output_path.name + ".part")
+            try:
+                with open(temp_path, "wb") as f:
+                    async for chunk in response.content.iter_chunked(chunk_size):
+                        f.write(chunk)
+                os.replace(temp_path, output_path)
+            except BaseException:
+                temp_path.unlink(missing_ok=True)
+                raise
+        
+        return output_path
+
+
+_pool: Optional[HTTPSessionPool] = None
+
+
+def get_http_pool() -> HTTPSessionPool:
+    """Get the process-wide HTTP session pool."""
+    global _pool
+    if _pool is None:
+        _pool = HTTPSessionPool()
+    return _pool
+
+
+async def close_http_pool() -> None:
+    """Close the process-wide HTTP session pool, if one was opened."""
+    if _pool is not None:
+        await _pool.close()
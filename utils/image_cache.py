@@ -0,0 +1,77 @@
+"""Content-addressed cache of images pre-scaled to the reel resolution."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .disk_cache import DiskCache
+
+
+def hash_file(path: Path) -> str:
+    """Compute the SHA-256 digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ScaledImageCache:
+    """
+    Disk cache of decoded images already resized to the video resolution.
+    
+    Entries are lossless PNGs keyed by the SHA-256 of the source file plus the
+    target size, so each generated still is resized exactly once no matter how
+    many times the reel is re-rendered. The cache is bounded by total bytes and
+    evicts the least recently used entries first.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: Optional[int] = None
+    ):
+        cache_dir = Path(cache_dir or os.getenv("FRAME_CACHE_DIR", "./cache/frames"))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("FRAME_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+        self.store = DiskCache(cache_dir, max_bytes, suffix=".png")
+    
+    def get_scaled(self, source_path: Path, width: int, height: int) -> Path:
+        """
+        Get a copy of the image scaled to width x height, creating it on a miss.
+        
+        Args:
+            source_path: Path to the original image
+            width: Target width in pixels
+            height: Target height in pixels
+        
+        Returns:
+            Path to the cached, pre-scaled PNG
+        """
+        key = f"{hash_file(source_path)}_{width}x{height}"
+        
+        cached_path = self.store.get(key)
+        if cached_path is not None:
+            return cached_path
+        
+        from PIL import Image
+        
+        with Image.open(source_path) as image:
+            scaled = image.convert("RGB")
+            if scaled.size != (width, height):
+                scaled = scaled.resize((width, height), Image.LANCZOS)
+            
+            # Write to a temp file first so concurrent renders never see a partial PNG
+            temp_path = self.store.temp_path_for(key)
+            scaled.save(temp_path, format="PNG", compress_level=1)
+        
+        return self.store.put_file(key, temp_path, move=True)
+    
+    def get_scaled_paths(self, source_paths: List[Path], width: int, height: int) -> List[Path]:
+        """Pre-scale a list of images, preserving order."""
+        return [self.get_scaled(Path(p), width, height) for p in source_paths]
+    
+    def stats(self) -> Dict[str, float]:
+        """Get cache hit/miss counters and current size."""
+        return self.store.stats()
@@ -0,0 +1,147 @@
+"""Persistent store of generated images keyed by the request that produced them."""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from .disk_cache import DiskCache
+
+
+# Approximate list price per generated image, used for the savings report
+DEFAULT_IMAGE_COSTS_USD = {
+    ("openai", "hd"): 0.12,
+    ("openai", "standard"): 0.08,
+    ("replicate", None): 0.005,
+}
+
+
+class GeneratedImageStore:
+    """
+    Cache of provider-generated images keyed by (provider, model, size, quality, prompt).
+    
+    Identical prompts rendered for an earlier workflow (e.g. a retry after a video
+    assembly failure) are hard-linked or copied into the new output directory
+    instead of paying for another generation. Evicts least recently used images
+    once the store exceeds its byte budget, and reports money and time saved.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: Optional[int] = None
+    ):
+        cache_dir = Path(cache_dir or os.getenv("IMAGE_CACHE_DIR", "./cache/images"))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("IMAGE_CACHE_MAX_MB", "2048")) * 1024 * 1024)
+        self.store = DiskCache(cache_dir, max_bytes, suffix=".png")
+        self.cost_override = os.getenv("IMAGE_COST_USD")
+        
+        self.dollars_saved = 0.0
+        self.seconds_saved = 0.0
+        self._lock = threading.Lock()
+        self._prune_metadata()
+    
+    def _metadata_path(self, key: str) -> Path:
+        return self.store.cache_dir / f"{key}.meta.json"
+    
+    def _prune_metadata(self) -> None:
+        """Drop metadata sidecars whose image has been evicted."""
+        for meta_path in self.store.cache_dir.glob("*.meta.json"):
+            key = meta_path.name[:-len(".meta.json")]
+            if not self.store.path_for(key).exists():
+                meta_path.unlink(missing_ok=True)
+    
+    @staticmethod
+    def make_key(
+        provider: str,
+        model: str,
+        size: str,
+        quality: Optional[str],
+        prompt: str
+    ) -> str:
+        """Hash the request parameters that determine the generated image."""
+        payload = json.dumps([provider, model, size, quality or "", prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _image_cost(self, provider: str, quality: Optional[str]) -> float:
+        if self.cost_override:
+            return float(self.cost_override)
+        return DEFAULT_IMAGE_COSTS_USD.get(
+            (provider, quality),
+            DEFAULT_IMAGE_COSTS_USD.get((provider, None), 0.0)
+        )
+    
+    def fetch(self, key: str, output_path: Path) -> bool:
+        """
+        Place a cached image at output_path if one exists for the key.
+        
+        Returns:
+            True on a hit, False if the image still has to be generated
+        """
+        cached_path = self.store.get(key)
+        if cached_path is None:
+            return False
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name(output_path.name + ".part")
+        try:
+            os.link(cached_path, temp_path)
+        except OSError:
+            shutil.copyfile(cached_path, temp_path)
+        os.replace(temp_path, output_path)
+        
+        metadata = {}
+        try:
+            with open(self._metadata_path(key), "r") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            pass
+        
+        with self._lock:
+            self.seconds_saved += metadata.get("generation_seconds", 0.0)
+            self.dollars_saved += self._image_cost(
+                metadata.get("provider", ""), metadata.get("quality")
+            )
+        return True
+    
+    def add(
+        self,
+        key: str,
+        image_path: Path,
+        provider: str,
+        quality: Optional[str],
+        generation_seconds: float
+    ) -> None:
+        """Store a freshly generated image along with what it cost to produce."""
+        with open(self._metadata_path(key), "w") as f:
+            json.dump({
+                "provider": provider,
+                "quality": quality,
+                "generation_seconds": generation_seconds,
+            }, f)
+        self.store.put_file(key, image_path, link=True)
+    
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and estimated dollars/seconds saved."""
+        stats = self.store.stats()
+        with self._lock:
+            stats["dollars_saved"] = round(self.dollars_saved, 4)
+            stats["seconds_saved"] = round(self.seconds_saved, 2)
+        return stats
+
+
+_store: Optional[GeneratedImageStore] = None
+
+
+def get_image_store() -> Optional[GeneratedImageStore]:
+    """Get the process-wide generated image store, or None if IMAGE_CACHE_ENABLED=false."""
+    global _store
+    if os.getenv("IMAGE_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    if _store is None:
+        _store = GeneratedImageStore()
+    return _store
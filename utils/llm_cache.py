@@ -0,0 +1,81 @@
+"""Opt-in on-disk cache for deterministic LLM text generations."""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from .disk_cache import DiskCache
+
+
+class LLMResponseCache:
+    """
+    Caches chat completion text keyed by (model, system prompt, user prompt,
+    temperature, max_tokens).
+    
+    Re-running a workflow with the same inputs (retries, resumed runs, A/B tests)
+    then returns the earlier response instead of paying LLM latency and cost again.
+    Entries expire after a TTL and the directory is bounded by total bytes.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None
+    ):
+        cache_dir = Path(cache_dir or os.getenv("LLM_CACHE_DIR", "./cache/llm"))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("LLM_CACHE_MAX_MB", "50")) * 1024 * 1024)
+        if ttl_seconds is None:
+            ttl_seconds = float(os.getenv("LLM_CACHE_TTL_HOURS", "168")) * 3600
+        self.store = DiskCache(cache_dir, max_bytes, suffix=".json", ttl_seconds=ttl_seconds)
+    
+    @staticmethod
+    def make_key(
+        model: str,
+        system_prompt: Optional[str],
+        prompt: str,
+        temperature: float,
+        max_tokens: int
+    ) -> str:
+        """Hash the request parameters that determine the response."""
+        payload = json.dumps(
+            [model, system_prompt or "", prompt, temperature, max_tokens],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response, or None on a miss or expired entry."""
+        path = self.store.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, "r") as f:
+                return json.load(f)["response"]
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def put(self, key: str, model: str, response: str) -> None:
+        """Store a response."""
+        data = json.dumps({"model": model, "response": response}, ensure_ascii=False)
+        self.store.put_bytes(key, data.encode("utf-8"))
+    
+    def stats(self) -> Dict[str, float]:
+        """Get cache hit rate and size."""
+        return self.store.stats()
+
+
+_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Get the process-wide LLM cache, or None unless LLM_CACHE_ENABLED=true."""
+    global _cache
+    if os.getenv("LLM_CACHE_ENABLED", "false").lower() != "true":
+        return None
+    if _cache is None:
+        _cache = LLMResponseCache()
+    return _cache
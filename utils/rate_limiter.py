@@ -1,9 +1,11 @@
 """Rate limiting utilities for API calls."""
 
+import os
+import re
 import asyncio
+import threading
 import time
-from typing import Optional
-from collections import deque
+from typing import Dict, Optional, Mapping, Any
 from dataclasses import dataclass
 
 
@@ -14,37 +16,150 @@ class RateLimitConfig:
     time_window: float  # in seconds
     retry_delay: float = 2.0
     max_retries: int = 3
+    burst: Optional[int] = None  # bucket capacity, defaults to max_requests
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of sleeping under a lock.
+    
+    Each acquire() takes its tokens immediately, letting the balance go negative,
+    and then sleeps for however long it takes the bucket to refill that debt.
+    Waiters are therefore served in strict FIFO order, and the lock is only held
+    for the arithmetic, never across a sleep.
+    """
+    
+    # AIMD tuning: add 5% of the configured rate per success, halve on throttling
+    INCREASE_FRACTION = 0.05
+    DECREASE_FACTOR = 0.5
+    MIN_RATE_FRACTION = 0.05
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate  # tokens per second
+        self.max_rate = rate
+        self.min_rate = rate * self.MIN_RATE_FRACTION
+        self.capacity = capacity
+        self.tokens = capacity
+        self.last_refill = time.monotonic()
+        self.not_before = 0.0  # monotonic deadline set by pause()
+        # A threading lock keeps the bucket usable from any event loop or thread
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+    
+    def reserve(self, amount: float = 1) -> float:
+        """Reserve tokens and return how many seconds to wait before using them."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= amount
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.not_before - now)
+    
+    def increase(self) -> None:
+        """Additive increase of the refill rate, up to the configured rate."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = min(self.max_rate, self.rate + self.max_rate * self.INCREASE_FRACTION)
+    
+    def decrease(self) -> None:
+        """Multiplicative decrease of the refill rate."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate * self.DECREASE_FACTOR)
+    
+    def pause(self, seconds: float) -> None:
+        """
+        Hold every reservation until this many seconds from now (e.g. for Retry-After).
+        
+        Kept as a deadline rather than a token debt, so the wait doesn't stretch
+        when the rate is lowered at the same time.
+        """
+        with self._lock:
+            self.not_before = max(self.not_before, time.monotonic() + seconds)
+    
+    @property
+    def available(self) -> float:
+        """Tokens currently available (negative when waiters are queued)."""
+        with self._lock:
+            self._refill(time.monotonic())
+            return self.tokens
 
 
 class RateLimiter:
-    """Thread-safe rate limiter for API calls."""
+    """Token-bucket rate limiter for API calls, usable as an async context manager."""
+    
+    # Back off when fewer than this fraction of a bucket's capacity remains provider-side
+    LOW_WATERMARK = 0.1
     
-    def __init__(self, config: RateLimitConfig):
+    def __init__(self, config: RateLimitConfig, buckets: Optional[Dict[str, TokenBucket]] = None):
         self.config = config
-        self.request_times: deque = deque()
-        self.lock = asyncio.Lock()
-    
-    async def acquire(self) -> None:
-        """Acquire permission to make a request, waiting if necessary."""
-        async with self.lock:
-            now = time.time()
-            
-            # Remove old requests outside the time window
-            while self.request_times and self.request_times[0] < now - self.config.time_window:
-                self.request_times.popleft()
-            
-            # Wait if we've exceeded the rate limit
-            if len(self.request_times) >= self.config.max_requests:
-                sleep_time = self.request_times[0] + self.config.time_window - now
-                if sleep_time > 0:
-                    await asyncio.sleep(sleep_time)
-                    # Clean up again after sleeping
-                    now = time.time()
-                    while self.request_times and self.request_times[0] < now - self.config.time_window:
-                        self.request_times.popleft()
-            
-            # Record this request
-            self.request_times.append(time.time())
+        self.throttled = 0
+        rate = config.max_requests / config.time_window
+        self.buckets: Dict[str, TokenBucket] = {
+            "requests": TokenBucket(rate, config.burst or config.max_requests)
+        }
+        if buckets:
+            self.buckets.update(buckets)
+    
+    async def acquire(self, requests: int = 1, **amounts: float) -> None:
+        """
+        Acquire permission to make a request, waiting if necessary.
+        
+        Args:
+            requests: Number of requests to reserve
+            **amounts: Additional bucket reservations, e.g. tokens=1500 or characters=800.
+                      Buckets not configured for this limiter are ignored.
+        """
+        wait = self.buckets["requests"].reserve(requests)
+        for name, amount in amounts.items():
+            bucket = self.buckets.get(name)
+            if bucket is not None and amount:
+                wait = max(wait, bucket.reserve(amount))
+        
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    def record_success(self, headers: Optional[Mapping[str, Any]] = None) -> None:
+        """
+        Adapt to a successful response.
+        
+        Rates creep back up towards the configured quota, unless the provider's
+        x-ratelimit-remaining-* headers say a bucket is nearly exhausted, in which
+        case that bucket backs off before the provider starts returning 429s.
+        """
+        remaining = parse_remaining_headers(headers) if headers else {}
+        for name, bucket in self.buckets.items():
+            left = remaining.get(name)
+            if left is not None and left < bucket.capacity * self.LOW_WATERMARK:
+                bucket.decrease()
+            else:
+                bucket.increase()
+    
+    def record_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Back off after a 429: halve every bucket's rate and honour Retry-After."""
+        self.throttled += 1
+        for bucket in self.buckets.values():
+            bucket.decrease()
+        if retry_after:
+            self.buckets["requests"].pause(retry_after)
+    
+    @property
+    def effective_rate_per_minute(self) -> Dict[str, float]:
+        """Current refill rate of each bucket, per minute."""
+        return {name: bucket.rate * 60.0 for name, bucket in self.buckets.items()}
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get configured vs. effective rates and throttle count."""
+        return {
+            "effective_per_minute": self.effective_rate_per_minute,
+            "configured_per_minute": {
+                name: bucket.max_rate * 60.0 for name, bucket in self.buckets.items()
+            },
+            "throttled": self.throttled,
+        }
     
     async def __aenter__(self):
         await self.acquire()
@@ -52,3 +167,110 @@ class RateLimiter:
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         pass
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_duration(value: str) -> Optional[float]:
+    """Parse a provider duration like "20ms", "1.5s", "6m0s" or a bare number of seconds."""
+    value = value.strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    
+    units = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * units[unit] for number, unit in parts)
+
+
+def parse_remaining_headers(headers: Mapping[str, Any]) -> Dict[str, float]:
+    """Read x-ratelimit-remaining-{requests,tokens} headers into bucket names."""
+    remaining = {}
+    for name in ("requests", "tokens"):
+        value = headers.get(f"x-ratelimit-remaining-{name}")
+        if value is not None:
+            try:
+                remaining[name] = float(value)
+            except (TypeError, ValueError):
+                pass
+    return remaining
+
+
+def parse_retry_after(headers: Optional[Mapping[str, Any]]) -> Optional[float]:
+    """Read retry-after-ms / retry-after headers as seconds."""
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        duration = parse_duration(str(retry_after_ms))
+        if duration is not None:
+            return duration / 1000.0
+    retry_after = headers.get("retry-after")
+    if retry_after is not None:
+        return parse_duration(str(retry_after))
+    return None
+
+
+def _per_minute_bucket(env_name: str, default: float) -> Optional[TokenBucket]:
+    """Create a per-minute bucket from an environment variable (0 disables it)."""
+    per_minute = float(os.getenv(env_name, str(default)))
+    if per_minute <= 0:
+        return None
+    return TokenBucket(per_minute / 60.0, per_minute)
+
+
+def _build_limiter(provider: str) -> RateLimiter:
+    """Build the limiter for a provider from environment configuration."""
+    if provider == "openai":
+        requests_per_minute = int(os.getenv(
+            "OPENAI_REQUESTS_PER_MINUTE",
+            os.getenv("RATE_LIMIT_REQUESTS_PER_MINUTE", "60")
+        ))
+        extra = {"tokens": _per_minute_bucket("OPENAI_TOKENS_PER_MINUTE", 90000)}
+    elif provider == "openai_images":
+        requests_per_minute = int(os.getenv("OPENAI_IMAGES_PER_MINUTE", "20"))
+        extra = {}
+    elif provider == "elevenlabs":
+        requests_per_minute = int(os.getenv("ELEVENLABS_REQUESTS_PER_MINUTE", "30"))
+        extra = {"characters": _per_minute_bucket("ELEVENLABS_CHARACTERS_PER_MINUTE", 0)}
+    elif provider == "replicate":
+        requests_per_minute = int(os.getenv("REPLICATE_REQUESTS_PER_MINUTE", "20"))
+        extra = {}
+    else:
+        raise ValueError(f"Unknown rate limit provider: {provider}")
+    
+    burst = os.getenv(f"{provider.upper()}_BURST")
+    config = RateLimitConfig(
+        max_requests=requests_per_minute,
+        time_window=60.0,
+        burst=int(burst) if burst else None
+    )
+    return RateLimiter(config, {name: bucket for name, bucket in extra.items() if bucket})
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> RateLimiter:
+    """
+    Get the process-wide rate limiter for a provider.
+    
+    Every client instance for the same provider shares one limiter, so the
+    configured quota applies to the whole process rather than per agent.
+    Providers: openai, openai_images, elevenlabs, replicate.
+    """
+    with _limiters_lock:
+        if provider not in _limiters:
+            _limiters[provider] = _build_limiter(provider)
+        return _limiters[provider]
+
+
+def get_rate_limit_metrics() -> Dict[str, Dict[str, Any]]:
+    """Get effective rate and throttle statistics for every provider limiter in use."""
+    with _limiters_lock:
+        return {provider: limiter.stats() for provider, limiter in _limiters.items()}
@@ -0,0 +1,197 @@
+"""Process pool for rendering reels in parallel across CPU cores."""
+
+import os
+import time
+import atexit
+import asyncio
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+# One VideoProcessor per worker process, created on its first job
+_worker_processor = None
+
+
+def _render_job(
+    image_paths: List[str],
+    audio_path: str,
+    output_path: str,
+    image_durations: Optional[List[float]],
+    render_engine: Optional[str],
+    render_profile: Optional[str] = None
+) -> Tuple[str, float, float]:
+    """
+    Render one reel inside a worker process.
+    
+    Returns:
+        Tuple of (video path, job start timestamp, encode seconds)
+    """
+    global _worker_processor
+    started_at = time.time()
+    
+    if _worker_processor is None:
+        from utils.video_utils import VideoProcessor
+        _worker_processor = VideoProcessor()
+    
+    start = time.perf_counter()
+    video_path = _worker_processor.create_reel(
+        image_paths=[Path(p) for p in image_paths],
+        audio_path=Path(audio_path),
+        output_path=Path(output_path),
+        image_durations=image_durations,
+        render_engine=render_engine,
+        render_profile=render_profile
+    )
+    return str(video_path), started_at, time.perf_counter() - start
+
+
+def default_worker_count() -> int:
+    """Default pool size: CPU cores divided by the threads each ffmpeg encode uses."""
+    ffmpeg_threads = int(os.getenv("FFMPEG_THREADS", "2")) or 1
+    return max(1, (os.cpu_count() or 1) // ffmpeg_threads)
+
+
+class RenderWorkerPool:
+    """
+    Dedicated process pool for video rendering.
+    
+    MoviePy's frame compositing holds the GIL, so renders in the default thread
+    pool serialize on one core. Jobs here are plain file paths, run in separate
+    processes, and report queue wait and encode time.
+    """
+    
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or default_worker_count()
+        # Spawn avoids forking a process that already has event-loop and executor threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+        self.encode_times: deque = deque(maxlen=100)
+        self.queue_wait_times: deque = deque(maxlen=100)
+    
+    @property
+    def in_flight(self) -> int:
+        """Jobs submitted and not yet finished."""
+        return self.submitted - self.completed - self.failed
+    
+    @property
+    def queue_depth(self) -> int:
+        """Jobs waiting for a free worker."""
+        return max(0, self.in_flight - self.max_workers)
+    
+    def submit(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        image_durations: Optional[List[float]] = None,
+        render_engine: Optional[str] = None,
+        render_profile: Optional[str] = None
+    ) -> Future:
+        """
+        Queue a render job without waiting for it.
+        
+        Returns:
+            Future resolving to (video path, job start timestamp, encode seconds)
+        """
+        submitted_at = time.time()
+        self.submitted += 1
+        
+        future = self._executor.submit(
+            _render_job,
+            [str(p) for p in image_paths],
+            str(audio_path),
+            str(output_path),
+            image_durations,
+            render_engine,
+            render_profile
+        )
+        future.add_done_callback(lambda f: self._record(f, submitted_at))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        return future
+    
+    def _record(self, future: Future, submitted_at: float) -> None:
+        """Update counters and timings when a job finishes."""
+        if future.cancelled() or future.exception() is not None:
+            self.failed += 1
+            return
+        
+        video_path, started_at, encode_seconds = future.result()
+        self.completed += 1
+        self.encode_times.append(encode_seconds)
+        self.queue_wait_times.append(max(0.0, started_at - submitted_at))
+        print(
+            f"Rendered {Path(video_path).name} in {encode_seconds:.1f}s "
+            f"(queued {self.queue_wait_times[-1]:.1f}s, {self.queue_depth} waiting)"
+        )
+    
+    async def render(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        image_durations: Optional[List[float]] = None,
+        render_engine: Optional[str] = None,
+        render_profile: Optional[str] = None
+    ) -> Path:
+        """Submit a render job and wait for the finished video path."""
+        future = self.submit(
+            image_paths, audio_path, output_path, image_durations, render_engine, render_profile
+        )
+        video_path, _, _ = await asyncio.wrap_future(future)
+        return Path(video_path)
+    
+    def stats(self) -> Dict[str, float]:
+        """Get queue depth and per-job timing statistics."""
+        encode_times = list(self.encode_times)
+        wait_times = list(self.queue_wait_times)
+        return {
+            "workers": self.max_workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "avg_encode_seconds": sum(encode_times) / len(encode_times) if encode_times else 0.0,
+            "last_encode_seconds": encode_times[-1] if encode_times else 0.0,
+            "avg_queue_wait_seconds": sum(wait_times) / len(wait_times) if wait_times else 0.0,
+        }
+    
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: Optional[RenderWorkerPool] = None
+
+
+def get_render_pool() -> Optional[RenderWorkerPool]:
+    """
+    Get the process-wide render pool.
+    
+    Returns None when RENDER_WORKERS=0, meaning renders stay in the thread executor.
+    """
+    global _pool
+    workers = os.getenv("RENDER_WORKERS", "auto").lower()
+    if workers == "0":
+        return None
+    
+    if _pool is None:
+        _pool = RenderWorkerPool(None if workers == "auto" else int(workers))
+        atexit.register(_pool.shutdown)
+    return _pool
+
+
+def get_render_pool_metrics() -> Optional[Dict[str, float]]:
+    """Get the render pool's queue and timing statistics, or None if no pool was started."""
+    return _pool.stats() if _pool is not None else None
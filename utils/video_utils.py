@@ -1,8 +1,15 @@
-"""Video processing utilities using MoviePy."""
+"""Video processing utilities using MoviePy and FFmpeg."""
 
 import os
+import copy
+import hashlib
+import subprocess
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Dict, Any
+
+from .disk_cache import DiskCache
+from .image_cache import ScaledImageCache, hash_file
 
 # MoviePy imports - supports both v1.x and v2.x
 try:
@@ -85,10 +92,233 @@ def _check_ffmpeg_available():
                 return False
 
 
+def _get_ffmpeg_binary() -> str:
+    """Get the FFmpeg executable MoviePy is configured to use."""
+    try:
+        from moviepy.config import FFMPEG_BINARY
+        if FFMPEG_BINARY:
+            return FFMPEG_BINARY
+    except ImportError:
+        pass
+    
+    try:
+        # MoviePy v1.x exposes settings through get_setting
+        from moviepy.config import get_setting
+        return get_setting("FFMPEG_BINARY")
+    except (ImportError, KeyError):
+        return "ffmpeg"
+
+
+def probe_media(path: Path) -> Dict[str, Any]:
+    """
+    Read basic stream information (duration, size, fps, audio) from a media file.
+    
+    Uses MoviePy's FFmpeg header parser so no separate ffprobe binary is needed.
+    """
+    from moviepy.video.io.ffmpeg_reader import ffmpeg_parse_infos
+    
+    infos = ffmpeg_parse_infos(str(path))
+    return {
+        "duration": infos.get("duration"),
+        "video_size": infos.get("video_size"),
+        "video_fps": infos.get("video_fps"),
+        "audio_found": infos.get("audio_found", False),
+    }
+
+
+def compare_renders(
+    reference_path: Path,
+    candidate_path: Path,
+    duration_tolerance: float = 0.1,
+    frame_samples: int = 5,
+    max_mean_pixel_diff: float = 6.0,
+    max_line_pixel_diff: float = 24.0
+) -> List[str]:
+    """
+    Compare two rendered reels for output parity.
+    
+    Besides stream properties, decodes frames at evenly spaced timestamps and
+    compares pixels, so differences in scaling, padding or image order show up.
+    
+    Args:
+        reference_path: Video produced by the reference engine (MoviePy)
+        candidate_path: Video produced by the engine under test
+        duration_tolerance: Allowed duration difference in seconds
+        frame_samples: Number of frames to compare (0 skips the pixel check)
+        max_mean_pixel_diff: Allowed mean absolute difference per channel (0-255);
+                            covers encoder noise between presets
+        max_line_pixel_diff: Allowed mean difference along any single row or column,
+                            which catches thin bands such as letterbox bars
+    
+    Returns:
+        List of mismatch descriptions (empty when the outputs match)
+    """
+    reference = probe_media(reference_path)
+    candidate = probe_media(candidate_path)
+    mismatches = []
+    
+    if abs((reference["duration"] or 0) - (candidate["duration"] or 0)) > duration_tolerance:
+        mismatches.append(
+            f"duration: {reference['duration']:.2f}s vs {candidate['duration']:.2f}s"
+        )
+    if list(reference["video_size"] or []) != list(candidate["video_size"] or []):
+        mismatches.append(f"resolution: {reference['video_size']} vs {candidate['video_size']}")
+    if round(reference["video_fps"] or 0) != round(candidate["video_fps"] or 0):
+        mismatches.append(f"fps: {reference['video_fps']} vs {candidate['video_fps']}")
+    if reference["audio_found"] != candidate["audio_found"]:
+        mismatches.append(
+            f"audio stream: {reference['audio_found']} vs {candidate['audio_found']}"
+        )
+    
+    if frame_samples > 0 and not mismatches:
+        mismatches += _compare_frames(
+            reference_path,
+            candidate_path,
+            min(reference["duration"], candidate["duration"]),
+            frame_samples,
+            max_mean_pixel_diff,
+            max_line_pixel_diff
+        )
+    
+    return mismatches
+
+
+def _compare_frames(
+    reference_path: Path,
+    candidate_path: Path,
+    duration: float,
+    frame_samples: int,
+    max_mean_pixel_diff: float,
+    max_line_pixel_diff: float
+) -> List[str]:
+    """
+    Compare decoded frames of two same-sized videos at evenly spaced timestamps.
+    
+    A sample can land on a cut between images, where engines may switch one frame
+    apart, so each candidate frame is matched against the reference frames one
+    frame before, at and after its timestamp and the closest one is judged.
+    """
+    import numpy as np
+    from moviepy.video.io.ffmpeg_reader import FFMPEG_VideoReader
+    
+    timestamps = [duration * (i + 0.5) / frame_samples for i in range(frame_samples)]
+    mismatches = []
+    
+    reference = FFMPEG_VideoReader(str(reference_path))
+    candidate = FFMPEG_VideoReader(str(candidate_path))
+    try:
+        frame_time = 1.0 / reference.fps
+        for t in timestamps:
+            candidate_frame = candidate.get_frame(t).astype(np.int16)
+            
+            best = None
+            for offset in (-frame_time, 0.0, frame_time):
+                reference_frame = reference.get_frame(
+                    min(max(t + offset, 0.0), duration - frame_time)
+                ).astype(np.int16)
+                diff = np.abs(reference_frame - candidate_frame).mean(axis=2)
+                mean_diff = float(diff.mean())
+                line_diff = float(max(diff.mean(axis=0).max(), diff.mean(axis=1).max()))
+                if best is None or (line_diff, mean_diff) < best:
+                    best = (line_diff, mean_diff)
+            
+            line_diff, mean_diff = best
+            if mean_diff > max_mean_pixel_diff or line_diff > max_line_pixel_diff:
+                mismatches.append(
+                    f"frame at {t:.2f}s: mean pixel difference {mean_diff:.1f} "
+                    f"(max {max_mean_pixel_diff:.1f}), worst row/column {line_diff:.1f} "
+                    f"(max {max_line_pixel_diff:.1f})"
+                )
+    finally:
+        reference.close()
+        candidate.close()
+    
+    return mismatches
+
+
+def concat_audio(segment_paths: List[Path], output_path: Path, bitrate: str = "192k") -> Path:
+    """
+    Join audio files back to back into a single MP3.
+    
+    Segments are decoded and joined with the concat filter rather than
+    stream-copied, so per-file encoder padding doesn't add gaps between them.
+    The result is written to a .part file and moved into place, since output_path
+    may be a hard link into the voice cache that must never be truncated in place.
+    
+    Args:
+        segment_paths: Audio files in playback order
+        output_path: Path where the joined MP3 will be written
+        bitrate: Audio bitrate of the joined file
+    
+    Returns:
+        Path to the joined audio file
+    """
+    if not segment_paths:
+        raise ValueError("Cannot join audio: segment_paths list is empty")
+    
+    temp_path = output_path.with_name(output_path.name + ".part")
+    command = [_get_ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error"]
+    for segment_path in segment_paths:
+        command += ["-i", str(segment_path)]
+    inputs = "".join(f"[{i}:a]" for i in range(len(segment_paths)))
+    command += [
+        "-filter_complex", f"{inputs}concat=n={len(segment_paths)}:v=0:a=1[outa]",
+        "-map", "[outa]",
+        "-c:a", "libmp3lame",
+        "-b:a", bitrate,
+        "-f", "mp3",
+        str(temp_path),
+    ]
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"FFmpeg audio concat failed (exit code {result.returncode}): "
+                f"{result.stderr.strip()[-2000:]}"
+            )
+        os.replace(temp_path, output_path)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    
+    return output_path
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """H.264 speed/quality settings for one kind of render."""
+    name: str
+    preset: str  # x264 speed preset
+    crf: int  # constant rate factor (lower is better quality, larger files)
+    tune: Optional[str] = "stillimage"  # slideshows of stills compress best with stillimage
+    gop_seconds: float = 2.0  # keyframe interval
+    threads: Optional[int] = None  # encoder threads, defaults to FFMPEG_THREADS
+
+
+# Named render profiles, fastest first
+RENDER_PROFILES = {
+    "draft": RenderProfile("draft", preset="ultrafast", crf=30, gop_seconds=10.0),
+    "preview": RenderProfile("preview", preset="veryfast", crf=26, gop_seconds=5.0),
+    "publish": RenderProfile("publish", preset="medium", crf=20, gop_seconds=2.0),
+}
+
+
+# Available render engines for VideoProcessor.create_reel
+# ("segments" encodes one cached H.264 chunk per image and stream-copies them together)
+RENDER_ENGINES = ("moviepy", "ffmpeg", "segments")
+
+
 class VideoProcessor:
     """Video processing utilities for creating Instagram Reels."""
     
-    def __init__(self):
+    def __init__(
+        self,
+        render_engine: Optional[str] = None,
+        image_cache: Optional[ScaledImageCache] = None,
+        render_profile: Optional[str] = None
+    ):
         # Check if FFmpeg is available
         if not _check_ffmpeg_available():
             raise RuntimeError(
@@ -103,13 +333,80 @@ class VideoProcessor:
         self.height = int(self.resolution[1])
         self.fps = int(os.getenv("VIDEO_FPS", "30"))
         self.audio_bitrate = os.getenv("AUDIO_BITRATE", "192k")
+        # Optional fixed video bitrate (e.g. "6M"); CRF from the render profile when unset
+        self.video_bitrate = os.getenv("VIDEO_BITRATE") or None
+        # Encoder threads per render (0 lets ffmpeg decide); also sizes the render pool
+        self.ffmpeg_threads = int(os.getenv("FFMPEG_THREADS", "2"))
+        self.render_engine = self._validate_engine(
+            render_engine or os.getenv("VIDEO_RENDER_ENGINE", "moviepy")
+        )
+        self.render_profile = self.get_profile(
+            render_profile or os.getenv("VIDEO_RENDER_PROFILE", "publish")
+        )
+        
+        # Quick low-resolution preview rendered before the publish render
+        preview_resolution = os.getenv("PREVIEW_RESOLUTION", "360x640").split("x")
+        self.preview_width = int(preview_resolution[0])
+        self.preview_height = int(preview_resolution[1])
+        self.preview_fps = int(os.getenv("PREVIEW_FPS", "15"))
+        
+        # Pre-scaled frame cache so each still is resized to the reel resolution once
+        if image_cache is None and os.getenv("FRAME_CACHE_ENABLED", "true").lower() == "true":
+            image_cache = ScaledImageCache()
+        self.image_cache = image_cache
+        self._segment_cache: Optional[DiskCache] = None
+    
+    @staticmethod
+    def _validate_engine(render_engine: str) -> str:
+        """Normalize and validate a render engine name."""
+        engine = render_engine.lower()
+        if engine not in RENDER_ENGINES:
+            raise ValueError(
+                f"Unknown render engine: {render_engine}. "
+                f"Choose one of: {', '.join(RENDER_ENGINES)}"
+            )
+        return engine
+    
+    @staticmethod
+    def get_profile(name: str) -> RenderProfile:
+        """Look up a render profile by name."""
+        profile = RENDER_PROFILES.get(name.lower())
+        if profile is None:
+            raise ValueError(
+                f"Unknown render profile: {name}. "
+                f"Choose one of: {', '.join(RENDER_PROFILES)}"
+            )
+        return profile
+    
+    @staticmethod
+    def _resolve_durations(
+        image_durations: Optional[List[float]],
+        total_duration: float,
+        image_count: int
+    ) -> List[float]:
+        """Fit image durations to the audio length."""
+        # Calculate image durations if not provided
+        if image_durations is None:
+            duration_per_image = total_duration / image_count
+            image_durations = [duration_per_image] * image_count
+        
+        # Ensure durations sum to audio duration
+        total_image_duration = sum(image_durations)
+        if total_image_duration != total_duration:
+            # Scale durations proportionally
+            scale_factor = total_duration / total_image_duration
+            image_durations = [d * scale_factor for d in image_durations]
+        
+        return image_durations
     
     def create_reel(
         self,
         image_paths: List[Path],
         audio_path: Path,
         output_path: Path,
-        image_durations: Optional[List[float]] = None
+        image_durations: Optional[List[float]] = None,
+        render_engine: Optional[str] = None,
+        render_profile: Optional[str] = None
     ) -> Path:
         """
         Create an Instagram Reel from images and audio.
@@ -120,6 +417,10 @@ class VideoProcessor:
             output_path: Path where the final video will be saved
             image_durations: Optional list of durations for each image.
                             If None, images are evenly distributed across audio duration.
+            render_engine: Optional engine override ("moviepy", "ffmpeg" or "segments").
+                          Uses the processor's default engine if not provided.
+            render_profile: Optional profile override ("draft", "preview" or "publish").
+                           Uses the processor's default profile if not provided.
         
         Returns:
             Path to the created video file
@@ -131,21 +432,74 @@ class VideoProcessor:
         if not audio_path.exists():
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
+        engine = self._validate_engine(render_engine) if render_engine else self.render_engine
+        profile = self.get_profile(render_profile) if render_profile else self.render_profile
+        
+        if self.image_cache is not None:
+            image_paths = self.image_cache.get_scaled_paths(image_paths, self.width, self.height)
+        
+        if engine == "ffmpeg":
+            return self._create_reel_ffmpeg(
+                image_paths, audio_path, output_path, image_durations, profile
+            )
+        
+        if engine == "segments":
+            return self._create_reel_segments(
+                image_paths, audio_path, output_path, image_durations, profile
+            )
+        
+        return self._create_reel_moviepy(
+            image_paths, audio_path, output_path, image_durations, profile
+        )
+    
+    def create_preview(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        image_durations: Optional[List[float]] = None
+    ) -> Path:
+        """
+        Render a small, low-fps preview of the reel with the draft profile.
+        
+        Uses the single-pass FFmpeg engine at PREVIEW_RESOLUTION / PREVIEW_FPS,
+        which takes a fraction of the publish render's time, so users can review
+        the cut while the full-quality render is still running.
+        
+        Returns:
+            Path to the preview video
+        """
+        if not image_paths:
+            raise ValueError("Cannot create preview: image_paths list is empty")
+        
+        if not audio_path.exists():
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        
+        preview = copy.copy(self)
+        preview.width = self.preview_width
+        preview.height = self.preview_height
+        preview.fps = self.preview_fps
+        preview.video_bitrate = None
+        return preview._create_reel_ffmpeg(
+            image_paths, audio_path, output_path, image_durations, RENDER_PROFILES["draft"]
+        )
+    
+    def _create_reel_moviepy(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        image_durations: Optional[List[float]] = None,
+        profile: Optional[RenderProfile] = None
+    ) -> Path:
+        """Render the reel by compositing frames with MoviePy."""
         # Load audio to get total duration
         audio_clip = AudioFileClip(str(audio_path))
         total_duration = audio_clip.duration
         
-        # Calculate image durations if not provided
-        if image_durations is None:
-            duration_per_image = total_duration / len(image_paths)
-            image_durations = [duration_per_image] * len(image_paths)
-        
-        # Ensure durations sum to audio duration
-        total_image_duration = sum(image_durations)
-        if total_image_duration != total_duration:
-            # Scale durations proportionally
-            scale_factor = total_duration / total_image_duration
-            image_durations = [d * scale_factor for d in image_durations]
+        image_durations = self._resolve_durations(
+            image_durations, total_duration, len(image_paths)
+        )
         
         # Create video clips from images
         video_clips = []
@@ -155,12 +509,14 @@ class VideoProcessor:
             if MOVIEPY_V2:
                 # MoviePy v2 API - uses method chaining with 'with_' prefix
                 clip = ImageClip(str(image_path)).with_duration(duration)
-                clip = clip.resized((self.width, self.height))
+                if tuple(clip.size) != (self.width, self.height):
+                    clip = clip.resized((self.width, self.height))
                 clip = clip.with_start(current_time)
             else:
                 # MoviePy v1 API - uses positional args and 'set_' methods
                 clip = ImageClip(str(image_path), duration=duration)
-                clip = clip.resize((self.width, self.height))
+                if tuple(clip.size) != (self.width, self.height):
+                    clip = clip.resize((self.width, self.height))
                 clip = clip.set_start(current_time)
             video_clips.append(clip)
             current_time += duration
@@ -180,13 +536,18 @@ class VideoProcessor:
         
         # Write video file
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        profile = profile or self.render_profile
+        threads = profile.threads if profile.threads is not None else self.ffmpeg_threads
         final_video.write_videofile(
             str(output_path),
             codec="libx264",
             audio_codec="aac",
-            bitrate=self.audio_bitrate,
+            bitrate=self.video_bitrate,
+            audio_bitrate=self.audio_bitrate,
             fps=self.fps,
-            preset="medium"
+            preset=profile.preset,
+            threads=threads or None,
+            ffmpeg_params=self._rate_control_args(profile)
         )
         
         # Clean up
@@ -196,3 +557,267 @@ class VideoProcessor:
             clip.close()
         
         return output_path
+    
+    def build_ffmpeg_command(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        image_durations: List[float],
+        profile: Optional[RenderProfile] = None
+    ) -> List[str]:
+        """
+        Build a single FFmpeg command that renders the whole reel.
+        
+        Each image is looped for its duration, scaled to the reel resolution,
+        and the segments are joined with the concat filter. The
+        voiceover is the last input and is muxed in directly.
+        """
+        command = [_get_ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error"]
+        segments = list(zip(image_paths, image_durations))
+        
+        for image_path, duration in segments:
+            command += [
+                "-loop", "1",
+                "-framerate", str(self.fps),
+                "-t", f"{duration:.3f}",
+                "-i", str(image_path),
+            ]
+        command += ["-i", str(audio_path)]
+        
+        filters = []
+        segment_labels = ""
+        for i in range(len(segments)):
+            filters.append(f"[{i}:v]{self._frame_filter()}[v{i}]")
+            segment_labels += f"[v{i}]"
+        filters.append(f"{segment_labels}concat=n={len(segments)}:v=1:a=0[outv]")
+        
+        audio_index = len(segments)
+        command += [
+            "-filter_complex", ";".join(filters),
+            "-map", "[outv]",
+            "-map", f"{audio_index}:a",
+        ]
+        command += self._video_encode_args(profile)
+        command += [
+            "-c:a", "aac",
+            "-b:a", self.audio_bitrate,
+            "-shortest",
+            "-movflags", "+faststart",
+            str(output_path),
+        ]
+        return command
+    
+    def _frame_filter(self) -> str:
+        """
+        Scale and convert one input to the reel's frame format.
+        
+        Images are stretched to exactly width x height with Lanczos, the same
+        policy as the MoviePy engine and ScaledImageCache, so every engine renders
+        identical frames whether or not the frame cache is enabled.
+        """
+        return (
+            f"scale={self.width}:{self.height}:flags=lanczos,"
+            f"setsar=1,fps={self.fps},format=yuv420p"
+        )
+    
+    def _rate_control_args(self, profile: RenderProfile) -> List[str]:
+        """Rate control, tuning and keyframe interval for a profile (codec-level args)."""
+        args = []
+        if not self.video_bitrate:
+            args += ["-crf", str(profile.crf)]
+        if profile.tune:
+            args += ["-tune", profile.tune]
+        # Stills barely change, so sparse keyframes save both encode time and bytes
+        args += ["-g", str(max(1, round(profile.gop_seconds * self.fps)))]
+        return args
+    
+    def _video_encode_args(self, profile: Optional[RenderProfile] = None) -> List[str]:
+        """H.264 encoder settings shared by full renders and segment chunks."""
+        profile = profile or self.render_profile
+        threads = profile.threads if profile.threads is not None else self.ffmpeg_threads
+        args = [
+            "-c:v", "libx264",
+            "-preset", profile.preset,
+        ]
+        if self.video_bitrate:
+            args += ["-b:v", self.video_bitrate]
+        args += self._rate_control_args(profile)
+        args += [
+            "-threads", str(threads),
+            "-pix_fmt", "yuv420p",
+            "-r", str(self.fps),
+        ]
+        return args
+    
+    def _create_reel_ffmpeg(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        image_durations: Optional[List[float]] = None,
+        profile: Optional[RenderProfile] = None
+    ) -> Path:
+        """Render the reel with a single FFmpeg filtergraph (no Python frame compositing)."""
+        total_duration = probe_media(audio_path)["duration"]
+        if not total_duration:
+            raise RuntimeError(f"Could not read audio duration: {audio_path}")
+        
+        image_durations = self._resolve_durations(
+            image_durations, total_duration, len(image_paths)
+        )
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        command = self.build_ffmpeg_command(
+            image_paths, audio_path, output_path, image_durations, profile
+        )
+        
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"FFmpeg render failed (exit code {result.returncode}): "
+                f"{result.stderr.strip()[-2000:]}"
+            )
+        
+        return output_path
+    
+    def _get_segment_cache(self) -> DiskCache:
+        """Cache of encoded segment chunks, opened on first use."""
+        if self._segment_cache is None:
+            self._segment_cache = DiskCache(
+                Path(os.getenv("SEGMENT_CACHE_DIR", "./cache/segments")),
+                int(float(os.getenv("SEGMENT_CACHE_MAX_MB", "2048")) * 1024 * 1024),
+                suffix=".mp4"
+            )
+        return self._segment_cache
+    
+    def _frame_counts(self, image_durations: List[float]) -> List[int]:
+        """
+        Convert durations to whole frames per segment.
+        
+        Cut points are rounded on the cumulative timeline, so rounding errors
+        never add up to drift against the voiceover.
+        """
+        counts = []
+        elapsed = 0.0
+        previous_boundary = 0
+        for duration in image_durations:
+            elapsed += duration
+            boundary = round(elapsed * self.fps)
+            counts.append(max(1, boundary - previous_boundary))
+            previous_boundary = max(boundary, previous_boundary + 1)
+        return counts
+    
+    def _segment_key(self, image_hash: str, frame_count: int, profile: RenderProfile) -> str:
+        """Cache key covering the image, its length and every encoding parameter."""
+        settings = "|".join([
+            f"{self.width}x{self.height}", str(self.fps), *self._video_encode_args(profile)
+        ])
+        settings_hash = hashlib.sha256(settings.encode("utf-8")).hexdigest()[:16]
+        return f"{image_hash}_{frame_count}f_{settings_hash}"
+    
+    def encode_segment(
+        self,
+        image_path: Path,
+        frame_count: int,
+        profile: Optional[RenderProfile] = None
+    ) -> Path:
+        """
+        Encode one still into an H.264 chunk of exactly frame_count frames.
+        
+        Chunks are cached by (image hash, frame count, resolution, fps, encoder
+        settings), so re-rendering a reel only encodes segments that changed.
+        
+        Returns:
+            Path to the cached chunk
+        """
+        profile = profile or self.render_profile
+        cache = self._get_segment_cache()
+        key = self._segment_key(hash_file(image_path), frame_count, profile)
+        
+        cached_path = cache.get(key)
+        if cached_path is not None:
+            return cached_path
+        
+        temp_path = cache.temp_path_for(key)
+        command = [
+            _get_ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error",
+            "-loop", "1",
+            "-framerate", str(self.fps),
+            "-i", str(image_path),
+            "-vf", self._frame_filter(),
+            "-frames:v", str(frame_count),
+            "-an",
+        ]
+        command += self._video_encode_args(profile)
+        command += ["-f", "mp4", str(temp_path)]
+        
+        result = subprocess.run(command, capture_output=True, text=True, check=False)
+        if result.returncode != 0:
+            temp_path.unlink(missing_ok=True)
+            raise RuntimeError(
+                f"FFmpeg segment encode failed (exit code {result.returncode}): "
+                f"{result.stderr.strip()[-2000:]}"
+            )
+        
+        return cache.put_file(key, temp_path, move=True)
+    
+    def _create_reel_segments(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        image_durations: Optional[List[float]] = None,
+        profile: Optional[RenderProfile] = None
+    ) -> Path:
+        """
+        Render the reel from cached per-image chunks.
+        
+        Each image is encoded on its own with identical encoder settings, then
+        the chunks are joined with FFmpeg's concat demuxer (stream copy) and the
+        voiceover is muxed in. Changing one image costs one short encode.
+        """
+        total_duration = probe_media(audio_path)["duration"]
+        if not total_duration:
+            raise RuntimeError(f"Could not read audio duration: {audio_path}")
+        
+        image_durations = self._resolve_durations(
+            image_durations, total_duration, len(image_paths)
+        )
+        segments = list(zip(image_paths, self._frame_counts(image_durations)))
+        chunk_paths = [
+            self.encode_segment(image_path, frame_count, profile)
+            for image_path, frame_count in segments
+        ]
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        list_path = output_path.with_name(output_path.stem + "_segments.txt")
+        with open(list_path, "w") as f:
+            for chunk_path in chunk_paths:
+                escaped = str(Path(chunk_path).resolve()).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        
+        command = [
+            _get_ffmpeg_binary(), "-y", "-hide_banner", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", str(list_path),
+            "-i", str(audio_path),
+            "-map", "0:v",
+            "-map", "1:a",
+            "-c:v", "copy",
+            "-c:a", "aac",
+            "-b:a", self.audio_bitrate,
+            "-shortest",
+            "-movflags", "+faststart",
+            str(output_path),
+        ]
+        try:
+            result = subprocess.run(command, capture_output=True, text=True, check=False)
+        finally:
+            list_path.unlink(missing_ok=True)
+        if result.returncode != 0:
+            raise RuntimeError(
+                f"FFmpeg segment concat failed (exit code {result.returncode}): "
+                f"{result.stderr.strip()[-2000:]}"
+            )
+        
+        return output_path
@@ -0,0 +1,87 @@
+"""Persistent cache of synthesized voiceover audio."""
+
+import hashlib
+import json
+import os
+import shutil
+import unicodedata
+from pathlib import Path
+from typing import Dict, Optional
+
+from .disk_cache import DiskCache
+
+
+def normalize_transcript(text: str) -> str:
+    """Normalize text so whitespace and Unicode form differences share one cache entry."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class VoiceoverCache:
+    """
+    Cache of TTS audio keyed by (voice_id, model_id, normalized transcript).
+    
+    Retries and re-renders that only change images reuse the earlier audio
+    instead of calling ElevenLabs again. Entries can be whole transcripts or
+    individual script segments, so editing one segment only re-synthesizes
+    that segment. Evicts least recently used audio once the byte budget is hit.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_bytes: Optional[int] = None
+    ):
+        cache_dir = Path(cache_dir or os.getenv("VOICE_CACHE_DIR", "./cache/voice"))
+        if max_bytes is None:
+            max_bytes = int(float(os.getenv("VOICE_CACHE_MAX_MB", "512")) * 1024 * 1024)
+        self.store = DiskCache(cache_dir, max_bytes, suffix=".mp3")
+    
+    @staticmethod
+    def make_key(voice_id: str, model_id: str, text: str) -> str:
+        """Hash the parameters that determine the synthesized audio."""
+        payload = json.dumps(
+            [voice_id, model_id, normalize_transcript(text)],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def fetch(self, key: str, output_path: Path) -> bool:
+        """
+        Place cached audio at output_path if one exists for the key.
+        
+        Returns:
+            True on a hit, False if the audio still has to be synthesized
+        """
+        cached_path = self.store.get(key)
+        if cached_path is None:
+            return False
+        
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_name(output_path.name + ".part")
+        try:
+            os.link(cached_path, temp_path)
+        except OSError:
+            shutil.copyfile(cached_path, temp_path)
+        os.replace(temp_path, output_path)
+        return True
+    
+    def add(self, key: str, audio_path: Path) -> None:
+        """Store freshly synthesized audio."""
+        self.store.put_file(key, audio_path, link=True)
+    
+    def stats(self) -> Dict[str, float]:
+        """Get cache hit/miss counters and current size."""
+        return self.store.stats()
+
+
+_cache: Optional[VoiceoverCache] = None
+
+
+def get_voiceover_cache() -> Optional[VoiceoverCache]:
+    """Get the process-wide voiceover cache, or None if VOICE_CACHE_ENABLED=false."""
+    global _cache
+    if os.getenv("VOICE_CACHE_ENABLED", "true").lower() != "true":
+        return None
+    if _cache is None:
+        _cache = VoiceoverCache()
+    return _cache